@@ -0,0 +1,5 @@
+Added ``zstd`` content-coding support when the ``zstandard`` package is installed:
+responses are compressed with zstd, request and response bodies are decoded and
+the client advertises it in the default ``Accept-Encoding``.  Automatic response
+compression now picks the coding with the highest *Accept-Encoding* q-value, so
+a coding listed with ``q=0`` is never used.
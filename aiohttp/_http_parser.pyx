@@ -303,6 +303,9 @@ cdef class HttpParser:
         object  _payload_exception
         object  _last_error
         bint    _auto_decompress
+        object  _zlib_executor_size
+        object  _zlib_executor
+        object  _zstd_dict
         int     _limit
 
         str     _content_encoding
@@ -331,7 +334,8 @@ cdef class HttpParser:
         size_t max_line_size=8190, size_t max_headers=32768,
         size_t max_field_size=8190, payload_exception=None,
         bint response_with_body=True, bint read_until_eof=False,
-        bint auto_decompress=True,
+        bint auto_decompress=True, zlib_executor_size=None, zlib_executor=None,
+        zstd_dict=None,
     ):
         cparser.llhttp_settings_init(self._csettings)
         cparser.llhttp_init(self._cparser, mode, self._csettings)
@@ -359,6 +363,9 @@ cdef class HttpParser:
         self._read_until_eof = read_until_eof
         self._upgraded = False
         self._auto_decompress = auto_decompress
+        self._zlib_executor_size = zlib_executor_size
+        self._zlib_executor = zlib_executor
+        self._zstd_dict = zstd_dict
         self._content_encoding = None
 
         self._csettings.on_url = cb_on_url
@@ -437,7 +444,7 @@ cdef class HttpParser:
         if enc is not None:
             self._content_encoding = None
             enc = enc.lower()
-            if enc in ('gzip', 'deflate', 'br'):
+            if enc in ('gzip', 'deflate', 'br', 'zstd'):
                 encoding = enc
 
         if self._cparser.type == cparser.HTTP_REQUEST:
@@ -466,7 +473,11 @@ cdef class HttpParser:
 
         self._payload = payload
         if encoding is not None and self._auto_decompress:
-            self._payload = DeflateBuffer(payload, encoding)
+            self._payload = DeflateBuffer(
+                payload, encoding,
+                executor=self._zlib_executor,
+                executor_size=self._zlib_executor_size,
+                zstd_dict=self._zstd_dict)
 
         if not self._response_with_body:
             payload = EMPTY_PAYLOAD
@@ -578,12 +589,16 @@ cdef class HttpRequestParser(HttpParser):
         size_t max_line_size=8190, size_t max_headers=32768,
         size_t max_field_size=8190, payload_exception=None,
         bint response_with_body=True, bint read_until_eof=False,
-        bint auto_decompress=True,
+        bint auto_decompress=True, bint lazy_headers=False,
+        zlib_executor_size=None, zlib_executor=None, zstd_dict=None,
     ):
+        # lazy_headers is accepted for compatibility with the pure Python
+        # parser, headers are always built eagerly here.
         self._init(cparser.HTTP_REQUEST, protocol, loop, limit, timer,
                    max_line_size, max_headers, max_field_size,
                    payload_exception, response_with_body, read_until_eof,
-                   auto_decompress)
+                   auto_decompress, zlib_executor_size, zlib_executor,
+                   zstd_dict)
 
     cdef object _on_status_complete(self):
         cdef int idx1, idx2
@@ -642,12 +657,14 @@ cdef class HttpResponseParser(HttpParser):
             size_t max_line_size=8190, size_t max_headers=32768,
             size_t max_field_size=8190, payload_exception=None,
             bint response_with_body=True, bint read_until_eof=False,
-            bint auto_decompress=True
+            bint auto_decompress=True,
+            zlib_executor_size=None, zlib_executor=None, zstd_dict=None
     ):
         self._init(cparser.HTTP_RESPONSE, protocol, loop, limit, timer,
                    max_line_size, max_headers, max_field_size,
                    payload_exception, response_with_body, read_until_eof,
-                   auto_decompress)
+                   auto_decompress, zlib_executor_size, zlib_executor,
+                   zstd_dict)
         # Use strict parsing on dev mode, so users are warned about broken servers.
         if not DEBUG:
             cparser.llhttp_set_lenient_headers(self._cparser, 1)
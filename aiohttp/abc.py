@@ -178,7 +178,13 @@ class AbstractStreamWriter(ABC):
         """Flush the write buffer."""
 
     @abstractmethod
-    def enable_compression(self, encoding: str = "deflate") -> None:
+    def enable_compression(
+        self,
+        encoding: str = "deflate",
+        *,
+        level: Optional[int] = None,
+        zstd_dict: Optional[bytes] = None,
+    ) -> None:
         """Enable HTTP body compression"""
 
     @abstractmethod
@@ -9,6 +9,7 @@ import os
 import sys
 import traceback
 import warnings
+from concurrent.futures import Executor
 from contextlib import suppress
 from types import SimpleNamespace, TracebackType
 from typing import (
@@ -194,6 +195,9 @@ class ClientSession:
         "_max_line_size",
         "_max_field_size",
         "_resolve_charset",
+        "_zlib_executor_size",
+        "_zlib_executor",
+        "_zstd_dict",
     )
 
     def __init__(
@@ -224,6 +228,9 @@ class ClientSession:
         max_line_size: int = 8190,
         max_field_size: int = 8190,
         fallback_charset_resolver: _CharsetResolver = lambda r, b: "utf-8",
+        zlib_executor_size: Optional[int] = None,
+        zlib_executor: Optional[Executor] = None,
+        zstd_dict: Optional[bytes] = None,
     ) -> None:
         if base_url is None or isinstance(base_url, URL):
             self._base_url: Optional[URL] = base_url
@@ -274,6 +281,9 @@ class ClientSession:
         self._read_bufsize = read_bufsize
         self._max_line_size = max_line_size
         self._max_field_size = max_field_size
+        self._zlib_executor_size = zlib_executor_size
+        self._zlib_executor = zlib_executor
+        self._zstd_dict = zstd_dict
 
         # Convert to list of tuples
         if headers:
@@ -360,6 +370,7 @@ class ClientSession:
         auto_decompress: Optional[bool] = None,
         max_line_size: Optional[int] = None,
         max_field_size: Optional[int] = None,
+        priority: int = 0,
     ) -> ClientResponse:
         # NOTE: timeout clamps existing connect and read timeouts.  We cannot
         # set the default to None because we need to detect if the user wants
@@ -504,6 +515,8 @@ class ClientSession:
                         proxy_headers=proxy_headers,
                         traces=traces,
                         trust_env=self.trust_env,
+                        priority=priority,
+                        zstd_dict=self._zstd_dict,
                     )
 
                     # connection timeout
@@ -534,6 +547,9 @@ class ClientSession:
                         timeout_ceil_threshold=self._connector._timeout_ceil_threshold,
                         max_line_size=max_line_size,
                         max_field_size=max_field_size,
+                        zlib_executor_size=self._zlib_executor_size,
+                        zlib_executor=self._zlib_executor,
+                        zstd_dict=self._zstd_dict,
                     )
 
                     try:
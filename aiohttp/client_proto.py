@@ -1,4 +1,5 @@
 import asyncio
+from concurrent.futures import Executor
 from contextlib import suppress
 from typing import Any, Optional, Tuple
 
@@ -155,6 +156,9 @@ class ResponseHandler(BaseProtocol, DataQueue[Tuple[RawResponseMessage, StreamRe
         timeout_ceil_threshold: float = 5,
         max_line_size: int = 8190,
         max_field_size: int = 8190,
+        zlib_executor_size: Optional[int] = None,
+        zlib_executor: Optional[Executor] = None,
+        zstd_dict: Optional[bytes] = None,
     ) -> None:
         self._skip_payload = skip_payload
 
@@ -173,6 +177,9 @@ class ResponseHandler(BaseProtocol, DataQueue[Tuple[RawResponseMessage, StreamRe
             auto_decompress=auto_decompress,
             max_line_size=max_line_size,
             max_field_size=max_field_size,
+            zlib_executor_size=zlib_executor_size,
+            zlib_executor=zlib_executor,
+            zstd_dict=zstd_dict,
         )
 
         if self._tail:
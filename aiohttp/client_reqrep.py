@@ -40,7 +40,7 @@ from .client_exceptions import (
     InvalidURL,
     ServerFingerprintMismatch,
 )
-from .compression_utils import HAS_BROTLI
+from .compression_utils import HAS_BROTLI, HAS_ZSTD
 from .formdata import FormData
 from .hdrs import CONTENT_TYPE
 from .helpers import (
@@ -88,7 +88,12 @@ _CONTAINS_CONTROL_CHAR_RE = re.compile(r"[^-!#$%&'*+.^_`|~0-9a-zA-Z]")
 
 
 def _gen_default_accept_encoding() -> str:
-    return "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+    encodings = ["gzip", "deflate"]
+    if HAS_BROTLI:
+        encodings.append("br")
+    if HAS_ZSTD:
+        encodings.append("zstd")
+    return ", ".join(encodings)
 
 
 @dataclasses.dataclass(frozen=True)
@@ -212,6 +217,8 @@ class ClientRequest:
         traces: Optional[List["Trace"]] = None,
         trust_env: bool = False,
         server_hostname: Optional[str] = None,
+        priority: int = 0,
+        zstd_dict: Optional[bytes] = None,
     ):
         match = _CONTAINS_CONTROL_CHAR_RE.search(method)
         if match:
@@ -234,6 +241,7 @@ class ClientRequest:
         self.method = method.upper()
         self.chunked = chunked
         self.compress = compress
+        self._zstd_dict = zstd_dict
         self.loop = loop
         self.length = None
         if response_class is None:
@@ -244,6 +252,7 @@ class ClientRequest:
         self._timer = timer if timer is not None else TimerNoop()
         self._ssl = ssl
         self.server_hostname = server_hostname
+        self.priority = priority
 
         if loop.get_debug():
             self._source_traceback = traceback.extract_stack(sys._getframe(1))
@@ -597,7 +606,7 @@ class ClientRequest:
         )
 
         if self.compress:
-            writer.enable_compression(self.compress)
+            writer.enable_compression(self.compress, zstd_dict=self._zstd_dict)
 
         if self.chunked is not None:
             writer.enable_chunking()
@@ -712,6 +721,8 @@ class ClientResponse(HeadersMixin):
         self._real_url = url
         self._url = url.with_fragment(None)
         self._body: Optional[bytes] = None
+        # the body was consumed by read_into() and is not kept
+        self._read_into = False
         self._writer: Optional[asyncio.Task[None]] = writer
         self._continue = continue100  # None by default
         self._closed = True
@@ -999,6 +1010,8 @@ class ClientResponse(HeadersMixin):
     async def read(self) -> bytes:
         """Read response payload."""
         if self._body is None:
+            if self._read_into:
+                raise RuntimeError("Response payload was consumed by read_into()")
             try:
                 self._body = await self.content.read()
                 for trace in self._traces:
@@ -1013,6 +1026,44 @@ class ClientResponse(HeadersMixin):
 
         return self._body
 
+    async def read_into(self, buffer: Union[bytearray, memoryview]) -> int:
+        """Read response payload into a preallocated buffer.
+
+        Return the number of bytes read. Raise ValueError if the payload
+        does not fit into the buffer.  on_response_chunk_received is not
+        sent, the payload is never copied into a bytes object.
+        """
+        view = memoryview(buffer).cast("B")
+        if self._body is not None:
+            if self._released:
+                raise ClientConnectionError("Connection closed")
+            size = len(self._body)
+            if size > view.nbytes:
+                raise ValueError("Response payload is larger than the buffer")
+            view[:size] = self._body
+            return size
+
+        if self._read_into:
+            raise RuntimeError("Response payload was consumed by read_into()")
+        self._read_into = True
+        pos = 0
+        try:
+            while True:
+                if pos < view.nbytes:
+                    size = await self.content.read_into(view[pos:])
+                elif await self.content.readany():
+                    raise ValueError("Response payload is larger than the buffer")
+                else:
+                    size = 0
+                if not size:
+                    break
+                pos += size
+        except BaseException:
+            self.close()
+            raise
+
+        return pos
+
     def get_encoding(self) -> str:
         ctype = self.headers.get(hdrs.CONTENT_TYPE, "").lower()
         mimetype = helpers.parse_mimetype(ctype)
@@ -13,7 +13,16 @@ try:
 except ImportError:  # pragma: no cover
     HAS_BROTLI = False
 
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:  # pragma: no cover
+    HAS_ZSTD = False
+
 MAX_SYNC_CHUNK_SIZE = 1024
+# Upper bound of the output of a single bounded decompression step.
+MAX_DECOMPRESS_SIZE = 2**16
 
 
 def encoding_to_mode(
@@ -149,3 +158,116 @@ class BrotliDecompressor:
         if hasattr(self._obj, "flush"):
             return cast(bytes, self._obj.flush())
         return b""
+
+
+def _zstd_dict(dict_data: Optional[bytes]) -> "Optional[zstandard.ZstdCompressionDict]":
+    if dict_data is None:
+        return None
+    return zstandard.ZstdCompressionDict(dict_data)
+
+
+class ZstdCompressor:
+    def __init__(
+        self,
+        level: Optional[int] = None,
+        dict_data: Optional[bytes] = None,
+        executor: Optional[Executor] = None,
+        max_sync_chunk_size: Optional[int] = MAX_SYNC_CHUNK_SIZE,
+    ):
+        if not HAS_ZSTD:
+            raise RuntimeError(
+                "The zstd compression is not available. "
+                "Please install `zstandard` module"
+            )
+        self._executor = executor
+        self._max_sync_chunk_size = max_sync_chunk_size
+        compressor = zstandard.ZstdCompressor(
+            level=3 if level is None else level, dict_data=_zstd_dict(dict_data)
+        )
+        self._compressor = compressor.compressobj()
+
+    def compress_sync(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    async def compress(self, data: bytes) -> bytes:
+        if (
+            self._max_sync_chunk_size is not None
+            and len(data) > self._max_sync_chunk_size
+        ):
+            return await asyncio.get_event_loop().run_in_executor(
+                self._executor, self.compress_sync, data
+            )
+        return self.compress_sync(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _ZstdNeedsInput(Exception):
+    """Raised by _ZstdInput when all fed input is consumed."""
+
+
+class _ZstdInput:
+    # Source of the zstd stream reader.  It never reports the end of
+    # the input, the reader would stop for good, it raises instead.
+    def __init__(self) -> None:
+        self._data = b""
+
+    def feed(self, data: bytes) -> None:
+        self._data += data
+
+    def read(self, size: int) -> bytes:
+        if not self._data:
+            raise _ZstdNeedsInput()
+        data = self._data[:size]
+        self._data = self._data[size:]
+        return data
+
+
+class ZstdDecompressor:
+    """Decompress a zstd stream of one or more frames.
+
+    Like ZLibDecompressor.decompress_sync() the output of a call is
+    bounded by max_length, the input left over is kept for the next
+    call, so unconsumed_tail is always empty.
+    """
+
+    def __init__(self, dict_data: Optional[bytes] = None) -> None:
+        if not HAS_ZSTD:
+            raise RuntimeError(
+                "The zstd decompression is not available. "
+                "Please install `zstandard` module"
+            )
+        decompressor = zstandard.ZstdDecompressor(dict_data=_zstd_dict(dict_data))
+        self._input = _ZstdInput()
+        self._reader = decompressor.stream_reader(
+            self._input,  # type: ignore[arg-type]  # only read() is used
+            read_across_frames=True,
+            closefd=False,
+        )
+
+    def decompress_sync(self, data: bytes, max_length: int = 0) -> bytes:
+        self._input.feed(data)
+        chunks = []
+        size = 0
+        try:
+            # read1() stops at the first output and asks for input only
+            # when it has none, so raising from _ZstdInput loses nothing.
+            while max_length <= 0 or size < max_length:
+                chunk = self._reader.read1(
+                    max_length - size if max_length > 0 else MAX_DECOMPRESS_SIZE
+                )
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+        except _ZstdNeedsInput:
+            pass
+        return b"".join(chunks)
+
+    def flush(self) -> bytes:
+        return self.decompress_sync(b"")
+
+    @property
+    def unconsumed_tail(self) -> bytes:
+        return b""
@@ -1,8 +1,9 @@
 import asyncio
+import copy
 import dataclasses
 import functools
+import heapq
 import logging
-import random
 import sys
 import traceback
 import warnings
@@ -10,7 +11,7 @@ from collections import defaultdict, deque
 from contextlib import suppress
 from http import HTTPStatus
 from http.cookies import SimpleCookie
-from itertools import cycle, islice
+from itertools import count, cycle, islice
 from time import monotonic
 from types import TracebackType
 from typing import (  # noqa
@@ -19,11 +20,14 @@ from typing import (  # noqa
     Awaitable,
     Callable,
     DefaultDict,
+    Deque,
     Dict,
+    Iterable,
     Iterator,
     List,
     Literal,
     Optional,
+    Sequence,
     Set,
     Tuple,
     Type,
@@ -31,6 +35,8 @@ from typing import (  # noqa
     cast,
 )
 
+from yarl import URL
+
 from . import hdrs, helpers
 from .abc import AbstractResolver
 from .client_exceptions import (
@@ -49,7 +55,9 @@ from .client_proto import ResponseHandler
 from .client_reqrep import SSL_ALLOWED_TYPES, ClientRequest, Fingerprint
 from .helpers import _SENTINEL, ceil_timeout, is_ip_address, sentinel, set_result
 from .locks import EventResultOrError
+from .log import client_logger
 from .resolver import DefaultResolver
+from .typedefs import StrOrURL
 
 try:
     import ssl
@@ -161,6 +169,222 @@ class _TransportPlaceholder:
         pass
 
 
+_IdleConnection = Tuple[ResponseHandler, float]
+
+
+class _IdleConnections:
+    """Idle keep-alive connections ordered by the time of the last use.
+
+    Connections of every key are kept in a deque with the most recently
+    released one at the right end.  A heap of all connections ordered by
+    release time finds the expired ones and the least recently used ones
+    across keys without scanning every deque.  Heap entries of
+    connections taken out of a deque are dropped lazily.
+    """
+
+    def __init__(self, limit: int = 0) -> None:
+        self._limit = limit
+        self._conns: Dict["ConnectionKey", Deque[_IdleConnection]] = {}
+        self._heap: List[Tuple[float, int, "ConnectionKey", _IdleConnection]] = []
+        self._counter = count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._conns)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._conns
+
+    def __getitem__(self, key: "ConnectionKey") -> Deque[_IdleConnection]:
+        return self._conns[key]
+
+    def values(self) -> Iterator[Deque[_IdleConnection]]:
+        return iter(self._conns.values())
+
+    def add(
+        self, key: "ConnectionKey", proto: ResponseHandler, use_time: float
+    ) -> Sequence[Tuple["ConnectionKey", ResponseHandler]]:
+        """Add a released connection.
+
+        Return the least recently used connections evicted
+        to keep the pool within the limit.
+        """
+        conn = (proto, use_time)
+        conns = self._conns.get(key)
+        if conns is None:
+            conns = self._conns[key] = deque()
+        conns.append(conn)
+        self._size += 1
+        heapq.heappush(self._heap, (use_time, next(self._counter), key, conn))
+        if len(self._heap) > 2 * self._size + 16:
+            self._compact()
+        if not self._limit or self._size <= self._limit:
+            return ()
+        return self._pop_oldest(lambda use_time: self._size > self._limit)
+
+    def pop(self, key: "ConnectionKey") -> Optional[_IdleConnection]:
+        """Take the most recently used connection of the key."""
+        conns = self._conns.get(key)
+        if conns is None:
+            return None
+        conn = conns.pop()
+        self._size -= 1
+        if not conns:
+            del self._conns[key]
+        return conn
+
+    def expire(self, deadline: float) -> List[Tuple["ConnectionKey", ResponseHandler]]:
+        """Remove connections last used before the deadline."""
+        return self._pop_oldest(lambda use_time: use_time < deadline)
+
+    def clear(self) -> None:
+        self._conns.clear()
+        self._heap.clear()
+        self._size = 0
+
+    def _pop_oldest(
+        self, pred: Callable[[float], bool]
+    ) -> List[Tuple["ConnectionKey", ResponseHandler]]:
+        heap = self._heap
+        popped = []
+        while heap and pred(heap[0][0]):
+            _, _, key, conn = heapq.heappop(heap)
+            conns = self._conns.get(key)
+            # All connections of the key released earlier are gone,
+            # so a connection still in the pool is the leftmost one.
+            if conns is None or conns[0] is not conn:
+                continue
+            conns.popleft()
+            self._size -= 1
+            if not conns:
+                del self._conns[key]
+            popped.append((key, conn[0]))
+        return popped
+
+    def _compact(self) -> None:
+        self._heap = [
+            (conn[1], next(self._counter), key, conn)
+            for key, conns in self._conns.items()
+            for conn in conns
+        ]
+        heapq.heapify(self._heap)
+
+
+_Waiter = Tuple[int, int, "asyncio.Future[None]"]
+
+
+class _WaiterQueue:
+    """Requests waiting for a connection because of the connector limits.
+
+    Waiters are woken up in the order of arrival, skipping keys
+    without available connections.
+    """
+
+    def __init__(self) -> None:
+        self._queues: Dict["ConnectionKey", List[_Waiter]] = {}
+        self._counter = count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._queues
+
+    def add(
+        self, key: "ConnectionKey", fut: "asyncio.Future[None]", priority: int = 0
+    ) -> None:
+        waiter = (self._rank(priority), next(self._counter), fut)
+        heapq.heappush(self._queues.setdefault(key, []), waiter)
+        self._size += 1
+
+    def remove(self, key: "ConnectionKey", fut: "asyncio.Future[None]") -> None:
+        """Remove a waiter, dropping the queue of the key once it is empty."""
+        queue = self._queues.get(key)
+        if queue is None:
+            return
+        for i, waiter in enumerate(queue):
+            if waiter[2] is fut:
+                queue[i] = queue[-1]
+                queue.pop()
+                heapq.heapify(queue)
+                self._size -= 1
+                break
+        if not queue:
+            del self._queues[key]
+
+    def clear(self) -> None:
+        self._queues.clear()
+        self._size = 0
+
+    def release(self, available: Callable[["ConnectionKey"], int]) -> None:
+        """Wake up the next waiter of a key having available connections.
+
+        The queue of the key is kept even if it gets empty until the woken
+        up waiter removes itself, so no other request takes the connection.
+        """
+        while True:
+            key = self._next_key(available)
+            if key is None:
+                return
+            fut = heapq.heappop(self._queues[key])[2]
+            self._size -= 1
+            if not fut.done():
+                fut.set_result(None)
+                return
+
+    def _rank(self, priority: int) -> int:
+        return 0
+
+    def _next_key(
+        self, available: Callable[["ConnectionKey"], int]
+    ) -> Optional["ConnectionKey"]:
+        next_key: Optional["ConnectionKey"] = None
+        first: Tuple[int, int] = (0, 0)
+        for key, queue in self._queues.items():
+            if not queue:
+                continue
+            head = queue[0][:2]
+            if (next_key is None or head < first) and available(key) > 0:
+                next_key = key
+                first = head
+        return next_key
+
+
+class _PriorityWaiterQueue(_WaiterQueue):
+    """Waiters with a higher request priority are woken up first.
+
+    Waiters of the same priority are woken up in the order of arrival.
+    """
+
+    def _rank(self, priority: int) -> int:
+        return -priority
+
+
+class _RoundRobinWaiterQueue(_WaiterQueue):
+    """Keys take turns in waking up their waiters.
+
+    A single busy host cannot starve waiters of the other ones.
+    """
+
+    def _next_key(
+        self, available: Callable[["ConnectionKey"], int]
+    ) -> Optional["ConnectionKey"]:
+        for key, queue in self._queues.items():
+            if queue and available(key) > 0:
+                # the served key goes to the end of the turn
+                self._queues[key] = self._queues.pop(key)
+                return key
+        return None
+
+
+_WAITER_QUEUES: Dict[str, Type[_WaiterQueue]] = {
+    "fifo": _WaiterQueue,
+    "round_robin": _RoundRobinWaiterQueue,
+    "priority": _PriorityWaiterQueue,
+}
+
+
 class BaseConnector:
     """Base connector class.
 
@@ -169,6 +393,10 @@ class BaseConnector:
         after each request (and between redirects).
     limit - The total number of simultaneous connections.
     limit_per_host - Number of simultaneous connections to one host.
+    limit_idle - The total number of idle keep-alive connections,
+                 least recently used ones are closed above it.
+    scheduling - The order of waking up requests waiting for
+                 a connection: "fifo", "round_robin" or "priority".
     enable_cleanup_closed - Enables clean-up closed ssl transports.
                             Disabled by default.
     timeout_ceil_threshold - Trigger ceiling of timeout values when
@@ -189,6 +417,8 @@ class BaseConnector:
         force_close: bool = False,
         limit: int = 100,
         limit_per_host: int = 0,
+        limit_idle: int = 0,
+        scheduling: str = "fifo",
         enable_cleanup_closed: bool = False,
         timeout_ceil_threshold: float = 5,
     ) -> None:
@@ -201,6 +431,15 @@ class BaseConnector:
             if keepalive_timeout is sentinel:
                 keepalive_timeout = 15.0
 
+        try:
+            waiter_queue_class = _WAITER_QUEUES[scheduling]
+        except KeyError:
+            raise ValueError(
+                "scheduling should be one of {}, got {!r} instead.".format(
+                    ", ".join(map(repr, _WAITER_QUEUES)), scheduling
+                )
+            ) from None
+
         self._timeout_ceil_threshold = timeout_ceil_threshold
 
         loop = asyncio.get_running_loop()
@@ -209,9 +448,10 @@ class BaseConnector:
         if loop.get_debug():
             self._source_traceback = traceback.extract_stack(sys._getframe(1))
 
-        self._conns: Dict[ConnectionKey, List[Tuple[ResponseHandler, float]]] = {}
+        self._conns = _IdleConnections(limit_idle)
         self._limit = limit
         self._limit_per_host = limit_per_host
+        self._limit_idle = limit_idle
         self._acquired: Set[ResponseHandler] = set()
         self._acquired_per_host: DefaultDict[
             ConnectionKey, Set[ResponseHandler]
@@ -219,8 +459,8 @@ class BaseConnector:
         self._keepalive_timeout = cast(float, keepalive_timeout)
         self._force_close = force_close
 
-        # {host_key: FIFO list of waiters}
-        self._waiters = defaultdict(deque)  # type: ignore[var-annotated]
+        self._scheduling = scheduling
+        self._waiters = waiter_queue_class()
 
         self._loop = loop
         self._factory = functools.partial(ResponseHandler, loop=loop)
@@ -290,6 +530,19 @@ class BaseConnector:
         """
         return self._limit_per_host
 
+    @property
+    def limit_idle(self) -> int:
+        """The limit for idle keep-alive connections to all endpoints.
+
+        If limit_idle is 0 the number of idle connections is not limited.
+        """
+        return self._limit_idle
+
+    @property
+    def scheduling(self) -> str:
+        """The order of waking up requests waiting for a connection."""
+        return self._scheduling
+
     def _cleanup(self) -> None:
         """Cleanup unused transports."""
         if self._cleanup_handle:
@@ -302,29 +555,8 @@ class BaseConnector:
         timeout = self._keepalive_timeout
 
         if self._conns:
-            connections = {}
-            deadline = now - timeout
-            for key, conns in self._conns.items():
-                alive = []
-                for proto, use_time in conns:
-                    if proto.is_connected():
-                        if use_time - deadline < 0:
-                            transport = proto.transport
-                            proto.close()
-                            if key.is_ssl and not self._cleanup_closed_disabled:
-                                self._cleanup_closed_transports.append(transport)
-                        else:
-                            alive.append((proto, use_time))
-                    else:
-                        transport = proto.transport
-                        proto.close()
-                        if key.is_ssl and not self._cleanup_closed_disabled:
-                            self._cleanup_closed_transports.append(transport)
-
-                if alive:
-                    connections[key] = alive
-
-            self._conns = connections
+            for key, proto in self._conns.expire(now - timeout):
+                self._close_idle(key, proto)
 
         if self._conns:
             self._cleanup_handle = helpers.weakref_handle(
@@ -335,6 +567,13 @@ class BaseConnector:
                 timeout_ceil_threshold=self._timeout_ceil_threshold,
             )
 
+    def _close_idle(self, key: "ConnectionKey", proto: ResponseHandler) -> None:
+        transport = proto.transport
+        proto.close()
+        # only for SSL transports
+        if key.is_ssl and not self._cleanup_closed_disabled:
+            self._cleanup_closed_transports.append(transport)
+
     def _drop_acquired_per_host(
         self, key: "ConnectionKey", val: ResponseHandler
     ) -> None:
@@ -474,34 +713,28 @@ class BaseConnector:
         # Wait if there are no available connections or if there are/were
         # waiters (i.e. don't steal connection from a waiter about to wake up)
         if available <= 0 or key in self._waiters:
-            fut = self._loop.create_future()
+            fut: asyncio.Future[None] = self._loop.create_future()
+            queued_at = self._loop.time()
 
             # This connection will now count towards the limit.
-            self._waiters[key].append(fut)
+            self._waiters.add(key, fut, req.priority)
 
             if traces:
+                queue_depth = len(self._waiters)
                 for trace in traces:
-                    await trace.send_connection_queued_start()
+                    await trace.send_connection_queued_start(queue_depth)
 
             try:
                 await fut
-            except BaseException as e:
-                if key in self._waiters:
-                    # remove a waiter even if it was cancelled, normally it's
-                    #  removed when it's notified
-                    try:
-                        self._waiters[key].remove(fut)
-                    except ValueError:  # fut may no longer be in list
-                        pass
-
-                raise e
             finally:
-                if key in self._waiters and not self._waiters[key]:
-                    del self._waiters[key]
+                # remove a waiter even if it was cancelled, normally it's
+                # removed when it's notified
+                self._waiters.remove(key, fut)
 
             if traces:
+                wait_time = self._loop.time() - queued_at
                 for trace in traces:
-                    await trace.send_connection_queued_end()
+                    await trace.send_connection_queued_end(wait_time)
 
         proto = self._get(key)
         if proto is None:
@@ -548,39 +781,19 @@ class BaseConnector:
         return Connection(self, key, proto, self._loop)
 
     def _get(self, key: "ConnectionKey") -> Optional[ResponseHandler]:
-        try:
-            conns = self._conns[key]
-        except KeyError:
-            return None
-
         t1 = self._loop.time()
-        while conns:
-            proto, t0 = conns.pop()
-            if proto.is_connected():
-                if t1 - t0 > self._keepalive_timeout:
-                    transport = proto.transport
-                    proto.close()
-                    # only for SSL transports
-                    if key.is_ssl and not self._cleanup_closed_disabled:
-                        self._cleanup_closed_transports.append(transport)
-                else:
-                    if not conns:
-                        # The very last connection was reclaimed: drop the key
-                        del self._conns[key]
-                    return proto
-            else:
-                transport = proto.transport
-                proto.close()
-                if key.is_ssl and not self._cleanup_closed_disabled:
-                    self._cleanup_closed_transports.append(transport)
-
-        # No more connections: drop the key
-        del self._conns[key]
-        return None
+        while True:
+            conn = self._conns.pop(key)
+            if conn is None:
+                return None
+            proto, t0 = conn
+            if proto.is_connected() and t1 - t0 <= self._keepalive_timeout:
+                return proto
+            self._close_idle(key, proto)
 
     def _release_waiter(self) -> None:
         """
-        Iterates over all waiters until one to be released is found.
+        Wakes up the next waiter picked by the scheduling.
 
         The one to be released is not finished and
         belongs to a host that has available connections.
@@ -588,21 +801,7 @@ class BaseConnector:
         if not self._waiters:
             return
 
-        # Having the dict keys ordered this avoids to iterate
-        # at the same order at each call.
-        queues = list(self._waiters.keys())
-        random.shuffle(queues)
-
-        for key in queues:
-            if self._available_connections(key) < 1:
-                continue
-
-            waiters = self._waiters[key]
-            while waiters:
-                waiter = waiters.popleft()
-                if not waiter.done():
-                    waiter.set_result(None)
-                    return
+        self._waiters.release(self._available_connections)
 
     def _release_acquired(self, key: "ConnectionKey", proto: ResponseHandler) -> None:
         if self._closed:
@@ -645,19 +844,21 @@ class BaseConnector:
             if key.is_ssl and not self._cleanup_closed_disabled:
                 self._cleanup_closed_transports.append(transport)
         else:
-            conns = self._conns.get(key)
-            if conns is None:
-                conns = self._conns[key] = []
-            conns.append((protocol, self._loop.time()))
-
-            if self._cleanup_handle is None:
-                self._cleanup_handle = helpers.weakref_handle(
-                    self,
-                    "_cleanup",
-                    self._keepalive_timeout,
-                    self._loop,
-                    timeout_ceil_threshold=self._timeout_ceil_threshold,
-                )
+            self._add_idle(key, protocol)
+
+    def _add_idle(self, key: "ConnectionKey", protocol: ResponseHandler) -> None:
+        evicted = self._conns.add(key, protocol, self._loop.time())
+        for evicted_key, evicted_proto in evicted:
+            self._close_idle(evicted_key, evicted_proto)
+
+        if self._cleanup_handle is None:
+            self._cleanup_handle = helpers.weakref_handle(
+                self,
+                "_cleanup",
+                self._keepalive_timeout,
+                self._loop,
+                timeout_ceil_threshold=self._timeout_ceil_threshold,
+            )
 
     async def _create_connection(
         self, req: ClientRequest, traces: List["Trace"], timeout: "ClientTimeout"
@@ -666,22 +867,40 @@ class BaseConnector:
 
 
 class _DNSCacheTable:
-    def __init__(self, ttl: Optional[float] = None) -> None:
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        stale_ttl: float = 0,
+        negative_ttl: float = 0,
+    ) -> None:
         self._addrs_rr: Dict[Tuple[str, int], Tuple[Iterator[Dict[str, Any]], int]] = {}
         self._timestamps: Dict[Tuple[str, int], float] = {}
+        # The error is stored as type and args, every hit raises a new
+        # instance so tracebacks don't pile up on a shared exception.
+        self._failures: Dict[Tuple[str, int], Tuple[OSError, float]] = {}
         self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._negative_ttl = negative_ttl
 
     def __contains__(self, host: object) -> bool:
         return host in self._addrs_rr
 
     def add(self, key: Tuple[str, int], addrs: List[Dict[str, Any]]) -> None:
         self._addrs_rr[key] = (cycle(addrs), len(addrs))
+        self._failures.pop(key, None)
 
         if self._ttl is not None:
             self._timestamps[key] = monotonic()
 
+    def add_failure(self, key: Tuple[str, int], exc: OSError) -> None:
+        if self._negative_ttl > 0:
+            deadline = monotonic() + self._negative_ttl
+            # a copy does not keep the frames of the traceback alive
+            self._failures[key] = (_copy_os_error(exc), deadline)
+
     def remove(self, key: Tuple[str, int]) -> None:
         self._addrs_rr.pop(key, None)
+        self._failures.pop(key, None)
 
         if self._ttl is not None:
             self._timestamps.pop(key, None)
@@ -689,6 +908,7 @@ class _DNSCacheTable:
     def clear(self) -> None:
         self._addrs_rr.clear()
         self._timestamps.clear()
+        self._failures.clear()
 
     def next_addrs(self, key: Tuple[str, int]) -> List[Dict[str, Any]]:
         loop, length = self._addrs_rr[key]
@@ -703,6 +923,59 @@ class _DNSCacheTable:
 
         return self._timestamps[key] + self._ttl < monotonic()
 
+    def stale(self, key: Tuple[str, int]) -> bool:
+        """Whether an expired entry may still be used while refreshing it."""
+        if self._ttl is None:
+            return False
+
+        return monotonic() <= self._timestamps[key] + self._ttl + self._stale_ttl
+
+    def failure(self, key: Tuple[str, int]) -> Optional[OSError]:
+        """Return the cached resolution error of the key if any."""
+        try:
+            exc, deadline = self._failures[key]
+        except KeyError:
+            return None
+        if deadline < monotonic():
+            del self._failures[key]
+            return None
+        return _copy_os_error(exc)
+
+
+def _copy_os_error(exc: OSError) -> OSError:
+    """Return a copy of the error without its traceback and context."""
+    try:
+        return copy.copy(exc)
+    except TypeError:
+        # __init__ of a subclass does not accept the args
+        new = type(exc).__new__(type(exc), *exc.args)
+        new.__dict__.update(exc.__dict__)
+        new.errno = exc.errno
+        new.strerror = exc.strerror
+        new.filename = exc.filename
+        return new
+
+
+def _interleave_addrinfos(hosts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Alternate address families, keeping the order within each of them."""
+    families: Dict[int, Deque[Dict[str, Any]]] = {}
+    for hinfo in hosts:
+        families.setdefault(hinfo["family"], deque()).append(hinfo)
+    interleaved = []
+    queues = list(families.values())
+    while queues:
+        for queue in queues:
+            interleaved.append(queue.popleft())
+        queues = [queue for queue in queues if queue]
+    return interleaved
+
+
+def _close_unused_connection(
+    task: "asyncio.Task[Tuple[asyncio.Transport, ResponseHandler]]",
+) -> None:
+    if not task.cancelled() and task.exception() is None:
+        task.result()[0].close()
+
 
 class TCPConnector(BaseConnector):
     """TCP connector.
@@ -716,14 +989,22 @@ class TCPConnector(BaseConnector):
         resolver
     use_dns_cache - Use memory cache for DNS lookups.
     ttl_dns_cache - Max seconds having cached a DNS entry, None forever.
+    ttl_dns_stale - Seconds to keep using an expired DNS entry
+        while it is refreshed in the background.
+    ttl_dns_negative - Seconds having cached a DNS resolution error.
     family - socket address family
     local_addr - local tuple of (host, port) to bind socket to
+    happy_eyeballs_delay - Seconds to wait for a connection attempt
+        before starting the next one in parallel (RFC 8305),
+        None to try the addresses one after another.
 
     keepalive_timeout - (optional) Keep-alive timeout.
     force_close - Set to True to force close and do reconnect
         after each request (and between redirects).
     limit - The total number of simultaneous connections.
     limit_per_host - Number of simultaneous connections to one host.
+    limit_idle - The total number of idle keep-alive connections.
+    scheduling - The order of waking up requests waiting for a connection.
     enable_cleanup_closed - Enables clean-up closed ssl transports.
                             Disabled by default.
     loop - Optional event loop.
@@ -734,14 +1015,19 @@ class TCPConnector(BaseConnector):
         *,
         use_dns_cache: bool = True,
         ttl_dns_cache: Optional[int] = 10,
+        ttl_dns_stale: float = 0,
+        ttl_dns_negative: float = 0,
         family: int = 0,
         ssl: Union[None, Literal[False], Fingerprint, SSLContext] = None,
         local_addr: Optional[Tuple[str, int]] = None,
+        happy_eyeballs_delay: Optional[float] = None,
         resolver: Optional[AbstractResolver] = None,
         keepalive_timeout: Union[None, float, _SENTINEL] = sentinel,
         force_close: bool = False,
         limit: int = 100,
         limit_per_host: int = 0,
+        limit_idle: int = 0,
+        scheduling: str = "fifo",
         enable_cleanup_closed: bool = False,
         timeout_ceil_threshold: float = 5,
     ) -> None:
@@ -750,6 +1036,8 @@ class TCPConnector(BaseConnector):
             force_close=force_close,
             limit=limit,
             limit_per_host=limit_per_host,
+            limit_idle=limit_idle,
+            scheduling=scheduling,
             enable_cleanup_closed=enable_cleanup_closed,
             timeout_ceil_threshold=timeout_ceil_threshold,
         )
@@ -765,16 +1053,127 @@ class TCPConnector(BaseConnector):
         self._resolver: AbstractResolver = resolver
 
         self._use_dns_cache = use_dns_cache
-        self._cached_hosts = _DNSCacheTable(ttl=ttl_dns_cache)
+        self._cached_hosts = _DNSCacheTable(
+            ttl=ttl_dns_cache, stale_ttl=ttl_dns_stale, negative_ttl=ttl_dns_negative
+        )
+        self._dns_refresh_tasks: Dict[Tuple[str, int], "asyncio.Task[None]"] = {}
         self._throttle_dns_events: Dict[Tuple[str, int], EventResultOrError] = {}
         self._family = family
         self._local_addr = local_addr
+        self._happy_eyeballs_delay = happy_eyeballs_delay
+
+        # {key: (request, number of idle connections to keep)}
+        self._keep_idle: Dict[ConnectionKey, Tuple[ClientRequest, int]] = {}
+        self._prewarm_tasks: Dict[ConnectionKey, "asyncio.Task[None]"] = {}
 
     def _close_immediately(self) -> List["asyncio.Future[None]"]:
         for ev in self._throttle_dns_events.values():
             ev.cancel()
+        for dns_task in self._dns_refresh_tasks.values():
+            dns_task.cancel()
+        for task in self._prewarm_tasks.values():
+            task.cancel()
+        self._prewarm_tasks.clear()
+        self._keep_idle.clear()
         return super()._close_immediately()
 
+    async def prewarm(
+        self,
+        urls: Iterable[StrOrURL],
+        *,
+        per_host: int = 1,
+        keep_idle: bool = False,
+        timeout: Optional["ClientTimeout"] = None,
+    ) -> None:
+        """Open idle connections before sending requests.
+
+        Resolves, connects and TLS handshakes connections to the endpoints
+        of urls until each of them has per_host idle connections.  With
+        keep_idle the pool is topped back up as the idle connections expire.
+        """
+        if per_host < 1:
+            raise ValueError("per_host should be positive, got {!r}".format(per_host))
+        if timeout is None:
+            from .client import ClientTimeout  # circular import
+
+            timeout = ClientTimeout()
+
+        reqs: Dict[ConnectionKey, ClientRequest] = {}
+        for url in urls:
+            req = ClientRequest(hdrs.METH_GET, URL(url), loop=self._loop)
+            reqs.setdefault(req.connection_key, req)
+        if keep_idle:
+            for key, req in reqs.items():
+                self._keep_idle[key] = (req, per_host)
+            self._schedule_refill()
+
+        async with ceil_timeout(timeout.total, timeout.ceil_threshold):
+            await asyncio.gather(
+                *(self._prewarm(req, per_host, timeout) for req in reqs.values())
+            )
+
+    async def _prewarm(
+        self, req: ClientRequest, per_host: int, timeout: "ClientTimeout"
+    ) -> None:
+        key = req.connection_key
+        missing = per_host - (len(self._conns[key]) if key in self._conns else 0)
+        if missing <= 0:
+            return
+
+        async def connect() -> ResponseHandler:
+            async with ceil_timeout(timeout.connect, timeout.ceil_threshold):
+                return await self._create_connection(req, [], timeout)
+
+        results = await asyncio.gather(
+            *(connect() for i in range(missing)), return_exceptions=True
+        )
+        errors = []
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(result)
+            elif self._closed:
+                result.close()
+            else:
+                self._add_idle(key, result)
+        if errors:
+            raise errors[0]
+
+    def _cleanup(self) -> None:
+        super()._cleanup()
+
+        for key, (req, per_host) in self._keep_idle.items():
+            if key not in self._prewarm_tasks:
+                task = self._loop.create_task(self._refill(req, per_host))
+                self._prewarm_tasks[key] = task
+        self._schedule_refill()
+
+    def _schedule_refill(self) -> None:
+        # The base class only re-arms the cleanup while connections are
+        # idle, keep it armed to retry failed refills of an empty pool.
+        if self._keep_idle and self._cleanup_handle is None:
+            self._cleanup_handle = helpers.weakref_handle(
+                self,
+                "_cleanup",
+                self._keepalive_timeout,
+                self._loop,
+                timeout_ceil_threshold=self._timeout_ceil_threshold,
+            )
+
+    async def _refill(self, req: ClientRequest, per_host: int) -> None:
+        from .client import ClientTimeout  # circular import
+
+        key = req.connection_key
+        timeout = ClientTimeout()
+        try:
+            async with ceil_timeout(timeout.total, timeout.ceil_threshold):
+                await self._prewarm(req, per_host, timeout)
+        except Exception:
+            client_logger.debug(
+                "Cannot refill idle connections to %s", key, exc_info=True
+            )
+        finally:
+            self._prewarm_tasks.pop(key, None)
+
     @property
     def family(self) -> int:
         """Socket family like AF_INET."""
@@ -826,14 +1225,54 @@ class TCPConnector(BaseConnector):
 
         key = (host, port)
 
-        if (key in self._cached_hosts) and (not self._cached_hosts.expired(key)):
-            # get result early, before any await (#4014)
-            result = self._cached_hosts.next_addrs(key)
+        if key in self._cached_hosts:
+            if not self._cached_hosts.expired(key):
+                # get result early, before any await (#4014)
+                result = self._cached_hosts.next_addrs(key)
+
+                if traces:
+                    for trace in traces:
+                        await trace.send_dns_cache_hit(host)
+                return result
+
+            if self._cached_hosts.stale(key):
+                result = self._cached_hosts.next_addrs(key)
+                if (
+                    key not in self._dns_refresh_tasks
+                    and key not in self._throttle_dns_events
+                    and self._cached_hosts.failure(key) is None
+                ):
+                    self._dns_refresh_tasks[key] = self._loop.create_task(
+                        self._refresh_host(host, port)
+                    )
+
+                if traces:
+                    for trace in traces:
+                        await trace.send_dns_cache_hit(host, stale=True)
+                return result
 
+        failure = self._cached_hosts.failure(key)
+        if failure is not None:
             if traces:
                 for trace in traces:
                     await trace.send_dns_cache_hit(host)
-            return result
+            raise failure
+
+        return await self._resolve_host_throttled(host, port, traces)
+
+    async def _refresh_host(self, host: str, port: int) -> None:
+        # The failure is cached for the negative TTL,
+        # the stale addresses are used until then.
+        try:
+            with suppress(Exception):
+                await self._resolve_host_throttled(host, port, None)
+        finally:
+            self._dns_refresh_tasks.pop((host, port), None)
+
+    async def _resolve_host_throttled(
+        self, host: str, port: int, traces: Optional[List["Trace"]]
+    ) -> List[Dict[str, Any]]:
+        key = (host, port)
 
         if key in self._throttle_dns_events:
             # get event early, before any await (#4014)
@@ -861,6 +1300,8 @@ class TCPConnector(BaseConnector):
                 self._cached_hosts.add(key, addrs)
                 self._throttle_dns_events[key].set()
             except BaseException as e:
+                if isinstance(e, OSError):
+                    self._cached_hosts.add_failure(key, e)
                 # any DNS exception, independently of the implementation
                 # is set for the waiters to raise the same exception.
                 self._throttle_dns_events[key].set(exc=e)
@@ -1115,50 +1556,122 @@ class TCPConnector(BaseConnector):
             # it is problem of resolving proxy ip itself
             raise ClientConnectorError(req.connection_key, exc) from exc
 
+        if self._happy_eyeballs_delay is not None:
+            return await self._connect_happy_eyeballs(
+                req, hosts, timeout, sslcontext, fingerprint, client_error
+            )
+
         last_exc: Optional[Exception] = None
 
         for hinfo in hosts:
-            host = hinfo["host"]
-            port = hinfo["port"]
-
-            # Strip trailing dots, certificates contain FQDN without dots.
-            # See https://github.com/aio-libs/aiohttp/issues/3636
-            server_hostname = (
-                (req.server_hostname or hinfo["hostname"]).rstrip(".")
-                if sslcontext
-                else None
-            )
-
             try:
-                transp, proto = await self._wrap_create_connection(
-                    self._factory,
-                    host,
-                    port,
-                    timeout=timeout,
-                    ssl=sslcontext,
-                    family=hinfo["family"],
-                    proto=hinfo["proto"],
-                    flags=hinfo["flags"],
-                    server_hostname=server_hostname,
-                    local_addr=self._local_addr,
-                    req=req,
-                    client_error=client_error,
+                return await self._connect_addr(
+                    req, hinfo, timeout, sslcontext, fingerprint, client_error
                 )
-            except ClientConnectorError as exc:
+            except (ClientConnectorError, ServerFingerprintMismatch) as exc:
                 last_exc = exc
-                continue
 
-            if req.is_ssl() and fingerprint:
-                try:
-                    fingerprint.check(transp)
-                except ServerFingerprintMismatch as exc:
-                    transp.close()
-                    if not self._cleanup_closed_disabled:
-                        self._cleanup_closed_transports.append(transp)
-                    last_exc = exc
-                    continue
-
-            return transp, proto
+        assert last_exc is not None
+        raise last_exc
+
+    async def _connect_addr(
+        self,
+        req: ClientRequest,
+        hinfo: Dict[str, Any],
+        timeout: "ClientTimeout",
+        sslcontext: Optional[SSLContext],
+        fingerprint: Optional["Fingerprint"],
+        client_error: Type[Exception],
+    ) -> Tuple[asyncio.Transport, ResponseHandler]:
+        # Strip trailing dots, certificates contain FQDN without dots.
+        # See https://github.com/aio-libs/aiohttp/issues/3636
+        server_hostname = (
+            (req.server_hostname or hinfo["hostname"]).rstrip(".")
+            if sslcontext
+            else None
+        )
+
+        transp, proto = await self._wrap_create_connection(
+            self._factory,
+            hinfo["host"],
+            hinfo["port"],
+            timeout=timeout,
+            ssl=sslcontext,
+            family=hinfo["family"],
+            proto=hinfo["proto"],
+            flags=hinfo["flags"],
+            server_hostname=server_hostname,
+            local_addr=self._local_addr,
+            req=req,
+            client_error=client_error,
+        )
+
+        if req.is_ssl() and fingerprint:
+            try:
+                fingerprint.check(transp)
+            except ServerFingerprintMismatch:
+                transp.close()
+                if not self._cleanup_closed_disabled:
+                    self._cleanup_closed_transports.append(transp)
+                raise
+
+        return transp, proto
+
+    async def _connect_happy_eyeballs(
+        self,
+        req: ClientRequest,
+        hosts: List[Dict[str, Any]],
+        timeout: "ClientTimeout",
+        sslcontext: Optional[SSLContext],
+        fingerprint: Optional["Fingerprint"],
+        client_error: Type[Exception],
+    ) -> Tuple[asyncio.Transport, ResponseHandler]:
+        """Race staggered connection attempts, the first success wins.
+
+        The next address is tried when the previous attempt fails or does
+        not complete within the delay, the pending attempts are cancelled
+        once a connection is established.
+        """
+        addrs = iter(_interleave_addrinfos(hosts))
+        pending: Set["asyncio.Task[Tuple[asyncio.Transport, ResponseHandler]]"] = set()
+        last_exc: Optional[BaseException] = None
+        started_all = False
+        try:
+            while True:
+                if not started_all:
+                    hinfo = next(addrs, None)
+                    if hinfo is None:
+                        started_all = True
+                    else:
+                        attempt = self._connect_addr(
+                            req, hinfo, timeout, sslcontext, fingerprint, client_error
+                        )
+                        pending.add(self._loop.create_task(attempt))
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=None if started_all else self._happy_eyeballs_delay,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                winner = None
+                for task in done:
+                    exc = task.exception()
+                    if exc is not None:
+                        last_exc = exc
+                    elif winner is None:
+                        winner = task.result()
+                    else:
+                        # connected at the same time as the winner
+                        task.result()[0].close()
+                if winner is not None:
+                    return winner
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(_close_unused_connection)
+
         assert last_exc is not None
         raise last_exc
 
@@ -1063,3 +1063,22 @@ def parse_http_date(date_str: Optional[str]) -> Optional[datetime.datetime]:
             with suppress(ValueError):
                 return datetime.datetime(*timetuple[:6], tzinfo=datetime.timezone.utc)
     return None
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """Return the q-values of an Accept-Encoding header by lower case coding."""
+    qvalues: Dict[str, float] = {}
+    for item in value.lower().split(","):
+        coding, _, params = item.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, param_value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(param_value)
+                except ValueError:
+                    q = 0.0
+        coding = coding.strip()
+        if coding:
+            qvalues[coding] = q
+    return qvalues
@@ -2,11 +2,13 @@ import abc
 import asyncio
 import re
 import string
+from concurrent.futures import Executor
 from contextlib import suppress
 from enum import IntEnum
 from typing import (
     Any,
     ClassVar,
+    Dict,
     Final,
     Generic,
     List,
@@ -26,7 +28,14 @@ from yarl import URL
 
 from . import hdrs
 from .base_protocol import BaseProtocol
-from .compression_utils import HAS_BROTLI, BrotliDecompressor, ZLibDecompressor
+from .compression_utils import (
+    HAS_BROTLI,
+    HAS_ZSTD,
+    MAX_DECOMPRESS_SIZE,
+    BrotliDecompressor,
+    ZLibDecompressor,
+    ZstdDecompressor,
+)
 from .helpers import DEBUG, NO_EXTENSIONS, BaseTimerContext
 from .http_exceptions import (
     BadHttpMessage,
@@ -38,7 +47,7 @@ from .http_exceptions import (
     LineTooLong,
     TransferEncodingError,
 )
-from .http_writer import HttpVersion, HttpVersion10
+from .http_writer import HttpVersion, HttpVersion10, HttpVersion11
 from .log import internal_logger
 from .streams import EMPTY_PAYLOAD, StreamReader
 from .typedefs import RawHeaders
@@ -70,6 +79,76 @@ HDRRE: Final[Pattern[bytes]] = re.compile(
 )
 HEXDIGIT = re.compile(rb"[0-9a-fA-F]+")
 
+# Lookup tables letting the common cases skip the regular expressions.
+_METHODS: Final[Set[str]] = set(hdrs.METH_ALL)
+_VERSIONS: Final[Dict[str, HttpVersion]] = {
+    "HTTP/1.1": HttpVersion11,
+    "HTTP/1.0": HttpVersion10,
+}
+
+
+def _known_headers() -> Dict[bytes, istr]:
+    # Well-known header names, as canonical and as lower case spelling,
+    # mapped to interned istr objects.  The names are valid tokens.
+    known = {}
+    for name in vars(hdrs).values():
+        if isinstance(name, istr):
+            known[name.encode("ascii")] = name
+            lower = name.lower()
+            known[lower.encode("ascii")] = istr(lower)
+    return known
+
+
+_KNOWN_HEADERS: Final[Dict[bytes, istr]] = _known_headers()
+
+# https://www.rfc-editor.org/rfc/rfc9110.html#section-5.5-6
+# https://www.rfc-editor.org/rfc/rfc9110.html#name-collected-abnf
+_SINGLETONS: Final[Tuple[istr, ...]] = (
+    hdrs.CONTENT_LENGTH,
+    hdrs.CONTENT_LOCATION,
+    hdrs.CONTENT_RANGE,
+    hdrs.CONTENT_TYPE,
+    hdrs.ETAG,
+    hdrs.HOST,
+    hdrs.MAX_FORWARDS,
+    hdrs.SERVER,
+    hdrs.TRANSFER_ENCODING,
+    hdrs.USER_AGENT,
+)
+
+# Headers the parser needs for framing a message, by lower case name.
+# Expect is included so the server can answer 100-continue without
+# building the full headers.
+_FRAMING_HEADERS: Final[Dict[bytes, istr]] = {
+    name.lower().encode("ascii"): name
+    for name in _SINGLETONS
+    + (
+        hdrs.CONNECTION,
+        hdrs.CONTENT_ENCODING,
+        hdrs.EXPECT,
+        hdrs.SEC_WEBSOCKET_KEY1,
+    )
+}
+
+
+def _build_headers(raw_headers: RawHeaders) -> "CIMultiDictProxy[str]":
+    headers: CIMultiDict[str] = CIMultiDict()
+    for bname, bvalue in raw_headers:
+        name: Optional[str] = _KNOWN_HEADERS.get(bname)
+        if name is None:
+            name = bname.decode("utf-8", "surrogateescape")
+        headers.add(name, bvalue.decode("utf-8", "surrogateescape"))
+    return CIMultiDictProxy(headers)
+
+
+def _build_framing_headers(raw_headers: RawHeaders) -> "CIMultiDictProxy[str]":
+    headers: CIMultiDict[str] = CIMultiDict()
+    for bname, bvalue in raw_headers:
+        name = _FRAMING_HEADERS.get(bname.lower())
+        if name is not None:
+            headers.add(name, bvalue.decode("utf-8", "surrogateescape"))
+    return CIMultiDictProxy(headers)
+
 
 class RawRequestMessage(NamedTuple):
     method: str
@@ -84,6 +163,30 @@ class RawRequestMessage(NamedTuple):
     url: URL
 
 
+class _LazyRawRequestMessage(RawRequestMessage):
+    """Request message building its headers on first access.
+
+    The headers field holds only the headers needed for framing the
+    message, the full headers are built from raw_headers when asked for.
+    """
+
+    @property
+    def headers(self) -> "CIMultiDictProxy[str]":
+        try:
+            return self.__dict__["_headers"]  # type: ignore[no-any-return]
+        except KeyError:
+            headers = self.__dict__["_headers"] = _build_headers(self.raw_headers)
+            return headers
+
+    @property
+    def framing_headers(self) -> "CIMultiDictProxy[str]":
+        return super().headers
+
+    def _replace(self, **kwargs: Any) -> RawRequestMessage:  # type: ignore[override]
+        kwargs.setdefault("headers", self.headers)
+        return RawRequestMessage(*self)._replace(**kwargs)
+
+
 class RawResponseMessage(NamedTuple):
     version: HttpVersion
     code: int
@@ -126,7 +229,10 @@ class HeadersParser:
     def parse_headers(
         self, lines: List[bytes]
     ) -> Tuple["CIMultiDictProxy[str]", RawHeaders]:
-        headers: CIMultiDict[str] = CIMultiDict()
+        raw_headers = self.parse_raw_headers(lines)
+        return (_build_headers(raw_headers), raw_headers)
+
+    def parse_raw_headers(self, lines: List[bytes]) -> RawHeaders:
         raw_headers = []
 
         lines_idx = 1
@@ -135,26 +241,27 @@ class HeadersParser:
 
         while line:
             # Parse initial header name : value pair.
-            try:
-                bname, bvalue = line.split(b":", 1)
-            except ValueError:
-                raise InvalidHeader(line) from None
-
-            # https://www.rfc-editor.org/rfc/rfc9112.html#section-5.1-2
-            if {bname[0], bname[-1]} & {32, 9}:  # {" ", "\t"}
+            pos = line.find(b":")
+            if pos == -1:
                 raise InvalidHeader(line)
+            bname = line[:pos]
+            bvalue = line[pos + 1 :].lstrip(b" \t")
 
-            bvalue = bvalue.lstrip(b" \t")
-            if HDRRE.search(bname):
-                raise InvalidHeader(bname)
-            if len(bname) > self.max_field_size:
-                raise LineTooLong(
-                    "request header name {}".format(
-                        bname.decode("utf8", "backslashreplace")
-                    ),
-                    str(self.max_field_size),
-                    str(len(bname)),
-                )
+            if bname not in _KNOWN_HEADERS:
+                # https://www.rfc-editor.org/rfc/rfc9112.html#section-5.1-2
+                if {bname[0], bname[-1]} & {32, 9}:  # {" ", "\t"}
+                    raise InvalidHeader(line)
+
+                if HDRRE.search(bname):
+                    raise InvalidHeader(bname)
+                if len(bname) > self.max_field_size:
+                    raise LineTooLong(
+                        "request header name {}".format(
+                            bname.decode("utf8", "backslashreplace")
+                        ),
+                        str(self.max_field_size),
+                        str(len(bname)),
+                    )
 
             header_length = len(bvalue)
 
@@ -201,17 +308,14 @@ class HeadersParser:
                     )
 
             bvalue = bvalue.strip(b" \t")
-            name = bname.decode("utf-8", "surrogateescape")
-            value = bvalue.decode("utf-8", "surrogateescape")
 
             # https://www.rfc-editor.org/rfc/rfc9110.html#section-5.5-5
-            if "\n" in value or "\r" in value or "\x00" in value:
+            if 10 in bvalue or 13 in bvalue or 0 in bvalue:  # ("\n", "\r", "\x00")
                 raise InvalidHeader(bvalue)
 
-            headers.add(name, value)
             raw_headers.append((bname, bvalue))
 
-        return (CIMultiDictProxy(headers), tuple(raw_headers))
+        return tuple(raw_headers)
 
 
 class HttpParser(abc.ABC, Generic[_MsgT]):
@@ -232,6 +336,9 @@ class HttpParser(abc.ABC, Generic[_MsgT]):
         response_with_body: bool = True,
         read_until_eof: bool = False,
         auto_decompress: bool = True,
+        zlib_executor_size: Optional[int] = None,
+        zlib_executor: Optional[Executor] = None,
+        zstd_dict: Optional[bytes] = None,
     ) -> None:
         self.protocol = protocol
         self.loop = loop
@@ -251,6 +358,9 @@ class HttpParser(abc.ABC, Generic[_MsgT]):
         self._payload = None
         self._payload_parser: Optional[HttpPayloadParser] = None
         self._auto_decompress = auto_decompress
+        self._zlib_executor_size = zlib_executor_size
+        self._zlib_executor = zlib_executor
+        self._zstd_dict = zstd_dict
         self._limit = limit
         self._headers_parser = HeadersParser(max_line_size, max_field_size)
 
@@ -303,12 +413,21 @@ class HttpParser(abc.ABC, Generic[_MsgT]):
                     continue
 
                 if pos >= start_pos:
-                    # line found
-                    line = data[start_pos:pos]
-                    if SEP == b"\n":  # For lax response parsing
-                        line = line.rstrip(b"\r")
-                    self._lines.append(line)
-                    start_pos = pos + len(SEP)
+                    end = -1
+                    if SEP == b"\r\n" and not self._lines:
+                        end = data.find(b"\r\n\r\n", pos)
+                    if end != -1:
+                        # the whole message head is received, split it at once
+                        self._lines.extend(data[start_pos:end].split(SEP))
+                        self._lines.append(EMPTY)
+                        start_pos = end + 4
+                    else:
+                        # line found
+                        line = data[start_pos:pos]
+                        if SEP == b"\n":  # For lax response parsing
+                            line = line.rstrip(b"\r")
+                        self._lines.append(line)
+                        start_pos = pos + len(SEP)
 
                     # \r\n\r\n found
                     if self._lines[-1] == EMPTY:
@@ -317,9 +436,15 @@ class HttpParser(abc.ABC, Generic[_MsgT]):
                         finally:
                             self._lines.clear()
 
+                        headers: CIMultiDictProxy[str]
+                        if isinstance(msg, _LazyRawRequestMessage):
+                            headers = msg.framing_headers
+                        else:
+                            headers = msg.headers
+
                         def get_content_length() -> Optional[int]:
                             # payload length
-                            length_hdr = msg.headers.get(CONTENT_LENGTH)
+                            length_hdr = headers.get(CONTENT_LENGTH)
                             if length_hdr is None:
                                 return None
 
@@ -332,7 +457,7 @@ class HttpParser(abc.ABC, Generic[_MsgT]):
 
                         length = get_content_length()
                         # do not support old websocket spec
-                        if SEC_WEBSOCKET_KEY1 in msg.headers:
+                        if SEC_WEBSOCKET_KEY1 in headers:
                             raise InvalidHeader(SEC_WEBSOCKET_KEY1)
 
                         self._upgraded = msg.upgrade
@@ -363,6 +488,9 @@ class HttpParser(abc.ABC, Generic[_MsgT]):
                                 response_with_body=self.response_with_body,
                                 auto_decompress=self._auto_decompress,
                                 lax=self.lax,
+                                zlib_executor_size=self._zlib_executor_size,
+                                zlib_executor=self._zlib_executor,
+                                zstd_dict=self._zstd_dict,
                             )
                             if not payload_parser.done:
                                 self._payload_parser = payload_parser
@@ -382,6 +510,9 @@ class HttpParser(abc.ABC, Generic[_MsgT]):
                                 readall=True,
                                 auto_decompress=self._auto_decompress,
                                 lax=self.lax,
+                                zlib_executor_size=self._zlib_executor_size,
+                                zlib_executor=self._zlib_executor,
+                                zstd_dict=self._zstd_dict,
                             )
                         else:
                             if (
@@ -406,6 +537,9 @@ class HttpParser(abc.ABC, Generic[_MsgT]):
                                     response_with_body=self.response_with_body,
                                     auto_decompress=self._auto_decompress,
                                     lax=self.lax,
+                                    zlib_executor_size=self._zlib_executor_size,
+                                    zlib_executor=self._zlib_executor,
+                                    zstd_dict=self._zstd_dict,
                                 )
                                 if not payload_parser.done:
                                     self._payload_parser = payload_parser
@@ -456,7 +590,7 @@ class HttpParser(abc.ABC, Generic[_MsgT]):
         return messages, self._upgraded, data
 
     def parse_headers(
-        self, lines: List[bytes]
+        self, lines: List[bytes], lazy: bool = False
     ) -> Tuple[
         "CIMultiDictProxy[str]", RawHeaders, Optional[bool], Optional[str], bool, bool
     ]:
@@ -464,28 +598,21 @@ class HttpParser(abc.ABC, Generic[_MsgT]):
 
         Line continuations are supported. Returns list of header name
         and value pairs. Header name is in upper case.
+
+        With lazy set only the headers needed for framing the message
+        are decoded into the returned multidict.
         """
-        headers, raw_headers = self._headers_parser.parse_headers(lines)
+        if lazy:
+            raw_headers = self._headers_parser.parse_raw_headers(lines)
+            headers = _build_framing_headers(raw_headers)
+        else:
+            headers, raw_headers = self._headers_parser.parse_headers(lines)
         close_conn = None
         encoding = None
         upgrade = False
         chunked = False
 
-        # https://www.rfc-editor.org/rfc/rfc9110.html#section-5.5-6
-        # https://www.rfc-editor.org/rfc/rfc9110.html#name-collected-abnf
-        singletons = (
-            hdrs.CONTENT_LENGTH,
-            hdrs.CONTENT_LOCATION,
-            hdrs.CONTENT_RANGE,
-            hdrs.CONTENT_TYPE,
-            hdrs.ETAG,
-            hdrs.HOST,
-            hdrs.MAX_FORWARDS,
-            hdrs.SERVER,
-            hdrs.TRANSFER_ENCODING,
-            hdrs.USER_AGENT,
-        )
-        bad_hdr = next((h for h in singletons if len(headers.getall(h, ())) > 1), None)
+        bad_hdr = next((h for h in _SINGLETONS if len(headers.getall(h, ())) > 1), None)
         if bad_hdr is not None:
             raise BadHttpMessage(f"Duplicate '{bad_hdr}' header found.")
 
@@ -504,7 +631,7 @@ class HttpParser(abc.ABC, Generic[_MsgT]):
         enc = headers.get(hdrs.CONTENT_ENCODING)
         if enc:
             enc = enc.lower()
-            if enc in ("gzip", "deflate", "br"):
+            if enc in ("gzip", "deflate", "br", "zstd"):
                 encoding = enc
 
         # chunking
@@ -536,8 +663,15 @@ class HttpRequestParser(HttpParser[RawRequestMessage]):
     Exception .http_exceptions.BadStatusLine
     could be raised in case of any errors in status line.
     Returns RawRequestMessage.
+
+    With lazy_headers set the headers multidict of the returned
+    messages is only built when it is first accessed.
     """
 
+    def __init__(self, *args: Any, lazy_headers: bool = False, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._lazy_headers = lazy_headers
+
     def parse_message(self, lines: List[bytes]) -> RawRequestMessage:
         # request line
         line = lines[0].decode("utf-8", "surrogateescape")
@@ -552,14 +686,16 @@ class HttpRequestParser(HttpParser[RawRequestMessage]):
             )
 
         # method
-        if not METHRE.fullmatch(method):
+        if method not in _METHODS and not METHRE.fullmatch(method):
             raise BadStatusLine(method)
 
         # version
-        match = VERSRE.fullmatch(version)
-        if match is None:
-            raise BadStatusLine(line)
-        version_o = HttpVersion(int(match.group(1)), int(match.group(2)))
+        version_o = _VERSIONS.get(version)
+        if version_o is None:
+            match = VERSRE.fullmatch(version)
+            if match is None:
+                raise BadStatusLine(line)
+            version_o = HttpVersion(int(match.group(1)), int(match.group(2)))
 
         if method == "CONNECT":
             # authority-form,
@@ -602,7 +738,7 @@ class HttpRequestParser(HttpParser[RawRequestMessage]):
             compression,
             upgrade,
             chunked,
-        ) = self.parse_headers(lines)
+        ) = self.parse_headers(lines, self._lazy_headers)
 
         if close is None:  # then the headers weren't set in the request
             if version_o <= HttpVersion10:  # HTTP 1.0 must asks to not close
@@ -610,7 +746,10 @@ class HttpRequestParser(HttpParser[RawRequestMessage]):
             else:  # HTTP 1.1 must ask to close.
                 close = False
 
-        return RawRequestMessage(
+        message_cls = (
+            _LazyRawRequestMessage if self._lazy_headers else RawRequestMessage
+        )
+        return message_cls(
             method,
             path,
             version_o,
@@ -663,10 +802,12 @@ class HttpResponseParser(HttpParser[RawResponseMessage]):
             )
 
         # version
-        match = VERSRE.fullmatch(version)
-        if match is None:
-            raise BadStatusLine(line)
-        version_o = HttpVersion(int(match.group(1)), int(match.group(2)))
+        version_o = _VERSIONS.get(version)
+        if version_o is None:
+            match = VERSRE.fullmatch(version)
+            if match is None:
+                raise BadStatusLine(line)
+            version_o = HttpVersion(int(match.group(1)), int(match.group(2)))
 
         # The status code is a three-digit number
         if len(status) != 3 or not status.isdecimal():
@@ -712,6 +853,9 @@ class HttpPayloadParser:
         response_with_body: bool = True,
         auto_decompress: bool = True,
         lax: bool = False,
+        zlib_executor_size: Optional[int] = None,
+        zlib_executor: Optional[Executor] = None,
+        zstd_dict: Optional[bytes] = None,
     ) -> None:
         self._length = 0
         self._type = ParseState.PARSE_NONE
@@ -725,7 +869,11 @@ class HttpPayloadParser:
         # payload decompression wrapper
         if response_with_body and compression and self._auto_decompress:
             real_payload: Union[StreamReader, DeflateBuffer] = DeflateBuffer(
-                payload, compression
+                payload,
+                compression,
+                executor=zlib_executor,
+                executor_size=zlib_executor_size,
+                zstd_dict=zstd_dict,
             )
         else:
             real_payload = payload
@@ -898,15 +1046,42 @@ class HttpPayloadParser:
 
 
 class DeflateBuffer:
-    """DeflateStream decompress stream and feed data into specified stream."""
+    """DeflateStream decompress stream and feed data into specified stream.
+
+    Deflate, gzip and zstd data is inflated in steps of at most
+    max_length bytes.  While the output stream is above its high-water mark the
+    remaining input is kept back and inflating continues once the
+    stream has been read below its low-water mark.
 
-    def __init__(self, out: StreamReader, encoding: Optional[str]) -> None:
+    Input longer than executor_size is inflated in executor, reading
+    from the transport is paused until the step is done.
+    """
+
+    def __init__(
+        self,
+        out: StreamReader,
+        encoding: Optional[str],
+        max_length: int = MAX_DECOMPRESS_SIZE,
+        executor: Optional[Executor] = None,
+        executor_size: Optional[int] = None,
+        zstd_dict: Optional[bytes] = None,
+    ) -> None:
         self.out = out
         self.size = 0
         self.encoding = encoding
         self._started_decoding = False
-
-        self.decompressor: Union[BrotliDecompressor, ZLibDecompressor]
+        self._max_length = max_length
+        self._executor = executor
+        self._executor_size = executor_size
+        # Input waiting for the output stream to be drained
+        # or for the executor to finish.
+        self._pending = b""
+        self._stalled = False
+        self._job: Optional[asyncio.Future[bytes]] = None
+        self._paused_reading = False
+        self._eof = False
+
+        self.decompressor: Union[BrotliDecompressor, ZLibDecompressor, ZstdDecompressor]
         if encoding == "br":
             if not HAS_BROTLI:  # pragma: no cover
                 raise ContentEncodingError(
@@ -914,6 +1089,13 @@ class DeflateBuffer:
                     "Please install `Brotli`"
                 )
             self.decompressor = BrotliDecompressor()
+        elif encoding == "zstd":
+            if not HAS_ZSTD:  # pragma: no cover
+                raise ContentEncodingError(
+                    "Can not decode content-encoding: zstd. "
+                    "Please install `zstandard`"
+                )
+            self.decompressor = ZstdDecompressor(dict_data=zstd_dict)
         else:
             self.decompressor = ZLibDecompressor(encoding=encoding)
 
@@ -926,6 +1108,10 @@ class DeflateBuffer:
 
         self.size += size
 
+        if self._stalled or self._job is not None:
+            self._pending += chunk
+            return
+
         # RFC1950
         # bits 0..3 = CM = 0b1000 = 8 = "deflate"
         # bits 4..7 = CINFO = 1..7 = windows size.
@@ -940,6 +1126,10 @@ class DeflateBuffer:
                 encoding=self.encoding, suppress_deflate_header=True
             )
 
+        if isinstance(self.decompressor, (ZLibDecompressor, ZstdDecompressor)):
+            self._inflate(chunk)
+            return
+
         try:
             chunk = self.decompressor.decompress_sync(chunk)
         except Exception:
@@ -952,12 +1142,101 @@ class DeflateBuffer:
         if chunk:
             self.out.feed_data(chunk, len(chunk))
 
+    def _inflate(self, data: Optional[bytes]) -> None:
+        decompressor = self.decompressor
+        assert isinstance(decompressor, (ZLibDecompressor, ZstdDecompressor))
+        max_length = self._max_length
+        executor_size = self._executor_size
+
+        while data is not None:
+            if executor_size is not None and len(data) > executor_size:
+                self._started_decoding = True
+                loop = asyncio.get_running_loop()
+                self._job = loop.run_in_executor(
+                    self._executor, decompressor.decompress_sync, data, max_length
+                )
+                self._job.add_done_callback(self._inflated)
+                protocol = self.out._protocol
+                if not protocol._reading_paused:
+                    protocol.pause_reading()
+                    self._paused_reading = True
+                return
+
+            try:
+                chunk = decompressor.decompress_sync(data, max_length)
+            except Exception:
+                raise ContentEncodingError(
+                    "Can not decode content-encoding: %s" % self.encoding
+                )
+
+            data = self._feed_inflated(chunk)
+
+    def _feed_inflated(self, chunk: bytes) -> Optional[bytes]:
+        # Returns the input to inflate next, None when done or stalled.
+        self._started_decoding = True
+        out = self.out
+        if chunk:
+            out.feed_data(chunk, len(chunk))
+
+        assert isinstance(self.decompressor, (ZLibDecompressor, ZstdDecompressor))
+        data = self.decompressor.unconsumed_tail
+        if self._pending:
+            data += self._pending
+            self._pending = b""
+
+        if not data and len(chunk) < self._max_length:
+            # all input is inflated
+            return None
+
+        if out._size > out._high_water:
+            self._pending = data
+            self._stalled = True
+            out._drain_callback = self._resume
+            return None
+
+        return data
+
+    def _inflated(self, job: "asyncio.Future[bytes]") -> None:
+        self._job = None
+        if self._paused_reading:
+            self._paused_reading = False
+            self.out._protocol.resume_reading()
+
+        # a cancelled job never feeds the rest, fail the readers
+        if job.cancelled() or job.exception() is not None:
+            self.out.set_exception(
+                ContentEncodingError(
+                    "Can not decode content-encoding: %s" % self.encoding
+                )
+            )
+            return
+
+        self._continue(self._feed_inflated(job.result()))
+
+    def _resume(self) -> None:
+        data, self._pending = self._pending, b""
+        self._stalled = False
+        self._continue(data)
+
+    def _continue(self, data: Optional[bytes]) -> None:
+        try:
+            self._inflate(data)
+            if self._eof and not self._stalled and self._job is None:
+                self.feed_eof()
+        except ContentEncodingError as exc:
+            self.out.set_exception(exc)
+
     def feed_eof(self) -> None:
+        if self._stalled or self._job is not None:
+            # finished when the pending input is inflated
+            self._eof = True
+            return
+
         chunk = self.decompressor.flush()
 
         if chunk or self.size > 0:
             self.out.feed_data(chunk, len(chunk))
-            # decompressor is not brotli unless encoding is "br"
+            # decompressor is zlib when encoding is "deflate"
             if self.encoding == "deflate" and not self.decompressor.eof:  # type: ignore[union-attr]
                 raise ContentEncodingError("deflate")
 
@@ -2,13 +2,21 @@
 
 import asyncio
 import zlib
-from typing import Any, Awaitable, Callable, NamedTuple, Optional, Union  # noqa
+from typing import (  # noqa
+    Any,
+    Awaitable,
+    Callable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from multidict import CIMultiDict
 
 from .abc import AbstractStreamWriter
 from .base_protocol import BaseProtocol
-from .compression_utils import ZLibCompressor
+from .compression_utils import ZLibCompressor, ZstdCompressor
 from .helpers import NO_EXTENSIONS
 
 __all__ = ("StreamWriter", "HttpVersion", "HttpVersion10", "HttpVersion11")
@@ -44,14 +52,18 @@ class StreamWriter(AbstractStreamWriter):
         self.output_size = 0
 
         self._eof = False
-        self._compress: Optional[ZLibCompressor] = None
+        self._compress: Union[ZLibCompressor, ZstdCompressor, None] = None
         self._drain_waiter = None
+        self._headers_buf: Optional[bytes] = None
+        self._headers_failed = False
 
         self._on_chunk_sent: _T_OnChunkSent = on_chunk_sent
         self._on_headers_sent: _T_OnHeadersSent = on_headers_sent
 
     @property
     def transport(self) -> Optional[asyncio.Transport]:
+        # data written to the transport directly must follow the headers
+        self._send_headers()
         return self._protocol.transport
 
     @property
@@ -62,18 +74,63 @@ class StreamWriter(AbstractStreamWriter):
         self.chunked = True
 
     def enable_compression(
-        self, encoding: str = "deflate", strategy: int = zlib.Z_DEFAULT_STRATEGY
+        self,
+        encoding: str = "deflate",
+        strategy: int = zlib.Z_DEFAULT_STRATEGY,
+        *,
+        level: Optional[int] = None,
+        zstd_dict: Optional[bytes] = None,
     ) -> None:
-        self._compress = ZLibCompressor(encoding=encoding, strategy=strategy)
+        if encoding == "zstd":
+            self._compress = ZstdCompressor(level=level, dict_data=zstd_dict)
+        else:
+            self._compress = ZLibCompressor(
+                encoding=encoding, strategy=strategy, level=level
+            )
+
+    def _check_transport(self) -> asyncio.Transport:
+        transport = self._protocol.transport
+        if (
+            self._headers_failed
+            or not self._protocol.connected
+            or transport is None
+            or transport.is_closing()
+        ):
+            raise ConnectionResetError("Cannot write to closing transport")
+        return transport
 
     def _write(self, chunk: bytes) -> None:
+        if self._headers_buf is not None:
+            self._writelines((chunk,))
+            return
         size = len(chunk)
         self.buffer_size += size
         self.output_size += size
-        transport = self.transport
-        if not self._protocol.connected or transport is None or transport.is_closing():
-            raise ConnectionResetError("Cannot write to closing transport")
-        transport.write(chunk)
+        self._check_transport().write(chunk)
+
+    def _writelines(self, chunks: Tuple[bytes, ...]) -> None:
+        """Write the buffers at once without joining them."""
+        if self._headers_buf is not None:
+            # coalesce the pending headers with the first body chunk
+            chunks = (self._headers_buf, *chunks)
+            self._headers_buf = None
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+        self.buffer_size += size
+        self.output_size += size
+        self._check_transport().writelines(chunks)
+
+    def _send_headers(self) -> None:
+        buf = self._headers_buf
+        if buf is None:
+            return
+        self._headers_buf = None
+        try:
+            self._write(buf)
+        except ConnectionResetError:
+            # raised by the next write or drain
+            self._headers_failed = True
 
     async def write(
         self, chunk: bytes, *, drain: bool = True, LIMIT: int = 0x10000
@@ -110,9 +167,9 @@ class StreamWriter(AbstractStreamWriter):
         if chunk:
             if self.chunked:
                 chunk_len_pre = ("%x\r\n" % len(chunk)).encode("ascii")
-                chunk = chunk_len_pre + chunk + b"\r\n"
-
-            self._write(chunk)
+                self._writelines((chunk_len_pre, chunk, b"\r\n"))
+            else:
+                self._write(chunk)
 
             if self.buffer_size > LIMIT and drain:
                 self.buffer_size = 0
@@ -122,12 +179,30 @@ class StreamWriter(AbstractStreamWriter):
         self, status_line: str, headers: "CIMultiDict[str]"
     ) -> None:
         """Write request/response status and headers."""
+        await self._write_headers(status_line, headers, b"")
+
+    async def _write_headers(
+        self, status_line: str, headers: "CIMultiDict[str]", template: bytes
+    ) -> None:
+        """Write status and headers followed by serialized *template* lines."""
         if self._on_headers_sent is not None:
             await self._on_headers_sent(headers)
 
         # status + headers
-        buf = _serialize_headers(status_line, headers)
-        self._write(buf)
+        if not template:
+            buf = _serialize_headers(status_line, headers)
+        elif headers:
+            # splice the static lines in before the terminating CRLF
+            buf = b"".join(
+                (_serialize_headers(status_line, headers)[:-2], template, b"\r\n")
+            )
+        else:
+            buf = b"".join((status_line.encode("utf-8"), b"\r\n", template, b"\r\n"))
+        self._check_transport()
+        # Headers are sent along with the body chunk written right after
+        # them, or on the next loop iteration if there is none yet.
+        self._headers_buf = buf
+        self.loop.call_soon(self._send_headers)
 
     async def write_eof(self, chunk: bytes = b"") -> None:
         if self._eof:
@@ -143,12 +218,14 @@ class StreamWriter(AbstractStreamWriter):
             chunk += self._compress.flush()
             if chunk and self.chunked:
                 chunk_len = ("%x\r\n" % len(chunk)).encode("ascii")
-                chunk = chunk_len + chunk + b"\r\n0\r\n\r\n"
+                self._writelines((chunk_len, chunk, b"\r\n0\r\n\r\n"))
+                chunk = b""
         else:
             if self.chunked:
                 if chunk:
                     chunk_len = ("%x\r\n" % len(chunk)).encode("ascii")
-                    chunk = chunk_len + chunk + b"\r\n0\r\n\r\n"
+                    self._writelines((chunk_len, chunk, b"\r\n0\r\n\r\n"))
+                    chunk = b""
                 else:
                     chunk = b"0\r\n\r\n"
 
@@ -167,6 +244,9 @@ class StreamWriter(AbstractStreamWriter):
           await w.write(data)
           await w.drain()
         """
+        self._send_headers()
+        if self._headers_failed:
+            raise ConnectionResetError("Cannot write to closing transport")
         if self._protocol.transport is not None:
             await self._protocol._drain_helper()
 
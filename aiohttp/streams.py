@@ -11,6 +11,7 @@ from typing import (
     Optional,
     Tuple,
     TypeVar,
+    Union,
 )
 
 from .base_protocol import BaseProtocol
@@ -125,6 +126,7 @@ class StreamReader(AsyncStreamReaderMixin):
         self._exception: Optional[BaseException] = None
         self._timer = TimerNoop() if timer is None else timer
         self._eof_callbacks: List[Callable[[], None]] = []
+        self._drain_callback: Optional[Callable[[], None]] = None
 
     def __repr__(self) -> str:
         info = [self.__class__.__name__]
@@ -314,7 +316,7 @@ class StreamReader(AsyncStreamReaderMixin):
         if self._exception is not None:
             raise self._exception
 
-        chunk = b""
+        chunks = []
         chunk_size = 0
         not_enough = True
 
@@ -326,7 +328,7 @@ class StreamReader(AsyncStreamReaderMixin):
                 data = self._read_nowait_chunk(
                     ichar - offset + seplen - 1 if ichar else -1
                 )
-                chunk += data
+                chunks.append(data)
                 chunk_size += len(data)
                 if ichar:
                     not_enough = False
@@ -340,7 +342,7 @@ class StreamReader(AsyncStreamReaderMixin):
             if not_enough:
                 await self._wait("readuntil")
 
-        return chunk
+        return b"".join(chunks)
 
     async def read(self, n: int = -1) -> bytes:
         if self._exception is not None:
@@ -431,6 +433,66 @@ class StreamReader(AsyncStreamReaderMixin):
 
         return b"".join(blocks)
 
+    async def read_into(self, buffer: Union[bytearray, memoryview]) -> int:
+        """Read up to len(buffer) bytes into buffer.
+
+        Return the number of bytes read, 0 on EOF.  The data is copied
+        straight from the received chunks.
+        """
+        if self._exception is not None:
+            raise self._exception
+
+        view = memoryview(buffer).cast("B")
+        if not view.nbytes:
+            return 0
+
+        # the waiter may be woken at a chunk end without any data fed
+        while not self._buffer and not self._eof:
+            await self._wait("read_into")
+
+        return self._read_nowait_into(view)
+
+    async def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+        """Same as read_into(), for file-like object compatibility."""
+        return await self.read_into(buffer)
+
+    async def readexactly_view(self, n: int) -> memoryview:
+        """Read exactly n bytes and return them as a memoryview.
+
+        No data is copied if the n bytes came in one chunk, otherwise
+        they are collected into a single new buffer.
+        """
+        if self._exception is not None:
+            raise self._exception
+
+        if n <= 0:
+            return memoryview(b"")
+
+        while not self._buffer and not self._eof:
+            await self._wait("readexactly_view")
+
+        if self._buffer and len(self._buffer[0]) - self._buffer_offset >= n:
+            self._timer.assert_timeout()
+            first_buffer = self._buffer[0]
+            offset = self._buffer_offset
+            view = memoryview(first_buffer)[offset : offset + n]
+            if offset + n == len(first_buffer):
+                self._buffer.popleft()
+                self._buffer_offset = 0
+            else:
+                self._buffer_offset += n
+            self._consumed(n)
+            return view
+
+        view = memoryview(bytearray(n))
+        pos = 0
+        while pos < n:
+            size = await self.read_into(view[pos:])
+            if not size:
+                raise asyncio.IncompleteReadError(bytes(view[:pos]), n)
+            pos += size
+        return view
+
     def read_nowait(self, n: int = -1) -> bytes:
         # default was changed to be consistent with .read(-1)
         #
@@ -461,17 +523,46 @@ class StreamReader(AsyncStreamReaderMixin):
         else:
             data = self._buffer.popleft()
 
-        self._size -= len(data)
-        self._cursor += len(data)
+        self._consumed(len(data))
+        return data
+
+    def _read_nowait_into(self, view: memoryview) -> int:
+        """Copy not more than len(view) bytes of the buffer into view."""
+        self._timer.assert_timeout()
+
+        size = len(view)
+        pos = 0
+        while self._buffer and pos < size:
+            first_buffer = self._buffer[0]
+            offset = self._buffer_offset
+            n = min(len(first_buffer) - offset, size - pos)
+            view[pos : pos + n] = memoryview(first_buffer)[offset : offset + n]
+            pos += n
+            if offset + n == len(first_buffer):
+                self._buffer.popleft()
+                self._buffer_offset = 0
+            else:
+                self._buffer_offset += n
+
+        self._consumed(pos)
+        return pos
+
+    def _consumed(self, size: int) -> None:
+        self._size -= size
+        self._cursor += size
 
         chunk_splits = self._http_chunk_splits
         # Prevent memory leak: drop useless chunk splits
         while chunk_splits and chunk_splits[0] < self._cursor:
             chunk_splits.pop(0)
 
-        if self._size < self._low_water and self._protocol._reading_paused:
-            self._protocol.resume_reading()
-        return data
+        if self._size < self._low_water:
+            if self._protocol._reading_paused:
+                self._protocol.resume_reading()
+            callback = self._drain_callback
+            if callback is not None:
+                self._drain_callback = None
+                self._loop.call_soon(callback)
 
     def _read_nowait(self, n: int) -> bytes:
         """Read not more than n bytes, or whole buffer if n == -1"""
@@ -544,6 +635,14 @@ class EmptyStreamReader(StreamReader):  # lgtm [py/missing-call-to-init]
     async def readexactly(self, n: int) -> bytes:
         raise asyncio.IncompleteReadError(b"", n)
 
+    async def read_into(self, buffer: Union[bytearray, memoryview]) -> int:
+        return 0
+
+    async def readexactly_view(self, n: int) -> memoryview:
+        if n <= 0:
+            return memoryview(b"")
+        raise asyncio.IncompleteReadError(b"", n)
+
     def read_nowait(self, n: int = -1) -> bytes:
         return b""
 
@@ -275,11 +275,15 @@ class TraceRequestRedirectParams:
 class TraceConnectionQueuedStartParams:
     """Parameters sent by the `on_connection_queued_start` signal"""
 
+    queue_depth: int
+
 
 @dataclasses.dataclass(frozen=True)
 class TraceConnectionQueuedEndParams:
     """Parameters sent by the `on_connection_queued_end` signal"""
 
+    wait_time: float
+
 
 @dataclasses.dataclass(frozen=True)
 class TraceConnectionCreateStartParams:
@@ -315,6 +319,7 @@ class TraceDnsCacheHitParams:
     """Parameters sent by the `on_dns_cache_hit` signal"""
 
     host: str
+    stale: bool = False
 
 
 @dataclasses.dataclass(frozen=True)
@@ -416,14 +421,18 @@ class Trace:
             TraceRequestRedirectParams(method, url, headers, response),
         )
 
-    async def send_connection_queued_start(self) -> None:
+    async def send_connection_queued_start(self, queue_depth: int) -> None:
         return await self._trace_config.on_connection_queued_start.send(
-            self._session, self._trace_config_ctx, TraceConnectionQueuedStartParams()
+            self._session,
+            self._trace_config_ctx,
+            TraceConnectionQueuedStartParams(queue_depth),
         )
 
-    async def send_connection_queued_end(self) -> None:
+    async def send_connection_queued_end(self, wait_time: float) -> None:
         return await self._trace_config.on_connection_queued_end.send(
-            self._session, self._trace_config_ctx, TraceConnectionQueuedEndParams()
+            self._session,
+            self._trace_config_ctx,
+            TraceConnectionQueuedEndParams(wait_time),
         )
 
     async def send_connection_create_start(self) -> None:
@@ -451,9 +460,9 @@ class Trace:
             self._session, self._trace_config_ctx, TraceDnsResolveHostEndParams(host)
         )
 
-    async def send_dns_cache_hit(self, host: str) -> None:
+    async def send_dns_cache_hit(self, host: str, stale: bool = False) -> None:
         return await self._trace_config.on_dns_cache_hit.send(
-            self._session, self._trace_config_ctx, TraceDnsCacheHitParams(host)
+            self._session, self._trace_config_ctx, TraceDnsCacheHitParams(host, stale)
         )
 
     async def send_dns_cache_miss(self, host: str) -> None:
@@ -86,12 +86,18 @@ from .web_exceptions import (
     HTTPVersionNotSupported,
     NotAppKeyWarning,
 )
-from .web_fileresponse import FileResponse
+from .web_fileresponse import FileCache, FileResponse
 from .web_log import AccessLogger
 from .web_middlewares import middleware, normalize_path_middleware
 from .web_protocol import PayloadAccessError, RequestHandler, RequestPayloadError
 from .web_request import BaseRequest, FileField, Request
-from .web_response import ContentCoding, Response, StreamResponse, json_response
+from .web_response import (
+    ContentCoding,
+    HeaderTemplate,
+    Response,
+    StreamResponse,
+    json_response,
+)
 from .web_routedef import (
     AbstractRouteDef,
     RouteDef,
@@ -201,6 +207,7 @@ __all__ = (
     "HTTPVariantAlsoNegotiates",
     "HTTPVersionNotSupported",
     # web_fileresponse
+    "FileCache",
     "FileResponse",
     # web_middlewares
     "middleware",
@@ -215,6 +222,7 @@ __all__ = (
     "Request",
     # web_response
     "ContentCoding",
+    "HeaderTemplate",
     "Response",
     "StreamResponse",
     "json_response",
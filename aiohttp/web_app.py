@@ -27,7 +27,6 @@ from typing import (
 from aiosignal import Signal
 from frozenlist import FrozenList
 
-from . import hdrs
 from .helpers import AppKey
 from .log import web_logger
 from .typedefs import Middleware
@@ -377,7 +376,7 @@ class Application(MutableMapping[Union[str, AppKey[Any]], Any]):
 
         resp = None
         request._match_info = match_info
-        expect = request.headers.get(hdrs.EXPECT)
+        expect = request._expect
         if expect:
             resp = await match_info.expect_handler(request)
             await request.writer.drain()
@@ -2,23 +2,29 @@ import asyncio
 import mimetypes
 import os
 import pathlib
+import stat
+import time
+import uuid
+from collections import OrderedDict
 from typing import (
     IO,
     TYPE_CHECKING,
     Any,
     Awaitable,
     Callable,
+    Dict,
     Final,
+    List,
     Optional,
     Tuple,
-    cast,
 )
 
 from . import hdrs
 from .abc import AbstractStreamWriter
-from .helpers import ETAG_ANY, ETag
+from .helpers import ETAG_ANY, ETag, parse_accept_encoding
 from .typedefs import LooseHeaders, PathLike
 from .web_exceptions import (
+    HTTPNotFound,
     HTTPNotModified,
     HTTPPartialContent,
     HTTPPreconditionFailed,
@@ -26,7 +32,7 @@ from .web_exceptions import (
 )
 from .web_response import StreamResponse
 
-__all__ = ("FileResponse",)
+__all__ = ("FileCache", "FileResponse")
 
 if TYPE_CHECKING:  # pragma: no cover
     from .web_request import BaseRequest
@@ -38,6 +44,161 @@ _T_OnChunkSent = Optional[Callable[[bytes], Awaitable[None]]]
 NOSENDFILE: Final[bool] = bool(os.environ.get("AIOHTTP_NOSENDFILE"))
 
 
+# Precompressed sidecar files in the order of preference for equal q-values.
+_SIDECARS: Final[Tuple[Tuple[str, str], ...]] = (
+    ("br", ".br"),
+    ("zstd", ".zst"),
+    ("gzip", ".gz"),
+)
+
+_MAX_MISSING: Final[int] = 4096
+
+# More ranges than this in one Range header are ignored, see CVE-2011-3192.
+_MAX_RANGES: Final[int] = 16
+
+
+def _accepted_sidecars(accept_encoding: str) -> List[Tuple[str, str]]:
+    # Return (coding, suffix) pairs acceptable by the client, best first.
+    qvalues = parse_accept_encoding(accept_encoding)
+    star = qvalues.get("*", 0.0)
+    # identity is always acceptable, but preferred over a sidecar
+    # only when the client rates it explicitly higher
+    identity = qvalues.get("identity", 0.0)
+    ranked = [
+        (q, -i, coding, suffix)
+        for i, (coding, suffix) in enumerate(_SIDECARS)
+        for q in (qvalues.get(coding, star),)
+        if q > 0 and q >= identity
+    ]
+    ranked.sort(reverse=True)
+    return [(coding, suffix) for _, _, coding, suffix in ranked]
+
+
+def _coalesce_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    # Merge overlapping and adjacent (start, count) ranges, the merged
+    # ranges keep the order in which they first appear in the header.
+    merged: List[List[int]] = []  # [start, end, index of first range]
+    for i in sorted(range(len(ranges)), key=lambda i: ranges[i][0]):
+        start, count = ranges[i]
+        if merged and start <= merged[-1][1]:
+            last = merged[-1]
+            last[1] = max(last[1], start + count)
+            last[2] = min(last[2], i)
+        else:
+            merged.append([start, start + count, i])
+    merged.sort(key=lambda rng: rng[2])
+    return [(start, end - start) for start, end, _ in merged]
+
+
+class _CachedFile:
+    __slots__ = ("body", "st", "content_type", "encoding", "checked")
+
+    def __init__(self, original: pathlib.Path, body: bytes, st: os.stat_result) -> None:
+        self.body = body
+        self.st = st
+        # guessed from the requested name, not from a compressed sidecar
+        self.content_type, self.encoding = mimetypes.guess_type(str(original))
+        self.checked = time.monotonic()
+
+
+class FileCache:
+    """Size-bounded LRU cache of small files sent by FileResponse.
+
+    A cached file is revalidated by its mtime and size at most once
+    per *revalidate* seconds, the rest of the time it is served
+    from memory without touching the file system.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 16 * 1024 * 1024,
+        max_file_size: int = 256 * 1024,
+        revalidate: float = 1.0,
+    ) -> None:
+        self._max_size = max_size
+        self._max_file_size = min(max_file_size, max_size)
+        self._revalidate = revalidate
+        self._files: "OrderedDict[pathlib.Path, _CachedFile]" = OrderedDict()
+        self._size = 0
+        # Paths recently found missing, e.g. absent precompressed sidecars.
+        self._missing: Dict[pathlib.Path, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached files in bytes."""
+        return self._size
+
+    def clear(self) -> None:
+        self._files.clear()
+        self._missing.clear()
+        self._size = 0
+
+    def _get(self, path: pathlib.Path) -> Optional[_CachedFile]:
+        # Return the entry only if it does not need revalidation yet.
+        entry = self._files.get(path)
+        if entry is None or time.monotonic() - entry.checked > self._revalidate:
+            return None
+        self._files.move_to_end(path)
+        return entry
+
+    def _validate(
+        self, path: pathlib.Path, st: os.stat_result
+    ) -> Optional[_CachedFile]:
+        entry = self._files.get(path)
+        if entry is None:
+            return None
+        if entry.st.st_mtime_ns != st.st_mtime_ns or entry.st.st_size != st.st_size:
+            self._pop(path)
+            return None
+        entry.st = st
+        entry.checked = time.monotonic()
+        self._files.move_to_end(path)
+        return entry
+
+    def _is_missing(self, path: pathlib.Path) -> bool:
+        checked = self._missing.get(path)
+        return checked is not None and time.monotonic() - checked <= self._revalidate
+
+    def _set_missing(self, path: pathlib.Path) -> None:
+        if len(self._missing) >= _MAX_MISSING:
+            self._missing.clear()
+        self._missing[path] = time.monotonic()
+
+    def _cacheable(self, st: os.stat_result) -> bool:
+        return st.st_size <= self._max_file_size
+
+    def _put(
+        self,
+        path: pathlib.Path,
+        body: bytes,
+        st: os.stat_result,
+        original: pathlib.Path,
+    ) -> _CachedFile:
+        self._pop(path)
+        entry = _CachedFile(original, body, st)
+        self._files[path] = entry
+        self._size += len(body)
+        while self._size > self._max_size:
+            _, evicted = self._files.popitem(last=False)
+            self._size -= len(evicted.body)
+        return entry
+
+    def _pop(self, path: pathlib.Path) -> None:
+        entry = self._files.pop(path, None)
+        if entry is not None:
+            self._size -= len(entry.body)
+
+    @staticmethod
+    def _read(path: pathlib.Path, size: int) -> Optional[bytes]:
+        # Executed in a thread pool, the file may change after stat().
+        with path.open("rb") as f:
+            body = f.read(size + 1)
+        return body if len(body) == size else None
+
+
 class FileResponse(StreamResponse):
     """A response object can be used to send files."""
 
@@ -48,11 +209,16 @@ class FileResponse(StreamResponse):
         status: int = 200,
         reason: Optional[str] = None,
         headers: Optional[LooseHeaders] = None,
+        *,
+        file_cache: Optional[FileCache] = None,
     ) -> None:
         super().__init__(status=status, reason=reason, headers=headers)
 
         self._path = pathlib.Path(path)
         self._chunk_size = chunk_size
+        self._file_cache = file_cache
+        # called when the file is gone, set by StaticResource
+        self._on_missing: Optional[Callable[[], object]] = None
 
     async def _sendfile_fallback(
         self, writer: AbstractStreamWriter, fobj: IO[Any], offset: int, count: int
@@ -65,7 +231,7 @@ class FileResponse(StreamResponse):
 
         await loop.run_in_executor(None, fobj.seek, offset)
 
-        chunk = await loop.run_in_executor(None, fobj.read, chunk_size)
+        chunk = await loop.run_in_executor(None, fobj.read, min(chunk_size, count))
         while chunk:
             await writer.write(chunk)
             count = count - chunk_size
@@ -89,6 +255,8 @@ class FileResponse(StreamResponse):
         transport = request.transport
         assert transport is not None
 
+        # the headers must go out before the file
+        await writer.drain()
         try:
             await loop.sendfile(transport, fobj, offset, count)
         except NotImplementedError:
@@ -97,6 +265,131 @@ class FileResponse(StreamResponse):
         await super().write_eof()
         return writer
 
+    async def _sendfile_byteranges(
+        self,
+        request: "BaseRequest",
+        fobj: IO[Any],
+        parts: List[Tuple[bytes, int, int]],
+        closing: bytes,
+    ) -> AbstractStreamWriter:
+        writer = await super().prepare(request)
+        assert writer is not None
+
+        loop = request._loop
+        transport = request.transport
+        assert transport is not None
+
+        use_sendfile = not (NOSENDFILE or self.compression)
+        for part_headers, offset, count in parts:
+            await writer.write(part_headers)
+            if use_sendfile:
+                # the part headers must go out before the file
+                await writer.drain()
+                try:
+                    await loop.sendfile(transport, fobj, offset, count)
+                    continue
+                except NotImplementedError:
+                    use_sendfile = False
+            await self._sendfile_fallback(writer, fobj, offset, count)
+
+        await writer.write(closing)
+        await writer.drain()
+        return writer
+
+    async def _prepare_byteranges(
+        self,
+        request: "BaseRequest",
+        filepath: pathlib.Path,
+        entry: Optional[_CachedFile],
+        ranges: List[Tuple[int, int]],
+        file_size: int,
+    ) -> Optional[AbstractStreamWriter]:
+        # https://tools.ietf.org/html/rfc7233#appendix-A
+        boundary = uuid.uuid4().hex
+        part_type = self.headers.get(hdrs.CONTENT_TYPE, "application/octet-stream")
+        parts: List[Tuple[bytes, int, int]] = []
+        for i, (start, count) in enumerate(ranges):
+            part_headers = (
+                "{}--{}\r\n"
+                "Content-Type: {}\r\n"
+                "Content-Range: bytes {}-{}/{}\r\n\r\n".format(
+                    "\r\n" if i else "",
+                    boundary,
+                    part_type,
+                    start,
+                    start + count - 1,
+                    file_size,
+                )
+            ).encode("utf-8")
+            parts.append((part_headers, start, count))
+        closing = f"\r\n--{boundary}--\r\n".encode("ascii")
+
+        self.headers[hdrs.CONTENT_TYPE] = f"multipart/byteranges; boundary={boundary}"
+        self.content_length = sum(len(h) + c for h, _, c in parts) + len(closing)
+
+        if request.method == hdrs.METH_HEAD:
+            return await super().prepare(request)
+
+        if entry is not None:
+            writer = await super().prepare(request)
+            assert writer is not None
+            for part_headers, offset, count in parts:
+                await writer.write(part_headers)
+                await writer.write(entry.body[offset : offset + count])
+            await writer.write(closing)
+            await writer.drain()
+            return writer
+
+        loop = asyncio.get_event_loop()
+        fobj = await loop.run_in_executor(None, filepath.open, "rb")
+        try:
+            return await self._sendfile_byteranges(request, fobj, parts, closing)
+        finally:
+            await asyncio.shield(loop.run_in_executor(None, fobj.close))
+
+    @staticmethod
+    def _select_file(
+        candidates: List[Tuple[pathlib.Path, Optional[str]]]
+    ) -> Tuple[pathlib.Path, Optional[str], os.stat_result, List[pathlib.Path]]:
+        # Executed in a thread pool: pick the first existing sidecar,
+        # falling back to the requested file itself.
+        missing = []
+        for path, coding in candidates[:-1]:
+            try:
+                st = path.stat()
+            except OSError:
+                missing.append(path)
+                continue
+            if stat.S_ISREG(st.st_mode):
+                return path, coding, st, missing
+            missing.append(path)
+        path, coding = candidates[-1]
+        return path, coding, path.stat(), missing
+
+    @staticmethod
+    def _byte_range(rng: slice, file_size: int) -> Optional[Tuple[int, int]]:
+        start, end = rng.start, rng.stop
+        if start < 0 and end is None:  # return tail of file
+            start += file_size
+            if start < 0:
+                # if Range:bytes=-1000 in request header but file size
+                # is only 200, there would be trouble without this
+                start = 0
+            count = file_size - start
+        else:
+            # rfc7233:If the last-byte-pos value is
+            # absent, or if the value is greater than or equal to
+            # the current length of the representation data,
+            # the byte range is interpreted as the remainder
+            # of the representation (i.e., the server replaces the
+            # value of last-byte-pos with a value that is one less than
+            # the current length of the selected representation).
+            count = min(end if end is not None else file_size, file_size) - start
+
+        if start >= file_size:
+            return None
+        return start, count
+
     @staticmethod
     def _strong_etag_match(etag_value: str, etags: Tuple[ETag, ...]) -> bool:
         if len(etags) == 1 and etags[0].value == ETAG_ANY:
@@ -122,18 +415,41 @@ class FileResponse(StreamResponse):
         return await super().prepare(request)
 
     async def prepare(self, request: "BaseRequest") -> Optional[AbstractStreamWriter]:
-        filepath = self._path
-
-        gzip = False
-        if "gzip" in request.headers.get(hdrs.ACCEPT_ENCODING, ""):
-            gzip_path = filepath.with_name(filepath.name + ".gz")
-
-            if gzip_path.is_file():
-                filepath = gzip_path
-                gzip = True
+        name = self._path.name
+        candidates: List[Tuple[pathlib.Path, Optional[str]]] = [
+            (self._path.with_name(name + suffix), coding)
+            for coding, suffix in _accepted_sidecars(
+                request.headers.get(hdrs.ACCEPT_ENCODING, "")
+            )
+        ]
+        candidates.append((self._path, None))
 
         loop = asyncio.get_event_loop()
-        st: os.stat_result = await loop.run_in_executor(None, filepath.stat)
+        file_cache = self._file_cache
+        entry = None
+        filepath, coding = self._path, None
+        if file_cache is not None:
+            for filepath, coding in candidates:
+                entry = file_cache._get(filepath)
+                if entry is not None or not file_cache._is_missing(filepath):
+                    break
+        if entry is not None:
+            st = entry.st
+        else:
+            try:
+                filepath, coding, st, missing = await loop.run_in_executor(
+                    None, self._select_file, candidates
+                )
+            except (FileNotFoundError, NotADirectoryError):
+                # removed since the path was resolved
+                if self._on_missing is not None:
+                    self._on_missing()
+                self.set_status(HTTPNotFound.status_code)
+                return await super().prepare(request)
+            if file_cache is not None:
+                for path in missing:
+                    file_cache._set_missing(path)
+                entry = file_cache._validate(filepath, st)
 
         etag_value = f"{st.st_mtime_ns:x}-{st.st_size:x}"
         last_modified = st.st_mtime
@@ -165,17 +481,23 @@ class FileResponse(StreamResponse):
 
         ct = None
         if hdrs.CONTENT_TYPE not in self.headers:
-            ct, encoding = mimetypes.guess_type(str(filepath))
+            if entry is not None:
+                ct, encoding = entry.content_type, entry.encoding
+            else:
+                ct, encoding = mimetypes.guess_type(str(self._path))
             if not ct:
                 ct = "application/octet-stream"
         else:
-            encoding = "gzip" if gzip else None
+            encoding = None
+        if coding is not None:
+            encoding = coding
 
         status = self._status
         file_size = st.st_size
         count = file_size
 
         start = None
+        ranges: List[Tuple[int, int]] = []
 
         ifrange = request.if_range
         if ifrange is None or st.st_mtime <= ifrange.timestamp():
@@ -187,9 +509,7 @@ class FileResponse(StreamResponse):
             # if True but Range header missing
             #   return 200
             try:
-                rng = request.http_range
-                start = rng.start
-                end = rng.stop
+                http_ranges = request.http_ranges
             except ValueError:
                 # https://tools.ietf.org/html/rfc7233:
                 # A server generating a 416 (Range Not Satisfiable) response to
@@ -204,42 +524,37 @@ class FileResponse(StreamResponse):
                 self.set_status(HTTPRequestRangeNotSatisfiable.status_code)
                 return await super().prepare(request)
 
+            if len(http_ranges) > _MAX_RANGES:
+                # rfc7233 allows to ignore the Range header
+                http_ranges = ()
+
             # If a range request has been made, convert start, end slice
             # notation into file pointer offset and count
-            if start is not None or end is not None:
-                if start < 0 and end is None:  # return tail of file
-                    start += file_size
-                    if start < 0:
-                        # if Range:bytes=-1000 in request header but file size
-                        # is only 200, there would be trouble without this
-                        start = 0
-                    count = file_size - start
-                else:
-                    # rfc7233:If the last-byte-pos value is
-                    # absent, or if the value is greater than or equal to
-                    # the current length of the representation data,
-                    # the byte range is interpreted as the remainder
-                    # of the representation (i.e., the server replaces the
-                    # value of last-byte-pos with a value that is one less than
-                    # the current length of the selected representation).
-                    count = (
-                        min(end if end is not None else file_size, file_size) - start
-                    )
-
-                if start >= file_size:
-                    # HTTP 416 should be returned in this case.
-                    #
-                    # According to https://tools.ietf.org/html/rfc7233:
-                    # If a valid byte-range-set includes at least one
-                    # byte-range-spec with a first-byte-pos that is less than
-                    # the current length of the representation, or at least one
-                    # suffix-byte-range-spec with a non-zero suffix-length,
-                    # then the byte-range-set is satisfiable. Otherwise, the
-                    # byte-range-set is unsatisfiable.
-                    self.headers[hdrs.CONTENT_RANGE] = f"bytes */{file_size}"
-                    self.set_status(HTTPRequestRangeNotSatisfiable.status_code)
-                    return await super().prepare(request)
+            for rng in http_ranges:
+                byte_range = self._byte_range(rng, file_size)
+                if byte_range is not None:
+                    ranges.append(byte_range)
 
+            if http_ranges and not ranges:
+                # HTTP 416 should be returned in this case.
+                #
+                # According to https://tools.ietf.org/html/rfc7233:
+                # If a valid byte-range-set includes at least one
+                # byte-range-spec with a first-byte-pos that is less than
+                # the current length of the representation, or at least one
+                # suffix-byte-range-spec with a non-zero suffix-length,
+                # then the byte-range-set is satisfiable. Otherwise, the
+                # byte-range-set is unsatisfiable.
+                self.headers[hdrs.CONTENT_RANGE] = f"bytes */{file_size}"
+                self.set_status(HTTPRequestRangeNotSatisfiable.status_code)
+                return await super().prepare(request)
+
+            if len(ranges) > 1:
+                # overlapping ranges could make the response many times
+                # larger than the file
+                ranges = _coalesce_ranges(ranges)
+
+            if ranges:
                 status = HTTPPartialContent.status_code
                 # Even though you are sending the whole file, you should still
                 # return a HTTP 206 for a Range request.
@@ -249,32 +564,52 @@ class FileResponse(StreamResponse):
             self.content_type = ct
         if encoding:
             self.headers[hdrs.CONTENT_ENCODING] = encoding
-        if gzip:
+        if coding is not None:
             self.headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
 
         self.etag = etag_value  # type: ignore[assignment]
         self.last_modified = st.st_mtime  # type: ignore[assignment]
-        self.content_length = count
 
         self.headers[hdrs.ACCEPT_RANGES] = "bytes"
 
-        real_start = cast(int, start)
+        if len(ranges) > 1:
+            return await self._prepare_byteranges(
+                request, filepath, entry, ranges, file_size
+            )
 
-        if status == HTTPPartialContent.status_code:
+        if ranges:
+            start, count = ranges[0]
             self.headers[hdrs.CONTENT_RANGE] = "bytes {}-{}/{}".format(
-                real_start, real_start + count - 1, file_size
+                start, start + count - 1, file_size
             )
 
+        self.content_length = count
+
         # If we are sending 0 bytes calling sendfile() will throw a ValueError
         if count == 0 or request.method == hdrs.METH_HEAD or self.status in [204, 304]:
             return await super().prepare(request)
 
-        fobj = await loop.run_in_executor(None, filepath.open, "rb")
         if start:  # be aware that start could be None or int=0 here.
             offset = start
         else:
             offset = 0
 
+        if entry is None and file_cache is not None and file_cache._cacheable(st):
+            body = await loop.run_in_executor(
+                None, file_cache._read, filepath, st.st_size
+            )
+            if body is not None:
+                entry = file_cache._put(filepath, body, st, self._path)
+
+        if entry is not None:
+            writer = await super().prepare(request)
+            assert writer is not None
+            await writer.write(entry.body[offset : offset + count])
+            await writer.drain()
+            return writer
+
+        fobj = await loop.run_in_executor(None, filepath.open, "rb")
+
         try:
             return await self._sendfile(request, fobj, offset, count)
         finally:
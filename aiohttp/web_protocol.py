@@ -3,6 +3,7 @@ import asyncio.streams
 import dataclasses
 import traceback
 from collections import deque
+from concurrent.futures import Executor
 from contextlib import suppress
 from html import escape as html_escape
 from http import HTTPStatus
@@ -13,6 +14,7 @@ from typing import (
     Awaitable,
     Callable,
     Deque,
+    List,
     Optional,
     Sequence,
     Tuple,
@@ -23,6 +25,7 @@ from typing import (
 
 import yarl
 
+from . import hdrs
 from .abc import AbstractAccessLogger, AbstractAsyncAccessLogger, AbstractStreamWriter
 from .base_protocol import BaseProtocol
 from .helpers import ceil_timeout
@@ -111,6 +114,75 @@ class _ErrInfo:
 
 _MsgType = Tuple[Union[RawRequestMessage, _ErrInfo], StreamReader]
 
+# Only requests without side effects are handled ahead of their turn,
+# their handlers are cancelled if the connection closes before them.
+_PIPELINE_METHODS = frozenset((hdrs.METH_GET, hdrs.METH_HEAD, hdrs.METH_OPTIONS))
+
+
+class _PipelinedWriter(StreamWriter):
+    """Writer of a response handled ahead of its turn.
+
+    The output is kept in memory until all preceding responses are sent,
+    drain() blocks until then.
+    """
+
+    def __init__(self, protocol: BaseProtocol, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(protocol, loop)
+        self._held: Optional[List[bytes]] = []
+        self._turn: asyncio.Future[None] = loop.create_future()
+
+    def _write(self, chunk: bytes) -> None:
+        if self._held is None:
+            super()._write(chunk)
+        else:
+            self._hold((chunk,))
+
+    def _writelines(self, chunks: Tuple[bytes, ...]) -> None:
+        if self._held is None:
+            super()._writelines(chunks)
+        else:
+            self._hold(chunks)
+
+    def _hold(self, chunks: Tuple[bytes, ...]) -> None:
+        assert self._held is not None
+        self._check_transport()
+        if self._headers_buf is not None:
+            self._held.append(self._headers_buf)
+            self.output_size += len(self._headers_buf)
+            self._headers_buf = None
+        for chunk in chunks:
+            # the caller may reuse its buffer
+            self._held.append(bytes(chunk))
+            self.buffer_size += len(chunk)
+            self.output_size += len(chunk)
+
+    def _release(self) -> None:
+        """Send the held output, the response is the next one."""
+        held = self._held
+        if held is None:
+            return
+        self._held = None
+        if not self._turn.done():
+            self._turn.set_result(None)
+        if held:
+            self._check_transport().writelines(held)
+
+    def _abort(self) -> None:
+        """Wake up drain(), the response is never sent."""
+        if not self._turn.done():
+            self._turn.set_result(None)
+
+    async def drain(self) -> None:
+        if self._held is not None:
+            self._send_headers()
+            await self._turn
+            if self._held is not None:
+                raise ConnectionResetError("Connection lost")
+        await super().drain()
+
+
+_PipelinedType = Tuple[BaseRequest, StreamReader, _PipelinedWriter, "asyncio.Task[Any]"]
+
 
 class RequestHandler(BaseProtocol):
     """HTTP protocol implementation.
@@ -146,6 +218,19 @@ class RequestHandler(BaseProtocol):
                               threshold to ceil() timeout
                               values
 
+    max_pipelined_requests -- Optional maximum number of requests
+                              handled concurrently on one connection,
+                              1 disables pipelining
+
+    lazy_headers -- build request headers on first access
+
+    zlib_executor_size -- Optional size of compressed request body
+                          chunks inflated in an executor
+
+    zlib_executor -- Optional executor for inflating request bodies
+
+    zstd_dict -- Optional zstd dictionary for decoding request bodies
+
     """
 
     KEEPALIVE_RESCHEDULE_DELAY = 1
@@ -163,6 +248,8 @@ class RequestHandler(BaseProtocol):
         "_lingering_time",
         "_messages",
         "_message_tail",
+        "_pipeline",
+        "_max_pipelined_requests",
         "_waiter",
         "_task_handler",
         "_upgrade",
@@ -194,9 +281,17 @@ class RequestHandler(BaseProtocol):
         read_bufsize: int = 2**16,
         auto_decompress: bool = True,
         timeout_ceil_threshold: float = 5,
+        max_pipelined_requests: int = 1,
+        lazy_headers: bool = False,
+        zlib_executor_size: Optional[int] = None,
+        zlib_executor: Optional[Executor] = None,
+        zstd_dict: Optional[bytes] = None,
     ):
         super().__init__(loop)
 
+        if max_pipelined_requests < 1:
+            raise ValueError("max_pipelined_requests should be at least 1")
+
         self._request_count = 0
         self._keepalive = False
         self._current_request: Optional[BaseRequest] = None
@@ -213,6 +308,8 @@ class RequestHandler(BaseProtocol):
 
         self._messages: Deque[_MsgType] = deque()
         self._message_tail = b""
+        self._pipeline: Deque[_PipelinedType] = deque()
+        self._max_pipelined_requests = max_pipelined_requests
 
         self._waiter: Optional[asyncio.Future[None]] = None
         self._task_handler: Optional[asyncio.Task[None]] = None
@@ -227,6 +324,10 @@ class RequestHandler(BaseProtocol):
             max_field_size=max_field_size,
             payload_exception=RequestPayloadError,
             auto_decompress=auto_decompress,
+            lazy_headers=lazy_headers,
+            zlib_executor_size=zlib_executor_size,
+            zlib_executor=zlib_executor,
+            zstd_dict=zstd_dict,
         )
 
         self._timeout_ceil_threshold: float = 5
@@ -330,6 +431,10 @@ class RequestHandler(BaseProtocol):
                 exc = ConnectionResetError("Connection lost")
             self._current_request._cancel(exc)
 
+        for request, _, writer, _ in self._pipeline:
+            request._cancel(exc or ConnectionResetError("Connection lost"))
+            writer._abort()
+
         if self._waiter is not None:
             self._waiter.cancel()
 
@@ -379,6 +484,8 @@ class RequestHandler(BaseProtocol):
             if messages and waiter is not None and not waiter.done():
                 # don't set result twice
                 waiter.set_result(None)
+            elif messages and self._current_request is not None:
+                self._fill_pipeline()
 
             self._upgrade = upgraded
             if upgraded and tail:
@@ -464,10 +571,10 @@ class RequestHandler(BaseProtocol):
         assert self._request_handler is not None
         try:
             try:
-                self._current_request = request
                 resp = await request_handler(request)
             finally:
-                self._current_request = None
+                if self._current_request is request:
+                    self._current_request = None
         except HTTPException as exc:
             resp = Response(
                 status=exc.status, reason=exc.reason, text=exc.text, headers=exc.headers
@@ -498,50 +605,42 @@ class RequestHandler(BaseProtocol):
         keep_alive(True) specified.
         """
         loop = self._loop
-        handler = self._task_handler
-        assert handler is not None
-        manager = self._manager
-        assert manager is not None
         keepalive_timeout = self._keepalive_timeout
         resp = None
-        assert self._request_factory is not None
-        assert self._request_handler is not None
 
         while not self._force_close:
-            if not self._messages:
-                try:
-                    # wait for next request
-                    self._waiter = loop.create_future()
-                    await self._waiter
-                except asyncio.CancelledError:
-                    break
-                finally:
-                    self._waiter = None
-
-            message, payload = self._messages.popleft()
-
-            start = loop.time()
-
-            manager.requests_count += 1
-            writer = StreamWriter(self, loop)
-            if isinstance(message, _ErrInfo):
-                # make request_factory work
-                request_handler = self._make_error_handler(message)
-                message = ERROR
+            if self._pipeline:
+                # already handled ahead of its turn
+                request, payload, pipelined_writer, task = self._pipeline.popleft()
             else:
-                request_handler = self._request_handler
+                if not self._messages:
+                    try:
+                        # wait for next request
+                        self._waiter = loop.create_future()
+                        await self._waiter
+                    except asyncio.CancelledError:
+                        break
+                    finally:
+                        self._waiter = None
 
-            request = self._request_factory(message, payload, self, writer, handler)
-            try:
-                # a new task is used for copy context vars (#3406)
-                task = self._loop.create_task(
-                    self._handle_request(request, start, request_handler)
+                message, payload = self._messages.popleft()
+                request, task = self._dispatch(
+                    message, payload, StreamWriter(self, loop)
                 )
+                pipelined_writer = None
+
+            try:
                 try:
+                    if pipelined_writer is not None:
+                        pipelined_writer._release()
+                    self._current_request = request
+                    self._fill_pipeline()
                     resp, reset = await task
                 except (asyncio.CancelledError, ConnectionError):
                     self.log_debug("Ignored premature client disconnection")
                     break
+                finally:
+                    self._current_request = None
 
                 # Drop the processed task from asyncio.Task.all_tasks() early
                 del task
@@ -605,12 +704,68 @@ class RequestHandler(BaseProtocol):
                     else:
                         break
 
+        # responses handled ahead of their turn can't be sent anymore
+        while self._pipeline:
+            request, _, pipelined_writer, task = self._pipeline.popleft()
+            pipelined_writer._abort()
+            task.cancel()
+
         # remove handler, close transport if no handlers left
         if not self._force_close:
             self._task_handler = None
             if self.transport is not None:
                 self.transport.close()
 
+    def _dispatch(
+        self,
+        message: Union[RawRequestMessage, _ErrInfo],
+        payload: StreamReader,
+        writer: StreamWriter,
+    ) -> Tuple[BaseRequest, "asyncio.Task[Tuple[StreamResponse, bool]]"]:
+        manager = self._manager
+        assert manager is not None
+        assert self._request_factory is not None
+        assert self._request_handler is not None
+        handler = self._task_handler
+        assert handler is not None
+
+        start = self._loop.time()
+        manager.requests_count += 1
+        if isinstance(message, _ErrInfo):
+            # make request_factory work
+            request_handler = self._make_error_handler(message)
+            message = ERROR
+        else:
+            request_handler = self._request_handler
+
+        request = self._request_factory(message, payload, self, writer, handler)
+        # a new task is used for copy context vars (#3406)
+        task = self._loop.create_task(
+            self._handle_request(request, start, request_handler)
+        )
+        return request, task
+
+    def _fill_pipeline(self) -> None:
+        """Start handling of the queued requests ahead of their turn."""
+        while (
+            len(self._pipeline) + 1 < self._max_pipelined_requests
+            and self._messages
+            and not self._close
+            and not self._force_close
+        ):
+            message, payload = self._messages[0]
+            if (
+                isinstance(message, _ErrInfo)
+                or message.method not in _PIPELINE_METHODS
+                or message.upgrade
+                or not payload.is_eof()
+            ):
+                break
+            self._messages.popleft()
+            writer = _PipelinedWriter(self, self._loop)
+            request, task = self._dispatch(message, payload, writer)
+            self._pipeline.append((request, payload, writer, task))
+
     async def finish_response(
         self, request: BaseRequest, resp: StreamResponse, start_time: float
     ) -> bool:
@@ -44,8 +44,8 @@ from .helpers import (
     sentinel,
     set_result,
 )
-from .http_parser import RawRequestMessage
-from .http_writer import HttpVersion
+from .http_parser import RawRequestMessage, _LazyRawRequestMessage
+from .http_writer import HttpVersion, StreamWriter
 from .multipart import BodyPartReader, MultipartReader
 from .streams import EmptyStreamReader, StreamReader
 from .typedefs import (
@@ -108,6 +108,34 @@ _QUOTED_PAIR_REPLACE_RE: Final[Pattern[str]] = re.compile(r"\\([\t !-~])")
 
 _FORWARDED_PAIR_RE: Final[Pattern[str]] = re.compile(_FORWARDED_PAIR)
 
+_BYTE_RANGES_RE: Final[Pattern[str]] = re.compile(
+    r"bytes=\d*-\d*(?:[ \t]*,[ \t]*\d*-\d*)*"
+)
+_BYTE_RANGE_RE: Final[Pattern[str]] = re.compile(r"(\d*)-(\d*)")
+
+
+def _parse_byte_range(start_str: str, end_str: str) -> slice:
+    end = int(end_str) if end_str else None
+    start = int(start_str) if start_str else None
+
+    if start is None and end is not None:
+        # end with no start is to return tail of content
+        start = -end
+        end = None
+
+    if start is not None and end is not None:
+        # end is inclusive in range header, exclusive for slice
+        end += 1
+
+        if start >= end:
+            raise ValueError("start cannot be after end")
+
+    if start is end is None:  # No valid range supplied
+        raise ValueError("No start or end of range specified")
+
+    return slice(start, end, 1)
+
+
 ############################################################
 # HTTP Request
 ############################################################
@@ -127,7 +155,6 @@ class BaseRequest(MutableMapping[str, Any], HeadersMixin):
         "_protocol",
         "_payload_writer",
         "_payload",
-        "_headers",
         "_method",
         "_version",
         "_rel_url",
@@ -167,7 +194,6 @@ class BaseRequest(MutableMapping[str, Any], HeadersMixin):
         self._payload_writer = payload_writer
 
         self._payload = payload
-        self._headers = message.headers
         self._method = message.method
         self._version = message.version
         self._cache: Dict[str, Any] = {}
@@ -274,6 +300,10 @@ class BaseRequest(MutableMapping[str, Any], HeadersMixin):
     def transport(self) -> Optional[asyncio.Transport]:
         if self._protocol is None:
             return None
+        writer = self._payload_writer
+        if isinstance(writer, StreamWriter):
+            # data written to the transport directly must follow the headers
+            writer._send_headers()
         return self._protocol.transport
 
     @property
@@ -482,7 +512,21 @@ class BaseRequest(MutableMapping[str, Any], HeadersMixin):
     @reify
     def headers(self) -> "CIMultiDictProxy[str]":
         """A case-insensitive multidict proxy with all headers."""
-        return self._headers
+        return self._message.headers
+
+    @property
+    def _headers(self) -> "CIMultiDictProxy[str]":
+        # Used by HeadersMixin, the message may build its headers lazily.
+        return self._message.headers
+
+    @property
+    def _expect(self) -> Optional[str]:
+        # Expect is one of the framing headers, looking it up doesn't
+        # build the full headers of a lazy message.
+        message = self._message
+        if isinstance(message, _LazyRawRequestMessage):
+            return message.framing_headers.get(hdrs.EXPECT)
+        return message.headers.get(hdrs.EXPECT)
 
     @reify
     def raw_headers(self) -> RawHeaders:
@@ -581,34 +625,31 @@ class BaseRequest(MutableMapping[str, Any], HeadersMixin):
         Return a slice instance.
 
         """
-        rng = self._headers.get(hdrs.RANGE)
-        start, end = None, None
-        if rng is not None:
-            try:
-                pattern = r"^bytes=(\d*)-(\d*)$"
-                start, end = re.findall(pattern, rng)[0]
-            except IndexError:  # pattern was not found in header
-                raise ValueError("range not in acceptable format")
-
-            end = int(end) if end else None
-            start = int(start) if start else None
-
-            if start is None and end is not None:
-                # end with no start is to return tail of content
-                start = -end
-                end = None
-
-            if start is not None and end is not None:
-                # end is inclusive in range header, exclusive for slice
-                end += 1
+        rng = self.headers.get(hdrs.RANGE)
+        if rng is None:
+            return slice(None, None, 1)
+        try:
+            pattern = r"^bytes=(\d*)-(\d*)$"
+            start, end = re.findall(pattern, rng)[0]
+        except IndexError:  # pattern was not found in header
+            raise ValueError("range not in acceptable format")
+        return _parse_byte_range(start, end)
 
-                if start >= end:
-                    raise ValueError("start cannot be after end")
+    @reify
+    def http_ranges(self) -> Tuple[slice, ...]:
+        """The content of Range HTTP header with one or more ranges.
 
-            if start is end is None:  # No valid range supplied
-                raise ValueError("No start or end of range specified")
+        Return a tuple of slice instances, empty if there is no header.
 
-        return slice(start, end, 1)
+        """
+        rng = self.headers.get(hdrs.RANGE)
+        if rng is None:
+            return ()
+        if _BYTE_RANGES_RE.fullmatch(rng) is None:
+            raise ValueError("range not in acceptable format")
+        return tuple(
+            _parse_byte_range(start, end) for start, end in _BYTE_RANGE_RE.findall(rng)
+        )
 
     @reify
     def content(self) -> StreamReader:
@@ -684,7 +725,7 @@ class BaseRequest(MutableMapping[str, Any], HeadersMixin):
 
     async def multipart(self) -> MultipartReader:
         """Return async iterator to process BODY as multipart."""
-        return MultipartReader(self._headers, self._payload)
+        return MultipartReader(self.headers, self._payload)
 
     async def post(self) -> "MultiDictProxy[Union[str, bytes, FileField]]":
         """Return POST parameters."""
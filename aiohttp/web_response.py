@@ -7,11 +7,13 @@ import math
 import time
 import warnings
 from concurrent.futures import Executor
+from email.parser import HeaderParser
 from http import HTTPStatus
 from typing import (
     TYPE_CHECKING,
     Any,
     Dict,
+    FrozenSet,
     Iterator,
     MutableMapping,
     Optional,
@@ -19,17 +21,18 @@ from typing import (
     cast,
 )
 
-from multidict import CIMultiDict, istr
+from multidict import CIMultiDict, CIMultiDictProxy, istr
 
 from . import hdrs, payload
 from .abc import AbstractStreamWriter
-from .compression_utils import ZLibCompressor
+from .compression_utils import HAS_ZSTD, ZLibCompressor, ZstdCompressor
 from .helpers import (
     ETAG_ANY,
     QUOTED_ETAG_RE,
     CookieMixin,
     ETag,
     HeadersMixin,
+    parse_accept_encoding,
     parse_http_date,
     populate_with_cookies,
     rfc822_formatted_time,
@@ -37,10 +40,17 @@ from .helpers import (
     validate_etag_value,
 )
 from .http import SERVER_SOFTWARE, HttpVersion10, HttpVersion11
+from .http_writer import StreamWriter, _safe_header
 from .payload import Payload
 from .typedefs import JSONEncoder, LooseHeaders
 
-__all__ = ("ContentCoding", "StreamResponse", "Response", "json_response")
+__all__ = (
+    "ContentCoding",
+    "HeaderTemplate",
+    "StreamResponse",
+    "Response",
+    "json_response",
+)
 
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -58,9 +68,67 @@ class ContentCoding(enum.Enum):
     # https://www.iana.org/assignments/http-parameters/http-parameters.xhtml#content-coding
     deflate = "deflate"
     gzip = "gzip"
+    zstd = "zstd"
     identity = "identity"
 
 
+class HeaderTemplate:
+    """Set of static response headers serialized once.
+
+    Responses created with a template send these header lines as is,
+    only their own headers (Date, Content-Length, cookies, ...) are
+    serialized per response.  A header set on the response overrides
+    the template header with the same name.
+
+    The template headers are copied into :attr:`StreamResponse.headers`
+    on first access, the pre-serialized lines are only used for
+    responses whose headers were never looked at.
+    """
+
+    __slots__ = ("_headers", "_raw", "_partial", "_charset")
+
+    _DYNAMIC = frozenset((hdrs.CONTENT_LENGTH, hdrs.DATE, hdrs.TRANSFER_ENCODING))
+
+    def __init__(self, headers: LooseHeaders) -> None:
+        real_headers: CIMultiDict[str] = CIMultiDict(headers)
+        for name in self._DYNAMIC:
+            if name in real_headers:
+                raise ValueError(f"{name} header cannot be part of a template")
+        self._headers = CIMultiDictProxy(real_headers)
+        self._raw = self._serialize(frozenset())
+        ctype = real_headers.get(hdrs.CONTENT_TYPE)
+        self._charset: Optional[str] = None
+        if ctype is not None:
+            msg = HeaderParser().parsestr("Content-Type: " + ctype)
+            self._charset = msg.get_content_charset()
+        # lower case names of overridden headers -> serialized rest
+        self._partial: Dict[FrozenSet[str], bytes] = {}
+
+    @property
+    def headers(self) -> "CIMultiDictProxy[str]":
+        return self._headers
+
+    def _serialize(self, skip: FrozenSet[str]) -> bytes:
+        return "".join(
+            [
+                _safe_header(str(k)) + ": " + _safe_header(v) + "\r\n"
+                for k, v in self._headers.items()
+                if k.lower() not in skip
+            ]
+        ).encode("utf-8")
+
+    def _raw_without(self, names: FrozenSet[str]) -> bytes:
+        """Return the serialized template without the given headers."""
+        try:
+            return self._partial[names]
+        except KeyError:
+            raw = self._partial[names] = self._serialize(names)
+            return raw
+
+    def __repr__(self) -> str:
+        return f"<HeaderTemplate {list(self._headers.keys())}>"
+
+
 ############################################################
 # HTTP Response classes
 ############################################################
@@ -74,6 +142,8 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
         "_chunked",
         "_compression",
         "_compression_force",
+        "_compression_level",
+        "_zstd_dict",
         "_req",
         "_payload_writer",
         "_eof_sent",
@@ -83,6 +153,8 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
         "_status",
         "_reason",
         "_cookies",
+        "_template",
+        "_template_merged",
         "__weakref__",
     )
 
@@ -92,6 +164,7 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
         status: int = 200,
         reason: Optional[str] = None,
         headers: Optional[LooseHeaders] = None,
+        template: Optional[HeaderTemplate] = None,
     ) -> None:
         super().__init__()
         self._length_check = True
@@ -100,12 +173,16 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
         self._chunked = False
         self._compression = False
         self._compression_force: Optional[ContentCoding] = None
+        self._compression_level: Optional[int] = None
+        self._zstd_dict: Optional[bytes] = None
 
         self._req: Optional[BaseRequest] = None
         self._payload_writer: Optional[AbstractStreamWriter] = None
         self._eof_sent = False
         self._body_length = 0
         self._state: Dict[str, Any] = {}
+        self._template = template
+        self._template_merged = False
 
         if headers is not None:
             self._headers: CIMultiDict[str] = CIMultiDict(headers)
@@ -118,6 +195,10 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
     def prepared(self) -> bool:
         return self._payload_writer is not None
 
+    @property
+    def template(self) -> Optional[HeaderTemplate]:
+        return self._template
+
     @property
     def task(self) -> "Optional[asyncio.Task[None]]":
         if self._req:
@@ -177,16 +258,40 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
                 "You can't enable chunked encoding when " "a content length is set"
             )
 
-    def enable_compression(self, force: Optional[ContentCoding] = None) -> None:
+    def enable_compression(
+        self,
+        force: Optional[ContentCoding] = None,
+        *,
+        level: Optional[int] = None,
+        zstd_dict: Optional[bytes] = None,
+    ) -> None:
         """Enables response compression encoding."""
-        # Backwards compatibility for when force was a bool <0.17.
+        if force == ContentCoding.zstd and not HAS_ZSTD:
+            raise RuntimeError(
+                "The zstd compression is not available. "
+                "Please install `zstandard` module"
+            )
         self._compression = True
         self._compression_force = force
+        self._compression_level = level
+        self._zstd_dict = zstd_dict
 
     @property
     def headers(self) -> "CIMultiDict[str]":
+        if self._template is not None and not self._template_merged:
+            self._merge_template()
         return self._headers
 
+    def _merge_template(self) -> None:
+        """Add the template headers which are not set on the response."""
+        assert self._template is not None
+        headers = self._headers
+        own = frozenset(name.lower() for name in headers)
+        for name, value in self._template.headers.items():
+            if name.lower() not in own:
+                headers.add(name, value)
+        self._template_merged = True
+
     @property
     def content_length(self) -> Optional[int]:
         # Just a placeholder for adding setter
@@ -206,7 +311,8 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
 
     @property
     def content_type(self) -> str:
-        # Just a placeholder for adding setter
+        if self._template is not None and not self._template_merged:
+            self._merge_template()
         return super().content_type
 
     @content_type.setter
@@ -217,7 +323,8 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
 
     @property
     def charset(self) -> Optional[str]:
-        # Just a placeholder for adding setter
+        if self._template is not None and not self._template_merged:
+            self._merge_template()
         return super().charset
 
     @charset.setter
@@ -313,7 +420,9 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
         if coding != ContentCoding.identity:
             assert self._payload_writer is not None
             self._headers[hdrs.CONTENT_ENCODING] = coding.value
-            self._payload_writer.enable_compression(coding.value)
+            self._payload_writer.enable_compression(
+                coding.value, level=self._compression_level, zstd_dict=self._zstd_dict
+            )
             # Compressed payload may have different content length,
             # remove the header
             self._headers.popall(hdrs.CONTENT_LENGTH, None)
@@ -322,11 +431,20 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
         if self._compression_force:
             await self._do_start_compression(self._compression_force)
         else:
-            accept_encoding = request.headers.get(hdrs.ACCEPT_ENCODING, "").lower()
+            qvalues = parse_accept_encoding(
+                request.headers.get(hdrs.ACCEPT_ENCODING, "")
+            )
+            best: Optional[ContentCoding] = None
+            best_q = 0.0
+            # the first coding wins among equal q-values
             for coding in ContentCoding:
-                if coding.value in accept_encoding:
-                    await self._do_start_compression(coding)
-                    return
+                if coding is ContentCoding.zstd and not HAS_ZSTD:
+                    continue
+                q = qvalues.get(coding.value, 0.0)
+                if q > best_q:
+                    best, best_q = coding, q
+            if best is not None:
+                await self._do_start_compression(best)
 
     async def prepare(self, request: "BaseRequest") -> Optional[AbstractStreamWriter]:
         if self._eof_sent:
@@ -389,13 +507,16 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
             elif version >= HttpVersion11 and self.status in (100, 101, 102, 103, 204):
                 del headers[hdrs.CONTENT_LENGTH]
 
-        if self.status not in (204, 304):
+        template = self._template
+        defaults = headers if template is None else template.headers
+        if self.status not in (204, 304) and hdrs.CONTENT_TYPE not in defaults:
             headers.setdefault(hdrs.CONTENT_TYPE, "application/octet-stream")
         headers.setdefault(hdrs.DATE, rfc822_formatted_time())
-        headers.setdefault(hdrs.SERVER, SERVER_SOFTWARE)
+        if hdrs.SERVER not in defaults:
+            headers.setdefault(hdrs.SERVER, SERVER_SOFTWARE)
 
         # connection header
-        if hdrs.CONNECTION not in headers:
+        if hdrs.CONNECTION not in headers and hdrs.CONNECTION not in defaults:
             if keep_alive:
                 if version == HttpVersion10:
                     headers[hdrs.CONNECTION] = "keep-alive"
@@ -413,7 +534,22 @@ class StreamResponse(BaseClass, HeadersMixin, CookieMixin):
         status_line = "HTTP/{}.{} {} {}".format(
             version[0], version[1], self._status, self._reason
         )
-        await writer.write_headers(status_line, self._headers)
+        template = self._template
+        if template is None or self._template_merged:
+            await writer.write_headers(status_line, self._headers)
+            return
+        if not isinstance(writer, StreamWriter):
+            # only our own writer knows how to send serialized lines
+            self._merge_template()
+            await writer.write_headers(status_line, self._headers)
+            return
+        headers = self._headers
+        raw = template._raw
+        overridden = [name.lower() for name in headers if name in template.headers]
+        if overridden:
+            # leave out the template lines of headers set on the response
+            raw = template._raw_without(frozenset(overridden))
+        await writer._write_headers(status_line, headers, raw)
 
     async def write(self, data: bytes) -> None:
         assert isinstance(
@@ -505,6 +641,7 @@ class Response(StreamResponse):
         charset: Optional[str] = None,
         zlib_executor_size: Optional[int] = None,
         zlib_executor: Optional[Executor] = None,
+        template: Optional[HeaderTemplate] = None,
     ) -> None:
         if body is not None and text is not None:
             raise ValueError("body and text are not allowed together")
@@ -531,12 +668,23 @@ class Response(StreamResponse):
                 # fast path for filling headers
                 if not isinstance(text, str):
                     raise TypeError("text argument must be str (%r)" % type(text))
-                if content_type is None:
-                    content_type = "text/plain"
-                if charset is None:
-                    charset = "utf-8"
-                real_headers[hdrs.CONTENT_TYPE] = content_type + "; charset=" + charset
-                body = text.encode(charset)
+                if (
+                    content_type is None
+                    and charset is None
+                    and template is not None
+                    and hdrs.CONTENT_TYPE in template.headers
+                ):
+                    # keep the Content-Type of the template
+                    body = text.encode(template._charset or "utf-8")
+                else:
+                    if content_type is None:
+                        content_type = "text/plain"
+                    if charset is None:
+                        charset = "utf-8"
+                    real_headers[hdrs.CONTENT_TYPE] = (
+                        content_type + "; charset=" + charset
+                    )
+                    body = text.encode(charset)
                 text = None
         else:
             if hdrs.CONTENT_TYPE in real_headers:
@@ -552,7 +700,9 @@ class Response(StreamResponse):
                         content_type += "; charset=" + charset
                     real_headers[hdrs.CONTENT_TYPE] = content_type
 
-        super().__init__(status=status, reason=reason, headers=real_headers)
+        super().__init__(
+            status=status, reason=reason, headers=real_headers, template=template
+        )
 
         if text is not None:
             self.text = text
@@ -586,7 +736,10 @@ class Response(StreamResponse):
             headers = self._headers
 
             # set content-type
-            if hdrs.CONTENT_TYPE not in headers:
+            template = self._template
+            if hdrs.CONTENT_TYPE not in headers and (
+                template is None or hdrs.CONTENT_TYPE not in template.headers
+            ):
                 headers[hdrs.CONTENT_TYPE] = body.content_type
 
             # copy payload headers
@@ -680,11 +833,21 @@ class Response(StreamResponse):
         if coding != ContentCoding.identity:
             # Instead of using _payload_writer.enable_compression,
             # compress the whole body
-            compressor = ZLibCompressor(
-                encoding=str(coding.value),
-                max_sync_chunk_size=self._zlib_executor_size,
-                executor=self._zlib_executor,
-            )
+            compressor: Union[ZLibCompressor, ZstdCompressor]
+            if coding == ContentCoding.zstd:
+                compressor = ZstdCompressor(
+                    level=self._compression_level,
+                    dict_data=self._zstd_dict,
+                    max_sync_chunk_size=self._zlib_executor_size,
+                    executor=self._zlib_executor,
+                )
+            else:
+                compressor = ZLibCompressor(
+                    encoding=str(coding.value),
+                    level=self._compression_level,
+                    max_sync_chunk_size=self._zlib_executor_size,
+                    executor=self._zlib_executor,
+                )
             assert self._body is not None
             if self._zlib_executor_size is None and len(self._body) > 1024 * 1024:
                 warnings.warn(
@@ -712,6 +875,7 @@ def json_response(
     headers: Optional[LooseHeaders] = None,
     content_type: str = "application/json",
     dumps: JSONEncoder = json.dumps,
+    template: Optional[HeaderTemplate] = None,
 ) -> Response:
     if data is not sentinel:
         if text or body:
@@ -725,4 +889,5 @@ def json_response(
         reason=reason,
         headers=headers,
         content_type=content_type,
+        template=template,
     )
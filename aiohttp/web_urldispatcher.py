@@ -4,8 +4,15 @@ import base64
 import hashlib
 import keyword
 import os
+import posixpath
 import re
+import stat
+import time
+from bisect import bisect_left
+from collections import OrderedDict
 from contextlib import contextmanager
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
 from types import MappingProxyType
 from typing import (
@@ -21,6 +28,7 @@ from typing import (
     Iterator,
     List,
     Mapping,
+    NamedTuple,
     NoReturn,
     Optional,
     Pattern,
@@ -47,7 +55,7 @@ from .web_exceptions import (
     HTTPMethodNotAllowed,
     HTTPNotFound,
 )
-from .web_fileresponse import FileResponse
+from .web_fileresponse import FileCache, FileResponse
 from .web_request import Request
 from .web_response import Response, StreamResponse
 from .web_routedef import AbstractRouteDef
@@ -82,10 +90,16 @@ ROUTE_RE: Final[Pattern[str]] = re.compile(
     r"(\{[_a-zA-Z][^{}]*(?:\{[^{}]*\}[^{}]*)*\})"
 )
 PATH_SEP: Final[str] = re.escape("/")
+_NAMED_GROUP_RE: Final[Pattern[str]] = re.compile(
+    r"(?<!\\)\(\?P<[_a-zA-Z][_a-zA-Z0-9]*>"
+)
+_BACKREFERENCE_RE: Final[Pattern[str]] = re.compile(r"\\[1-9]|\(\?P=")
 
 
 _ExpectHandler = Callable[[Request], Awaitable[Optional[StreamResponse]]]
 _Resolve = Tuple[Optional["UrlMappingMatchInfo"], Set[str]]
+_ResolveCacheKey = Tuple[str, str, Optional[str]]
+_ResolveCacheEntry = Tuple[Dict[str, str], "AbstractRoute", Tuple["Application", ...]]
 
 
 class _InfoDict(TypedDict, total=False):
@@ -318,6 +332,10 @@ class Resource(AbstractResource):
     def __init__(self, *, name: Optional[str] = None) -> None:
         super().__init__(name=name)
         self._routes: List[ResourceRoute] = []
+        # First registered route per method, routes registered
+        # after a METH_ANY one are never reached
+        self._method_routes: Dict[str, ResourceRoute] = {}
+        self._allowed_methods: Set[str] = set()
 
     def add_route(
         self,
@@ -343,22 +361,22 @@ class Resource(AbstractResource):
             route, ResourceRoute
         ), f"Instance of Route class is required, got {route!r}"
         self._routes.append(route)
+        self._allowed_methods.add(route.method)
+        if hdrs.METH_ANY not in self._method_routes:
+            self._method_routes.setdefault(route.method, route)
 
     async def resolve(self, request: Request) -> _Resolve:
-        allowed_methods: Set[str] = set()
-
         match_dict = self._match(request.rel_url.raw_path)
         if match_dict is None:
-            return None, allowed_methods
-
-        for route_obj in self._routes:
-            route_method = route_obj.method
-            allowed_methods.add(route_method)
+            return None, set()
 
-            if route_method == request.method or route_method == hdrs.METH_ANY:
-                return (UrlMappingMatchInfo(match_dict, route_obj), allowed_methods)
-        else:
-            return None, allowed_methods
+        allowed_methods = set(self._allowed_methods)
+        route_obj = self._method_routes.get(request.method)
+        if route_obj is None:
+            route_obj = self._method_routes.get(hdrs.METH_ANY)
+            if route_obj is None:
+                return None, allowed_methods
+        return UrlMappingMatchInfo(match_dict, route_obj), allowed_methods
 
     @abc.abstractmethod
     def _match(self, path: str) -> Optional[Dict[str, str]]:
@@ -516,6 +534,7 @@ class PrefixResource(AbstractResource):
 
 class StaticResource(PrefixResource):
     VERSION_KEY = "v"
+    PATH_CACHE_SIZE = 1024
 
     def __init__(
         self,
@@ -528,6 +547,8 @@ class StaticResource(PrefixResource):
         show_index: bool = False,
         follow_symlinks: bool = False,
         append_version: bool = False,
+        file_cache: Optional[FileCache] = None,
+        path_cache_ttl: Optional[float] = None,
     ) -> None:
         super().__init__(prefix, name=name)
         try:
@@ -545,6 +566,12 @@ class StaticResource(PrefixResource):
         self._follow_symlinks = follow_symlinks
         self._expect_handler = expect_handler
         self._append_version = append_version
+        self._file_cache = file_cache
+        # normalized filename -> (resolved path, is directory, expiration time)
+        self._path_cache_ttl = path_cache_ttl
+        self._path_cache: "OrderedDict[Path, Tuple[Path, bool, float]]" = OrderedDict()
+        # normalized filename -> (resolved path, mtime_ns, size, content hash)
+        self._hash_cache: Dict[str, Tuple[Path, int, int, str]] = {}
 
         self._routes = {
             "GET": ResourceRoute(
@@ -573,24 +600,68 @@ class StaticResource(PrefixResource):
             url = url / filename
 
         if append_version:
-            try:
-                filepath = self._directory.joinpath(filename).resolve()
-                if not self._follow_symlinks:
-                    filepath.relative_to(self._directory)
-            except (ValueError, FileNotFoundError):
-                # ValueError for case when path point to symlink
-                # with follow_symlinks is False
-                return url  # relatively safe
-            if filepath.is_file():
-                # TODO cache file content
-                # with file watcher for cache invalidation
-                with filepath.open("rb") as f:
-                    file_bytes = f.read()
-                h = self._get_file_hash(file_bytes)
+            h = self._get_version(filename)
+            if h is not None:
                 url = url.with_query({self.VERSION_KEY: h})
-                return url
         return url
 
+    def _get_version(self, filename: str) -> Optional[str]:
+        key = posixpath.normpath(filename)
+        cached = self._hash_cache.get(key)
+        if cached is not None:
+            # a single stat() of the resolved file, no resolve() on a hit
+            filepath, mtime_ns, size, h = cached
+            try:
+                st = filepath.stat()
+            except OSError:
+                pass
+            else:
+                if (st.st_mtime_ns, st.st_size) == (mtime_ns, size):
+                    return h
+            del self._hash_cache[key]
+        try:
+            filepath = self._directory.joinpath(filename).resolve()
+            if not self._follow_symlinks:
+                filepath.relative_to(self._directory)
+            st = filepath.stat()
+        except (ValueError, OSError):
+            # ValueError for case when path point to symlink
+            # with follow_symlinks is False
+            return None  # relatively safe
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        with filepath.open("rb") as f:
+            file_bytes = f.read()
+        h = self._get_file_hash(file_bytes)
+        self._hash_cache[key] = (filepath, st.st_mtime_ns, st.st_size, h)
+        return h
+
+    def precompute_versions(self) -> None:
+        """Compute the content hashes of all files in the directory.
+
+        The hashes are later used by url_for(append_version=True),
+        so it does not have to read files while serving requests.
+        """
+        visited: Set[Tuple[int, int]] = set()
+        for dirpath, dirnames, filenames in os.walk(
+            self._directory, followlinks=self._follow_symlinks
+        ):
+            # do not loop forever over symlinks pointing to a parent
+            try:
+                st = os.stat(dirpath)
+            except OSError:
+                dirnames.clear()
+                continue
+            if (st.st_dev, st.st_ino) in visited:
+                dirnames.clear()
+                continue
+            visited.add((st.st_dev, st.st_ino))
+            for name in filenames:
+                filepath = Path(dirpath, name)
+                if not self._follow_symlinks and filepath.is_symlink():
+                    continue
+                self._get_version(filepath.relative_to(self._directory).as_posix())
+
     @staticmethod
     def _get_file_hash(byte_array: bytes) -> str:
         m = hashlib.sha256()  # todo sha256 can be configurable param
@@ -632,9 +703,61 @@ class StaticResource(PrefixResource):
         return iter(self._routes.values())
 
     async def _handle(self, request: Request) -> StreamResponse:
-        rel_url = request.match_info["filename"]
+        # Path() drops "." segments and repeated slashes, so variants
+        # of the same name share a cache entry
+        filename = Path(request.match_info["filename"])
+        cached = self._get_cached_path(filename)
+        if cached is not None:
+            filepath, is_dir = cached
+        else:
+            filepath, is_dir = self._resolve_path(request, filename)
+            if self._path_cache_ttl is not None:
+                self._set_cached_path(filename, filepath, is_dir)
+
+        # on opening a dir, load its contents if allowed
+        if is_dir:
+            if self._show_index:
+                try:
+                    return Response(
+                        text=self._directory_as_html(filepath), content_type="text/html"
+                    )
+                except PermissionError:
+                    raise HTTPForbidden()
+            else:
+                raise HTTPForbidden()
+        response = FileResponse(
+            filepath, chunk_size=self._chunk_size, file_cache=self._file_cache
+        )
+        if cached is not None:
+            # resolve the name again once the file is found missing
+            response._on_missing = partial(self._path_cache.pop, filename, None)
+        return response
+
+    def _get_cached_path(self, filename: Path) -> Optional[Tuple[Path, bool]]:
+        cached = self._path_cache.get(filename)
+        if cached is None:
+            return None
+        if cached[2] <= time.monotonic():
+            del self._path_cache[filename]
+            return None
+        self._path_cache.move_to_end(filename)
+        return cached[0], cached[1]
+
+    def _set_cached_path(self, filename: Path, filepath: Path, is_dir: bool) -> None:
+        assert self._path_cache_ttl is not None
+        now = time.monotonic()
+        cache = self._path_cache
+        cache[filename] = (filepath, is_dir, now + self._path_cache_ttl)
+        cache.move_to_end(filename)
+        # drop expired entries from the least recently used end
+        while cache:
+            oldest = next(iter(cache.values()))
+            if oldest[2] > now and len(cache) <= self.PATH_CACHE_SIZE:
+                break
+            cache.popitem(last=False)
+
+    def _resolve_path(self, request: Request, filename: Path) -> Tuple[Path, bool]:
         try:
-            filename = Path(rel_url)
             if filename.anchor:
                 # rel_url is an absolute name like
                 # /static/\\machine_name\c$ or /static/D:\path
@@ -653,19 +776,16 @@ class StaticResource(PrefixResource):
             request.app.logger.exception(error)
             raise HTTPNotFound() from error
 
-        # on opening a dir, load its contents if allowed
-        if filepath.is_dir():
-            if self._show_index:
-                try:
-                    return Response(
-                        text=self._directory_as_html(filepath), content_type="text/html"
-                    )
-                except PermissionError:
-                    raise HTTPForbidden()
-            else:
-                raise HTTPForbidden()
-        elif filepath.is_file():
-            return FileResponse(filepath, chunk_size=self._chunk_size)
+        # a single stat() tells both whether the path exists and its kind
+        try:
+            st = filepath.stat()
+        except OSError as error:
+            # missing file, symlink loop and so on, like is_file() does
+            raise HTTPNotFound() from error
+        if stat.S_ISDIR(st.st_mode):
+            return filepath, True
+        elif stat.S_ISREG(st.st_mode):
+            return filepath, False
         else:
             raise HTTPNotFound
 
@@ -718,11 +838,13 @@ class PrefixedSubAppResource(PrefixResource):
         self._app = app
         for resource in app.router.resources():
             resource.add_prefix(prefix)
+        app.router._reindex()
 
     def add_prefix(self, prefix: str) -> None:
         super().add_prefix(prefix)
         for resource in self._app.router.resources():
             resource.add_prefix(prefix)
+        self._app.router._reindex()
 
     def url_for(self, *args: str, **kwargs: str) -> URL:
         raise RuntimeError(".url_for() is not supported " "by sub-application root")
@@ -972,6 +1094,243 @@ class RoutesView(Sized, Iterable[AbstractRoute], Container[AbstractRoute]):
         return route in self._routes
 
 
+def _index_key(
+    resource: AbstractResource,
+) -> Optional[Tuple[Tuple[str, ...], bool]]:
+    """Return static path segments the resource can be indexed by.
+
+    The flag is True if the resource matches only the path made of
+    exactly these segments and False if it may match any path below them.
+    None means that the resource should be tried for every request.
+    """
+    # Subclasses may override matching, index only the known classes
+    resource_type = type(resource)
+    if resource_type is PlainResource:
+        return tuple(resource.canonical.split("/")[1:]), True
+    if resource_type is DynamicResource:
+        parts = resource.canonical.split("/")[1:]
+        for pos, part in enumerate(parts):
+            if "{" in part:
+                return tuple(parts[:pos]), False
+        return tuple(parts), True
+    if resource_type is StaticResource or resource_type is PrefixedSubAppResource:
+        return tuple(resource.canonical.split("/")[1:]), False
+    return None
+
+
+def _combine_patterns(
+    resources: Tuple[DynamicResource, ...]
+) -> Optional[Tuple[Pattern[str], List[int]]]:
+    """Merge patterns of the resources into one alternation regex.
+
+    Return the regex and the number of the group wrapping each
+    alternative or None if the patterns cannot be combined.
+    """
+    alternatives = []
+    groups = []
+    group = 1
+    for resource in resources:
+        # Names of variables repeat across resources, drop them
+        pattern = _NAMED_GROUP_RE.sub("(?:", resource._pattern.pattern)
+        try:
+            compiled = re.compile(pattern)
+        except re.error:
+            return None
+        alternatives.append(f"({pattern})")
+        groups.append(group)
+        group += 1 + compiled.groups
+    try:
+        return re.compile("|".join(alternatives)), groups
+    except re.error:
+        return None
+
+
+_CombinedPatterns = Dict[
+    Tuple[DynamicResource, ...], Optional[Tuple[Pattern[str], List[int]]]
+]
+
+
+class _Candidates:
+    """Resources which may match a path, in registration order.
+
+    If patterns are combined, a single match of the alternation regex
+    made of dynamic resource patterns tells which dynamic resource is the
+    first one matching the path, so the ones before it are skipped
+    without trying their patterns one by one.
+    """
+
+    __slots__ = (
+        "resources",
+        "_pattern",
+        "_alternatives",
+        "_others",
+        "_other_positions",
+    )
+
+    def __init__(
+        self,
+        resources: Tuple[AbstractResource, ...],
+        combined_patterns: Optional[_CombinedPatterns],
+    ) -> None:
+        self.resources = resources
+        self._pattern: Optional[Pattern[str]] = None
+        if combined_patterns is None:
+            return
+        positions = [
+            pos
+            for pos, resource in enumerate(resources)
+            if type(resource) is DynamicResource
+            # Group numbers are shifted in the combined pattern
+            and not _BACKREFERENCE_RE.search(resource._pattern.pattern)
+        ]
+        if len(positions) < 2:
+            return
+        key = tuple(cast(DynamicResource, resources[pos]) for pos in positions)
+        if key not in combined_patterns:
+            combined_patterns[key] = _combine_patterns(key)
+        combined = combined_patterns[key]
+        if combined is None:
+            return
+        self._pattern, groups = combined
+        self._alternatives = dict(zip(groups, positions))
+        combined_positions = set(positions)
+        self._other_positions = [
+            pos for pos in range(len(resources)) if pos not in combined_positions
+        ]
+        self._others = tuple(resources[pos] for pos in self._other_positions)
+
+    def match(self, path: str) -> Tuple[AbstractResource, ...]:
+        if self._pattern is None:
+            return self.resources
+        match = self._pattern.fullmatch(path)
+        if match is None:
+            return self._others
+        # The group wrapping an alternative is closed last
+        pos = self._alternatives[cast(int, match.lastindex)]
+        skipped = bisect_left(self._other_positions, pos)
+        return self._others[:skipped] + self.resources[pos:]
+
+
+class _IndexNode:
+    __slots__ = ("children", "exact", "below", "passing", "terminal")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _IndexNode] = {}
+        self.exact: List[Tuple[int, AbstractResource]] = []
+        self.below: List[Tuple[int, AbstractResource]] = []
+        # Candidates for paths going deeper than the node and for paths
+        # ending at the node.
+        self.passing = _Candidates((), None)
+        self.terminal = _Candidates((), None)
+
+
+class _ResourceIndex:
+    """Prefix tree of resources keyed by static path segments.
+
+    Lookup walks the tree once per path segment and returns all resources
+    that may match the path in registration order, so the router tries
+    the same resources in the same order as a full scan would, skipping
+    the ones that cannot match.  Candidates of paths registered by plain
+    resources are also kept in a dict to skip the walk for them.
+    """
+
+    def __init__(
+        self, resources: Iterable[AbstractResource], *, combine_patterns: bool
+    ) -> None:
+        combined_patterns: Optional[_CombinedPatterns]
+        combined_patterns = {} if combine_patterns else None
+        self._root = root = _IndexNode()
+        exact_nodes: Dict[str, _IndexNode] = {}
+        for order, resource in enumerate(resources):
+            key = _index_key(resource)
+            if key is None:
+                root.below.append((order, resource))
+                continue
+            parts, exact = key
+            node = root
+            for part in parts:
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = _IndexNode()
+                node = child
+            if exact:
+                node.exact.append((order, resource))
+                exact_nodes[resource.canonical] = node
+            else:
+                node.below.append((order, resource))
+
+        stack: List[Tuple[_IndexNode, List[Tuple[int, AbstractResource]]]]
+        stack = [(root, [])]
+        while stack:
+            node, inherited = stack.pop()
+            below = sorted(inherited + node.below, key=itemgetter(0))
+            node.passing = _Candidates(
+                tuple(resource for _, resource in below), combined_patterns
+            )
+            node.terminal = _Candidates(
+                tuple(
+                    resource
+                    for _, resource in sorted(below + node.exact, key=itemgetter(0))
+                ),
+                combined_patterns,
+            )
+            stack.extend((child, below) for child in node.children.values())
+
+        self._exact: Dict[str, _Candidates] = {
+            path: node.terminal for path, node in exact_nodes.items()
+        }
+
+    def candidates(self, path: str) -> Tuple[AbstractResource, ...]:
+        candidates = self._exact.get(path)
+        if candidates is not None:
+            return candidates.match(path)
+        node = self._root
+        if not path.startswith("/"):
+            return node.passing.match(path)
+        for part in path[1:].split("/"):
+            child = node.children.get(part)
+            if child is None:
+                return node.passing.match(path)
+            node = child
+        return node.terminal.match(path)
+
+
+def _resolve_depends_on_host(router: "UrlDispatcher") -> Optional[bool]:
+    """Check what resolution of the router and its sub-applications depends on.
+
+    Return False if the result depends only on the method and the path,
+    True if it also depends on the Host header and None if it may depend
+    on anything else.
+    """
+    by_host = False
+    seen = {id(router)}
+    routers = [router]
+    while routers:
+        for resource in routers.pop().resources():
+            resource_type = type(resource)
+            if resource_type is MatchedSubAppResource:
+                rule = cast(MatchedSubAppResource, resource)._rule
+                if type(rule) is not Domain and type(rule) is not MaskDomain:
+                    return None
+                by_host = True
+            elif resource_type is not PrefixedSubAppResource:
+                if _index_key(resource) is None:
+                    return None
+                continue
+            subrouter = cast(PrefixedSubAppResource, resource)._app.router
+            if id(subrouter) not in seen:
+                seen.add(id(subrouter))
+                routers.append(subrouter)
+    return by_host
+
+
+class _ResolveCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
 class UrlDispatcher(AbstractRouter, Mapping[str, AbstractResource]):
     NAME_SPLIT_RE = re.compile(r"[.:-]")
 
@@ -979,12 +1338,88 @@ class UrlDispatcher(AbstractRouter, Mapping[str, AbstractResource]):
         super().__init__()
         self._resources: List[AbstractResource] = []
         self._named_resources: Dict[str, AbstractResource] = {}
+        self._index: Optional[_ResourceIndex] = None
+        # Indexes for requests to domains of domain sub-applications,
+        # the default one leaves all of them out.
+        self._domain_indexes: Dict[str, _ResourceIndex] = {}
+        self._combine_patterns = False
+        self._resolve_cache: "OrderedDict[_ResolveCacheKey, _ResolveCacheEntry]"
+        self._resolve_cache = OrderedDict()
+        self._resolve_cache_size = 0
+        self._resolve_cache_hits = 0
+        self._resolve_cache_misses = 0
+        # Calculated on freezing, see _resolve_depends_on_host()
+        self._resolve_cache_by_host: Optional[bool] = None
 
     async def resolve(self, request: Request) -> UrlMappingMatchInfo:
+        if not self._resolve_cache_size or self._resolve_cache_by_host is None:
+            return await self._resolve(request)
+
+        key = (
+            request.method,
+            request.rel_url.raw_path,
+            request.headers.get(hdrs.HOST) if self._resolve_cache_by_host else None,
+        )
+        cache = self._resolve_cache
+        entry = cache.get(key)
+        if entry is not None:
+            cache.move_to_end(key)
+            self._resolve_cache_hits += 1
+            match_dict, route, apps = entry
+            match_info = UrlMappingMatchInfo(match_dict, route)
+            for app in reversed(apps):
+                match_info.add_app(app)
+            return match_info
+
+        self._resolve_cache_misses += 1
+        match_info = await self._resolve(request)
+        # Not found and not allowed results are not cached,
+        # so that scanning for random URLs does not evict hot routes.
+        if match_info.http_exception is None:
+            cache[key] = (dict(match_info), match_info.route, match_info.apps)
+            if len(cache) > self._resolve_cache_size:
+                cache.popitem(last=False)
+        return match_info
+
+    def set_resolve_cache(self, maxsize: int) -> None:
+        """Cache up to maxsize recent resolutions, 0 disables the cache.
+
+        The cache is used only by a frozen router.
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize should be a non-negative integer")
+        self._resolve_cache_size = maxsize
+        self._resolve_cache.clear()
+
+    def set_combine_patterns(self, enabled: bool) -> None:
+        """Match patterns of dynamic resources with one combined regex."""
+        self._combine_patterns = enabled
+        self._reindex()
+
+    def resolve_cache_info(self) -> _ResolveCacheInfo:
+        return _ResolveCacheInfo(
+            self._resolve_cache_hits,
+            self._resolve_cache_misses,
+            self._resolve_cache_size,
+            len(self._resolve_cache),
+        )
+
+    async def _resolve(self, request: Request) -> UrlMappingMatchInfo:
         method = request.method
         allowed_methods: Set[str] = set()
 
-        for resource in self._resources:
+        resources: Iterable[AbstractResource]
+        index = self._index
+        if index is None:
+            resources = self._resources
+        else:
+            if self._domain_indexes:
+                host = request.headers.get(hdrs.HOST)
+                if host:
+                    index = self._domain_indexes.get(host.lower(), index)
+            resources = index.candidates(request.rel_url.raw_path)
+
+        for resource in resources:
             match_dict, allowed = await resource.resolve(request)
             if match_dict is not None:
                 return match_dict
@@ -1049,6 +1484,7 @@ class UrlDispatcher(AbstractRouter, Mapping[str, AbstractResource]):
                 )
             self._named_resources[name] = resource
         self._resources.append(resource)
+        self._resolve_cache.clear()
 
     def add_resource(self, path: str, *, name: Optional[str] = None) -> Resource:
         if path and not path.startswith("/"):
@@ -1089,6 +1525,8 @@ class UrlDispatcher(AbstractRouter, Mapping[str, AbstractResource]):
         show_index: bool = False,
         follow_symlinks: bool = False,
         append_version: bool = False,
+        file_cache: Optional[FileCache] = None,
+        path_cache_ttl: Optional[float] = None,
     ) -> AbstractResource:
         """Add static files view.
 
@@ -1108,6 +1546,8 @@ class UrlDispatcher(AbstractRouter, Mapping[str, AbstractResource]):
             show_index=show_index,
             follow_symlinks=follow_symlinks,
             append_version=append_version,
+            file_cache=file_cache,
+            path_cache_ttl=path_cache_ttl,
         )
         self.register_resource(resource)
         return resource
@@ -1165,6 +1605,32 @@ class UrlDispatcher(AbstractRouter, Mapping[str, AbstractResource]):
         super().freeze()
         for resource in self._resources:
             resource.freeze()
+        self._reindex()
+
+    def _reindex(self) -> None:
+        # Resources of a frozen sub-application get a new prefix
+        # when the application is mounted into another one.
+        if self.frozen:
+            domains: Dict[str, Set[AbstractResource]] = {}
+            for resource in self._resources:
+                if type(resource) is MatchedSubAppResource:
+                    rule = resource._rule
+                    if type(rule) is Domain:
+                        domains.setdefault(rule.canonical, set()).add(resource)
+            hosted: Set[AbstractResource] = set().union(*domains.values())
+            self._index = self._build_index(hosted)
+            self._domain_indexes = {
+                domain: self._build_index(hosted - resources)
+                for domain, resources in domains.items()
+            }
+            self._resolve_cache_by_host = _resolve_depends_on_host(self)
+            self._resolve_cache.clear()
+
+    def _build_index(self, excluded: Set[AbstractResource]) -> _ResourceIndex:
+        return _ResourceIndex(
+            (resource for resource in self._resources if resource not in excluded),
+            combine_patterns=self._combine_patterns,
+        )
 
     def add_routes(self, routes: Iterable[AbstractRouteDef]) -> List[AbstractRoute]:
         """Append routes to route table.
@@ -3,6 +3,7 @@
 
 import asyncio
 import datetime
+import gzip
 import http.cookies
 import io
 import json
@@ -1765,6 +1766,42 @@ async def test_encoding_gzip_nochunk(aiohttp_client: Any) -> None:
     resp.close()
 
 
+async def test_encoding_gzip_large_ratio(aiohttp_client: Any) -> None:
+    body = b"0" * 2**22
+
+    async def handler(request):
+        headers = {"Content-Encoding": "gzip"}
+        return web.Response(body=gzip.compress(body), headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/")
+    assert 200 == resp.status
+    data = await resp.read()
+    assert data == body
+    resp.close()
+
+
+async def test_encoding_gzip_executor(aiohttp_client: Any) -> None:
+    body = bytes(range(256)) * 2**12
+
+    async def handler(request):
+        headers = {"Content-Encoding": "gzip"}
+        return web.Response(body=gzip.compress(body), headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app, zlib_executor_size=1024)
+
+    resp = await client.get("/")
+    assert 200 == resp.status
+    data = await resp.read()
+    assert data == body
+    resp.close()
+
+
 async def test_bad_payload_compression(aiohttp_client: Any) -> None:
     async def handler(request):
         resp = web.Response(text="text")
@@ -2988,6 +3025,129 @@ async def test_read_from_closed_content(aiohttp_client: Any) -> None:
         await resp.content.readline()
 
 
+async def test_read_into(aiohttp_client: Any) -> None:
+    data = b"0123456789" * 100000
+
+    async def handler(request):
+        resp = web.StreamResponse()
+        resp.content_length = len(data)
+        await resp.prepare(request)
+        for i in range(0, len(data), 65536):
+            await resp.write(data[i : i + 65536])
+        return resp
+
+    app = web.Application()
+    app.add_routes([web.get("/", handler)])
+
+    client = await aiohttp_client(app)
+
+    async with client.get("/") as resp:
+        buf = bytearray(resp.content_length)
+        assert len(data) == await resp.read_into(buf)
+        assert buf == data
+        assert resp.connection is None
+
+
+async def test_read_into_larger_buffer(aiohttp_client: Any) -> None:
+    async def handler(request):
+        return web.Response(body=b"data")
+
+    app = web.Application()
+    app.add_routes([web.get("/", handler)])
+
+    client = await aiohttp_client(app)
+
+    async with client.get("/") as resp:
+        buf = bytearray(10)
+        assert 4 == await resp.read_into(memoryview(buf))
+        assert b"data" == buf[:4]
+
+
+async def test_read_into_after_read(aiohttp_client: Any) -> None:
+    async def handler(request):
+        return web.Response(body=b"data")
+
+    app = web.Application()
+    app.add_routes([web.get("/", handler)])
+
+    client = await aiohttp_client(app)
+
+    async with client.get("/") as resp:
+        await resp.read()
+        buf = bytearray(4)
+        assert 4 == await resp.read_into(buf)
+        assert b"data" == buf
+        with pytest.raises(ValueError):
+            await resp.read_into(bytearray(3))
+
+
+async def test_read_after_read_into(aiohttp_client: Any) -> None:
+    async def handler(request):
+        return web.Response(body=b"data")
+
+    app = web.Application()
+    app.add_routes([web.get("/", handler)])
+
+    on_chunk = mock.AsyncMock()
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_response_chunk_received.append(on_chunk)
+    client = await aiohttp_client(app, trace_configs=[trace_config])
+
+    async with client.get("/") as resp:
+        assert 4 == await resp.read_into(bytearray(4))
+        with pytest.raises(RuntimeError):
+            await resp.read()
+        with pytest.raises(RuntimeError):
+            await resp.read_into(bytearray(4))
+    assert not on_chunk.called
+
+
+async def test_read_into_too_small_buffer(aiohttp_client: Any) -> None:
+    async def handler(request):
+        return web.Response(body=b"data")
+
+    app = web.Application()
+    app.add_routes([web.get("/", handler)])
+
+    client = await aiohttp_client(app)
+
+    async with client.get("/") as resp:
+        with pytest.raises(ValueError):
+            await resp.read_into(bytearray(3))
+        assert resp.closed
+
+
+async def test_read_into_from_closed_response(aiohttp_client: Any) -> None:
+    async def handler(request):
+        return web.Response(body=b"data")
+
+    app = web.Application()
+    app.add_routes([web.get("/", handler)])
+
+    client = await aiohttp_client(app)
+
+    async with client.get("/") as resp:
+        assert resp.status == 200
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await resp.read_into(bytearray(4))
+
+
+async def test_content_readinto(aiohttp_client: Any) -> None:
+    async def handler(request):
+        return web.Response(body=b"data")
+
+    app = web.Application()
+    app.add_routes([web.get("/", handler)])
+
+    client = await aiohttp_client(app)
+
+    async with client.get("/") as resp:
+        buf = bytearray(4)
+        assert 4 == await resp.content.readinto(memoryview(buf))
+        assert b"data" == buf
+
+
 async def test_read_timeout(aiohttp_client: Any) -> None:
     async def handler(request):
         await asyncio.sleep(5)
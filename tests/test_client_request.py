@@ -58,10 +58,15 @@ def transport(buf: Any):
     def write(chunk):
         buf.extend(chunk)
 
+    def writelines(chunks):
+        for chunk in chunks:
+            buf.extend(chunk)
+
     async def write_eof():
         pass
 
     transport.write.side_effect = write
+    transport.writelines.side_effect = writelines
     transport.write_eof.side_effect = write_eof
     transport.is_closing.return_value = False
 
@@ -347,7 +352,7 @@ def test_headers(make_request: Any) -> None:
 
     assert "CONTENT-TYPE" in req.headers
     assert req.headers["CONTENT-TYPE"] == "text/plain"
-    assert req.headers["ACCEPT-ENCODING"] == "gzip, deflate, br"
+    assert req.headers["ACCEPT-ENCODING"] == _gen_default_accept_encoding()
 
 
 def test_headers_list(make_request: Any) -> None:
@@ -777,7 +782,9 @@ async def test_content_encoding(loop: Any, conn: Any) -> None:
         resp = await req.send(conn)
     assert req.headers["TRANSFER-ENCODING"] == "chunked"
     assert req.headers["CONTENT-ENCODING"] == "deflate"
-    m_writer.return_value.enable_compression.assert_called_with("deflate")
+    m_writer.return_value.enable_compression.assert_called_with(
+        "deflate", zstd_dict=None
+    )
     await req.close()
     resp.close()
 
@@ -1258,15 +1265,20 @@ def test_loose_cookies_types(loop: Any) -> None:
 
 
 @pytest.mark.parametrize(
-    "has_brotli,expected",
+    "has_brotli,has_zstd,expected",
     [
-        (False, "gzip, deflate"),
-        (True, "gzip, deflate, br"),
+        (False, False, "gzip, deflate"),
+        (True, False, "gzip, deflate, br"),
+        (False, True, "gzip, deflate, zstd"),
+        (True, True, "gzip, deflate, br, zstd"),
     ],
 )
-def test_gen_default_accept_encoding(has_brotli: Any, expected: Any) -> None:
+def test_gen_default_accept_encoding(
+    has_brotli: Any, has_zstd: Any, expected: Any
+) -> None:
     with mock.patch("aiohttp.client_reqrep.HAS_BROTLI", has_brotli):
-        assert _gen_default_accept_encoding() == expected
+        with mock.patch("aiohttp.client_reqrep.HAS_ZSTD", has_zstd):
+            assert _gen_default_accept_encoding() == expected
 
 
 @pytest.mark.parametrize(
@@ -28,7 +28,7 @@ def connector(loop: Any, create_mocked_conn: Any):
 
     conn = loop.run_until_complete(make_conn())
     proto = create_mocked_conn()
-    conn._conns["a"] = [(proto, 123)]
+    conn._conns.add("a", proto, 123)
     yield conn
     loop.run_until_complete(conn.close())
 
@@ -9,7 +9,6 @@ import socket
 import ssl
 import sys
 import uuid
-from collections import deque
 from contextlib import closing
 from typing import Any, Optional
 from unittest import mock
@@ -21,7 +20,14 @@ import aiohttp
 from aiohttp import client, web
 from aiohttp.client import ClientRequest, ClientTimeout
 from aiohttp.client_reqrep import ConnectionKey
-from aiohttp.connector import Connection, TCPConnector, _DNSCacheTable
+from aiohttp.connector import (
+    Connection,
+    TCPConnector,
+    _DNSCacheTable,
+    _IdleConnections,
+    _interleave_addrinfos,
+    _WaiterQueue,
+)
 from aiohttp.locks import EventResultOrError
 from aiohttp.test_utils import make_mocked_coro, unused_port
 from aiohttp.tracing import Trace
@@ -182,7 +188,7 @@ async def test_del_with_scheduled_cleanup(loop: Any) -> None:
     loop.set_debug(True)
     conn = aiohttp.BaseConnector(keepalive_timeout=0.01)
     transp = create_mocked_conn(loop)
-    conn._conns["a"] = [(transp, 123)]
+    conn._conns.add("a", transp, 123)
 
     conns_impl = conn._conns
     exc_handler = mock.Mock()
@@ -212,7 +218,7 @@ def test_del_with_closed_loop(loop: Any) -> None:
 
     conn = loop.run_until_complete(make_conn())
     transp = create_mocked_conn(loop)
-    conn._conns["a"] = [(transp, 123)]
+    conn._conns.add("a", transp, 123)
 
     conns_impl = conn._conns
     exc_handler = mock.Mock()
@@ -259,7 +265,7 @@ async def test_close() -> None:
 
     conn = aiohttp.BaseConnector()
     assert not conn.closed
-    conn._conns[("host", 8080, False)] = [(proto, object())]
+    conn._conns.add(("host", 8080, False), proto, object())
     await conn.close()
 
     assert not conn._conns
@@ -272,7 +278,7 @@ async def test_get(loop: Any) -> None:
     assert conn._get(1) is None
 
     proto = create_mocked_conn(loop)
-    conn._conns[1] = [(proto, loop.time())]
+    conn._conns.add(1, proto, loop.time())
     assert conn._get(1) == proto
     await conn.close()
 
@@ -283,11 +289,11 @@ async def test_get_unconnected_proto(loop: Any) -> None:
     assert conn._get(key) is None
 
     proto = create_mocked_conn(loop)
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     assert conn._get(key) == proto
 
     assert conn._get(key) is None
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     proto.is_connected = lambda *args: False
     assert conn._get(key) is None
     await conn.close()
@@ -299,11 +305,11 @@ async def test_get_unconnected_proto_ssl(loop: Any) -> None:
     assert conn._get(key) is None
 
     proto = create_mocked_conn(loop)
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     assert conn._get(key) == proto
 
     assert conn._get(key) is None
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     proto.is_connected = lambda *args: False
     assert conn._get(key) is None
     await conn.close()
@@ -315,7 +321,7 @@ async def test_get_expired(loop: Any) -> None:
     assert conn._get(key) is None
 
     proto = create_mocked_conn(loop)
-    conn._conns[key] = [(proto, loop.time() - 1000)]
+    conn._conns.add(key, proto, loop.time() - 1000)
     assert conn._get(key) is None
     assert not conn._conns
     await conn.close()
@@ -328,7 +334,7 @@ async def test_get_expired_ssl(loop: Any) -> None:
 
     proto = create_mocked_conn(loop)
     transport = proto.transport
-    conn._conns[key] = [(proto, loop.time() - 1000)]
+    conn._conns.add(key, proto, loop.time() - 1000)
     assert conn._get(key) is None
     assert not conn._conns
     assert conn._cleanup_closed_transports == [transport]
@@ -422,9 +428,9 @@ async def test_release_waiter_no_limit(loop: Any, key: Any, key2: Any) -> None:
     conn = aiohttp.BaseConnector(limit=0)
     w = mock.Mock()
     w.done.return_value = False
-    conn._waiters[key].append(w)
+    conn._waiters.add(key, w)
     conn._release_waiter()
-    assert len(conn._waiters[key]) == 0
+    assert len(conn._waiters) == 0
     assert w.done.called
     await conn.close()
 
@@ -434,8 +440,8 @@ async def test_release_waiter_first_available(loop: Any, key: Any, key2: Any) ->
     w1, w2 = mock.Mock(), mock.Mock()
     w1.done.return_value = False
     w2.done.return_value = False
-    conn._waiters[key].append(w2)
-    conn._waiters[key2].append(w1)
+    conn._waiters.add(key, w2)
+    conn._waiters.add(key2, w1)
     conn._release_waiter()
     assert (
         w1.set_result.called
@@ -451,7 +457,8 @@ async def test_release_waiter_release_first(loop: Any, key: Any, key2: Any) -> N
     w1, w2 = mock.Mock(), mock.Mock()
     w1.done.return_value = False
     w2.done.return_value = False
-    conn._waiters[key] = deque([w1, w2])
+    conn._waiters.add(key, w1)
+    conn._waiters.add(key, w2)
     conn._release_waiter()
     assert w1.set_result.called
     assert not w2.set_result.called
@@ -463,10 +470,105 @@ async def test_release_waiter_skip_done_waiter(loop: Any, key: Any, key2: Any) -
     w1, w2 = mock.Mock(), mock.Mock()
     w1.done.return_value = True
     w2.done.return_value = False
-    conn._waiters[key] = deque([w1, w2])
+    conn._waiters.add(key, w1)
+    conn._waiters.add(key, w2)
+    conn._release_waiter()
+    assert not w1.set_result.called
+    assert w2.set_result.called
+    await conn.close()
+
+
+async def test_release_waiter_fifo(loop: Any, key: Any, ssl_key: Any) -> None:
+    conn = aiohttp.BaseConnector(limit=0)
+    w1, w2, w3 = mock.Mock(), mock.Mock(), mock.Mock()
+    for w in (w1, w2, w3):
+        w.done.return_value = False
+    conn._waiters.add(key, w1)
+    conn._waiters.add(ssl_key, w2)
+    conn._waiters.add(key, w3)
+    conn._release_waiter()
+    conn._release_waiter()
+    assert w1.set_result.called
+    assert w2.set_result.called
+    assert not w3.set_result.called
+    await conn.close()
+
+
+async def test_release_waiter_round_robin(loop: Any, key: Any, ssl_key: Any) -> None:
+    conn = aiohttp.BaseConnector(limit=0, scheduling="round_robin")
+    waiters = [mock.Mock() for i in range(4)]
+    for w in waiters:
+        w.done.return_value = False
+    order = []
+    for i, w in enumerate(waiters):
+        w.set_result.side_effect = lambda result, i=i: order.append(i)
+    # the first host queues up all but the last waiter
+    conn._waiters.add(key, waiters[0])
+    conn._waiters.add(key, waiters[1])
+    conn._waiters.add(key, waiters[2])
+    conn._waiters.add(ssl_key, waiters[3])
+    for i in range(4):
+        conn._release_waiter()
+    assert order == [0, 3, 1, 2]
+    await conn.close()
+
+
+async def test_release_waiter_priority(loop: Any, key: Any, ssl_key: Any) -> None:
+    conn = aiohttp.BaseConnector(limit=0, scheduling="priority")
+    waiters = [mock.Mock() for i in range(4)]
+    for w in waiters:
+        w.done.return_value = False
+    order = []
+    for i, w in enumerate(waiters):
+        w.set_result.side_effect = lambda result, i=i: order.append(i)
+    conn._waiters.add(key, waiters[0], 0)
+    conn._waiters.add(ssl_key, waiters[1], 5)
+    conn._waiters.add(key, waiters[2], 10)
+    conn._waiters.add(ssl_key, waiters[3], 0)
+    for i in range(4):
+        conn._release_waiter()
+    assert order == [2, 1, 0, 3]
+    await conn.close()
+
+
+async def test_release_waiter_skip_unavailable_host(
+    loop: Any, key: Any, ssl_key: Any
+) -> None:
+    conn = aiohttp.BaseConnector(limit=0, limit_per_host=1)
+    w1, w2 = mock.Mock(), mock.Mock()
+    w1.done.return_value = False
+    w2.done.return_value = False
+    conn._acquired_per_host[key].add(mock.Mock())
+    conn._waiters.add(key, w1)
+    conn._waiters.add(ssl_key, w2)
     conn._release_waiter()
     assert not w1.set_result.called
     assert w2.set_result.called
+    conn._acquired_per_host.clear()
+    await conn.close()
+
+
+def test_waiter_queue_remove(key: Any) -> None:
+    waiters = _WaiterQueue()
+    w1, w2 = mock.Mock(), mock.Mock()
+    waiters.add(key, w1)
+    waiters.add(key, w2)
+    waiters.remove(key, w1)
+    assert len(waiters) == 1
+    assert key in waiters
+    waiters.remove(key, w2)
+    assert len(waiters) == 0
+    assert key not in waiters
+
+
+async def test_invalid_scheduling(loop: Any) -> None:
+    with pytest.raises(ValueError, match="scheduling"):
+        aiohttp.BaseConnector(scheduling="lifo")
+
+
+async def test_scheduling_property(loop: Any) -> None:
+    conn = aiohttp.TCPConnector(scheduling="round_robin")
+    assert conn.scheduling == "round_robin"
     await conn.close()
 
 
@@ -476,8 +578,8 @@ async def test_release_waiter_per_host(loop: Any, key: Any, key2: Any) -> None:
     w1, w2 = mock.Mock(), mock.Mock()
     w1.done.return_value = False
     w2.done.return_value = False
-    conn._waiters[key] = deque([w1])
-    conn._waiters[key2] = deque([w2])
+    conn._waiters.add(key, w1)
+    conn._waiters.add(key2, w2)
     conn._release_waiter()
     assert (w1.set_result.called and not w2.set_result.called) or (
         not w1.set_result.called and w2.set_result.called
@@ -490,7 +592,7 @@ async def test_release_waiter_no_available(loop: Any, key: Any, key2: Any) -> No
     conn = aiohttp.BaseConnector(limit=0)
     w = mock.Mock()
     w.done.return_value = False
-    conn._waiters[key].append(w)
+    conn._waiters.add(key, w)
     conn._available_connections = mock.Mock(return_value=0)
     conn._release_waiter()
     assert len(conn._waiters) == 1
@@ -700,6 +802,113 @@ async def test_tcp_connector_multiple_hosts_errors(loop: Any) -> None:
     established_connection.close()
 
 
+def _make_hosts(*addrs):
+    return [
+        {
+            "hostname": "mocked.host",
+            "host": ip,
+            "port": 80,
+            "family": family,
+            "proto": 0,
+            "flags": socket.AI_NUMERICHOST,
+        }
+        for ip, family in addrs
+    ]
+
+
+def test_interleave_addrinfos() -> None:
+    hosts = _make_hosts(
+        ("::1", socket.AF_INET6),
+        ("::2", socket.AF_INET6),
+        ("::3", socket.AF_INET6),
+        ("127.0.0.1", socket.AF_INET),
+        ("127.0.0.2", socket.AF_INET),
+    )
+    ips = [hinfo["host"] for hinfo in _interleave_addrinfos(hosts)]
+    assert ips == ["::1", "127.0.0.1", "::2", "127.0.0.2", "::3"]
+
+
+async def test_tcp_connector_happy_eyeballs_stagger(loop: Any) -> None:
+    conn = aiohttp.TCPConnector(happy_eyeballs_delay=0.01)
+    hosts = _make_hosts(
+        ("::1", socket.AF_INET6),
+        ("::2", socket.AF_INET6),
+        ("127.0.0.1", socket.AF_INET),
+    )
+    conn._resolve_host = make_mocked_coro(hosts)
+    blackholed = loop.create_future()
+    tr, pr = mock.Mock(), mock.Mock()
+    ips_tried = []
+
+    async def create_connection(*args, **kwargs):
+        ip = args[1]
+        ips_tried.append(ip)
+        if ip == "::1":
+            try:
+                await blackholed
+            except asyncio.CancelledError:
+                blackholed.cancel()
+                raise
+        return tr, pr
+
+    conn._loop.create_connection = create_connection
+
+    req = ClientRequest("GET", URL("http://mocked.host"), loop=loop)
+    with closing(await conn.connect(req, [], ClientTimeout())) as connection:
+        assert connection.protocol is pr
+
+    assert ips_tried == ["::1", "127.0.0.1"]
+    await asyncio.sleep(0)
+    assert blackholed.cancelled()
+    await conn.close()
+
+
+async def test_tcp_connector_happy_eyeballs_next_on_failure(loop: Any) -> None:
+    # a failed attempt starts the next one without waiting for the delay
+    conn = aiohttp.TCPConnector(happy_eyeballs_delay=100)
+    hosts = _make_hosts(
+        ("::1", socket.AF_INET6),
+        ("127.0.0.1", socket.AF_INET),
+    )
+    conn._resolve_host = make_mocked_coro(hosts)
+    tr, pr = mock.Mock(), mock.Mock()
+    ips_tried = []
+
+    async def create_connection(*args, **kwargs):
+        ips_tried.append(args[1])
+        if args[1] == "::1":
+            raise OSError
+        return tr, pr
+
+    conn._loop.create_connection = create_connection
+
+    req = ClientRequest("GET", URL("http://mocked.host"), loop=loop)
+    with closing(await conn.connect(req, [], ClientTimeout())) as connection:
+        assert connection.protocol is pr
+
+    assert ips_tried == ["::1", "127.0.0.1"]
+    await conn.close()
+
+
+async def test_tcp_connector_happy_eyeballs_all_failed(loop: Any) -> None:
+    conn = aiohttp.TCPConnector(happy_eyeballs_delay=0.01)
+    hosts = _make_hosts(
+        ("::1", socket.AF_INET6),
+        ("127.0.0.1", socket.AF_INET),
+    )
+    conn._resolve_host = make_mocked_coro(hosts)
+
+    async def create_connection(*args, **kwargs):
+        raise OSError
+
+    conn._loop.create_connection = create_connection
+
+    req = ClientRequest("GET", URL("http://mocked.host"), loop=loop)
+    with pytest.raises(aiohttp.ClientConnectorError):
+        await conn.connect(req, [], ClientTimeout())
+    await conn.close()
+
+
 async def test_tcp_connector_resolve_host(loop: Any) -> None:
     conn = aiohttp.TCPConnector(use_dns_cache=True)
 
@@ -845,6 +1054,135 @@ async def test_tcp_connector_cancel_dns_error_captured(
         assert exception_handler_called is False
 
 
+async def test_tcp_connector_dns_stale_while_revalidate(
+    loop: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    conn = aiohttp.TCPConnector(ttl_dns_cache=10, ttl_dns_stale=100)
+    conn._resolver = mock.Mock()
+    conn._resolver.resolve = mock.AsyncMock(side_effect=[["127.0.0.1"], ["127.0.0.2"]])
+    trace = mock.Mock()
+    trace.send_dns_cache_hit = mock.AsyncMock()
+    trace.send_dns_cache_miss = mock.AsyncMock()
+    trace.send_dns_resolvehost_start = mock.AsyncMock()
+    trace.send_dns_resolvehost_end = mock.AsyncMock()
+
+    monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 1)
+    assert await conn._resolve_host("localhost", 8080) == ["127.0.0.1"]
+
+    monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 20)
+    assert await conn._resolve_host("localhost", 8080, [trace]) == ["127.0.0.1"]
+    trace.send_dns_cache_hit.assert_called_once_with("localhost", stale=True)
+    # a single refresh runs in the background
+    assert await conn._resolve_host("localhost", 8080) == ["127.0.0.1"]
+    assert len(conn._dns_refresh_tasks) == 1
+    await asyncio.gather(*conn._dns_refresh_tasks.values())
+
+    assert await conn._resolve_host("localhost", 8080) == ["127.0.0.2"]
+    assert conn._resolver.resolve.call_count == 2
+    await conn.close()
+
+
+async def test_tcp_connector_dns_stale_expired(
+    loop: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    conn = aiohttp.TCPConnector(ttl_dns_cache=10, ttl_dns_stale=100)
+    conn._resolver = mock.Mock()
+    conn._resolver.resolve = mock.AsyncMock(side_effect=[["127.0.0.1"], ["127.0.0.2"]])
+
+    monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 1)
+    assert await conn._resolve_host("localhost", 8080) == ["127.0.0.1"]
+
+    monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 200)
+    assert await conn._resolve_host("localhost", 8080) == ["127.0.0.2"]
+    assert not conn._dns_refresh_tasks
+    await conn.close()
+
+
+async def test_tcp_connector_dns_stale_refresh_failed(
+    loop: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    conn = aiohttp.TCPConnector(
+        ttl_dns_cache=10, ttl_dns_stale=100, ttl_dns_negative=30
+    )
+    conn._resolver = mock.Mock()
+    conn._resolver.resolve = mock.AsyncMock(
+        side_effect=[["127.0.0.1"], socket.gaierror(-2, "Name or service not known")]
+    )
+
+    monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 1)
+    await conn._resolve_host("localhost", 8080)
+    monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 20)
+    await conn._resolve_host("localhost", 8080)
+    await asyncio.gather(*conn._dns_refresh_tasks.values())
+
+    # the stale addresses are served without retrying
+    # until the failure expires
+    assert await conn._resolve_host("localhost", 8080) == ["127.0.0.1"]
+    assert not conn._dns_refresh_tasks
+    assert conn._resolver.resolve.call_count == 2
+    await conn.close()
+
+
+async def test_tcp_connector_dns_negative_cache(
+    loop: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    conn = aiohttp.TCPConnector(ttl_dns_negative=10)
+    error = socket.gaierror(-2, "Name or service not known")
+    conn._resolver = mock.Mock()
+    conn._resolver.resolve = mock.AsyncMock(side_effect=[error, ["127.0.0.1"]])
+    trace = mock.Mock()
+    trace.send_dns_cache_hit = mock.AsyncMock()
+
+    monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 1)
+    with pytest.raises(socket.gaierror):
+        await conn._resolve_host("localhost", 8080)
+    with pytest.raises(socket.gaierror) as ctx:
+        await conn._resolve_host("localhost", 8080, [trace])
+    assert ctx.value.args == error.args
+    trace.send_dns_cache_hit.assert_called_once_with("localhost")
+    assert conn._resolver.resolve.call_count == 1
+
+    monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 20)
+    assert await conn._resolve_host("localhost", 8080) == ["127.0.0.1"]
+    await conn.close()
+
+
+async def test_tcp_connector_dns_negative_cache_traceback(
+    loop: Any,
+) -> None:
+    conn = aiohttp.TCPConnector(ttl_dns_negative=10)
+    error = socket.gaierror(-2, "Name or service not known")
+    conn._resolver = mock.Mock()
+    conn._resolver.resolve = mock.AsyncMock(side_effect=error)
+
+    def traceback_length(exc: BaseException) -> int:
+        tb, length = exc.__traceback__, 0
+        while tb is not None:
+            tb, length = tb.tb_next, length + 1
+        return length
+
+    lengths = []
+    for _ in range(3):
+        with pytest.raises(socket.gaierror) as ctx:
+            await conn._resolve_host("localhost", 8080)
+        lengths.append(traceback_length(ctx.value))
+    assert lengths[1] == lengths[2]
+    assert conn._resolver.resolve.call_count == 1
+    await conn.close()
+
+
+async def test_tcp_connector_dns_no_negative_cache(loop: Any) -> None:
+    conn = aiohttp.TCPConnector()
+    error = socket.gaierror(-2, "Name or service not known")
+    conn._resolver = mock.Mock()
+    conn._resolver.resolve = mock.AsyncMock(side_effect=[error, ["127.0.0.1"]])
+
+    with pytest.raises(socket.gaierror):
+        await conn._resolve_host("localhost", 8080)
+    assert await conn._resolve_host("localhost", 8080) == ["127.0.0.1"]
+    await conn.close()
+
+
 async def test_tcp_connector_dns_tracing(loop: Any, dns_response: Any) -> None:
     session = mock.Mock()
     trace_config_ctx = mock.Mock()
@@ -989,7 +1327,6 @@ async def test_get_pop_empty_conns(loop: Any) -> None:
     # see issue #473
     conn = aiohttp.BaseConnector()
     key = ("127.0.0.1", 80, False)
-    conn._conns[key] = []
     proto = conn._get(key)
     assert proto is None
     assert not conn._conns
@@ -1012,12 +1349,12 @@ async def test_release_close_do_not_delete_existing_connections(
     proto1 = create_mocked_conn(loop)
 
     conn = aiohttp.BaseConnector()
-    conn._conns[key] = [(proto1, 1)]
+    conn._conns.add(key, proto1, 1)
 
     proto = create_mocked_conn(loop, should_close=True)
     conn._acquired.add(proto)
     conn._release(key, proto)
-    assert conn._conns[key] == [(proto1, 1)]
+    assert list(conn._conns[key]) == [(proto1, 1)]
     assert proto.close.called
     await conn.close()
 
@@ -1052,7 +1389,7 @@ async def test_connect(loop: Any, key: Any) -> None:
     req = ClientRequest("GET", URL("http://localhost:80"), loop=loop)
 
     conn = aiohttp.BaseConnector()
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     conn._create_connection = create_mocked_conn(loop)
     conn._create_connection.return_value = loop.create_future()
     conn._create_connection.return_value.set_result(proto)
@@ -1131,52 +1468,57 @@ async def test_ctor_cleanup() -> None:
 
 
 async def test_cleanup(key: Any) -> None:
-    testset = {
-        key: [(mock.Mock(), 10), (mock.Mock(), 300)],
-    }
-    testset[key][0][0].is_connected.return_value = True
-    testset[key][1][0].is_connected.return_value = False
+    proto1 = mock.Mock()
+    proto2 = mock.Mock()
+    proto1.is_connected.return_value = True
+    proto2.is_connected.return_value = False
 
-    loop = mock.Mock()
-    loop.time.return_value = 300
     conn = aiohttp.BaseConnector()
-    conn._conns = testset
+    conn._loop = mock.Mock()
+    conn._loop.time.return_value = 300
+    conn._conns.add(key, proto1, 10)
+    conn._conns.add(key, proto2, 300)
     existing_handle = conn._cleanup_handle = mock.Mock()
 
     conn._cleanup()
     assert existing_handle.cancel.called
-    assert conn._conns == {}
-    assert conn._cleanup_handle is None
+    # only expired connections are touched,
+    # the disconnected one is dropped on acquiring
+    assert proto1.close.called
+    assert not proto2.close.called
+    assert list(conn._conns[key]) == [(proto2, 300)]
+    assert conn._get(key) is None
+    assert proto2.close.called
+    assert not conn._conns
 
 
 async def test_cleanup_close_ssl_transport(loop: Any, ssl_key: Any) -> None:
     proto = create_mocked_conn(loop)
     transport = proto.transport
-    testset = {ssl_key: [(proto, 10)]}
 
     loop = mock.Mock()
     loop.time.return_value = asyncio.get_event_loop().time() + 300
     conn = aiohttp.BaseConnector(enable_cleanup_closed=True)
     conn._loop = loop
-    conn._conns = testset
+    conn._conns.add(ssl_key, proto, 10)
     existing_handle = conn._cleanup_handle = mock.Mock()
 
     conn._cleanup()
     assert existing_handle.cancel.called
-    assert conn._conns == {}
+    assert not conn._conns
     assert conn._cleanup_closed_transports == [transport]
 
 
 async def test_cleanup2(loop: Any) -> None:
-    testset = {1: [(create_mocked_conn(), 300)]}
-    testset[1][0][0].is_connected.return_value = True
+    proto = create_mocked_conn()
+    proto.is_connected.return_value = True
 
     conn = aiohttp.BaseConnector(keepalive_timeout=10)
     conn._loop = mock.Mock()
     conn._loop.time.return_value = 300
-    conn._conns = testset
+    conn._conns.add(1, proto, 300)
     conn._cleanup()
-    assert conn._conns == testset
+    assert list(conn._conns[1]) == [(proto, 300)]
 
     assert conn._cleanup_handle is not None
     conn._loop.call_at.assert_called_with(310, mock.ANY, mock.ANY)
@@ -1184,24 +1526,97 @@ async def test_cleanup2(loop: Any) -> None:
 
 
 async def test_cleanup3(loop: Any, key: Any) -> None:
-    testset = {
-        key: [(create_mocked_conn(loop), 290.1), (create_mocked_conn(loop), 305.1)]
-    }
-    testset[key][0][0].is_connected.return_value = True
+    proto1 = create_mocked_conn(loop)
+    proto2 = create_mocked_conn(loop)
+    proto1.is_connected.return_value = True
 
     conn = aiohttp.BaseConnector(keepalive_timeout=10)
     conn._loop = mock.Mock()
     conn._loop.time.return_value = 308.5
-    conn._conns = testset
+    conn._conns.add(key, proto1, 290.1)
+    conn._conns.add(key, proto2, 305.1)
 
     conn._cleanup()
-    assert conn._conns == {key: [testset[key][1]]}
+    assert list(conn._conns[key]) == [(proto2, 305.1)]
 
     assert conn._cleanup_handle is not None
     conn._loop.call_at.assert_called_with(319, mock.ANY, mock.ANY)
     await conn.close()
 
 
+async def test_limit_idle_property(loop: Any) -> None:
+    conn = aiohttp.BaseConnector(limit_idle=15)
+    assert 15 == conn.limit_idle
+    await conn.close()
+
+
+async def test_limit_idle_evicts_least_recently_used(loop: Any) -> None:
+    key1 = ConnectionKey("localhost", 80, False, True, None, None, None)
+    key2 = ConnectionKey("otherhost", 443, True, True, None, None, None)
+    proto1 = create_mocked_conn(should_close=False)
+    proto2 = create_mocked_conn(should_close=False)
+    proto3 = create_mocked_conn(should_close=False)
+    for proto in (proto1, proto2, proto3):
+        proto.is_connected.return_value = True
+
+    conn = aiohttp.BaseConnector(limit_idle=2, enable_cleanup_closed=True)
+    for key, proto in ((key2, proto1), (key1, proto2), (key2, proto3)):
+        conn._acquired.add(proto)
+        conn._acquired_per_host[key].add(proto)
+        conn._release(key, proto)
+
+    assert proto1.close.called
+    assert not proto2.close.called
+    assert not proto3.close.called
+    assert conn._cleanup_closed_transports == [proto1.transport]
+    assert conn._get(key2) is proto3
+    assert conn._get(key1) is proto2
+    assert not conn._conns
+    await conn.close()
+
+
+def test_idle_connections_pop_newest() -> None:
+    conns = _IdleConnections()
+    proto1 = mock.Mock()
+    proto2 = mock.Mock()
+    assert conns.add(1, proto1, 10) == ()
+    assert conns.add(1, proto2, 20) == ()
+    assert 1 in conns
+    assert len(conns) == 1
+    assert conns.pop(1) == (proto2, 20)
+    assert conns.pop(1) == (proto1, 10)
+    assert conns.pop(1) is None
+    assert 1 not in conns
+
+
+def test_idle_connections_expire() -> None:
+    conns = _IdleConnections()
+    protos = [mock.Mock() for i in range(4)]
+    conns.add(1, protos[0], 10)
+    conns.add(2, protos[1], 15)
+    conns.add(1, protos[2], 20)
+    conns.add(2, protos[3], 25)
+    # taken connections are not expired later
+    assert conns.pop(2) == (protos[3], 25)
+    assert conns.pop(2) == (protos[1], 15)
+
+    assert conns.expire(10) == []
+    assert conns.expire(21) == [(1, protos[0]), (1, protos[2])]
+    assert not conns
+    assert conns.expire(100) == []
+
+
+def test_idle_connections_compact() -> None:
+    conns = _IdleConnections()
+    proto = mock.Mock()
+    for i in range(100):
+        conns.add(1, proto, i)
+        assert conns.pop(1) == (proto, i)
+    conns.add(1, proto, 100)
+    assert len(conns._heap) < 20
+    assert conns.expire(101) == [(1, proto)]
+
+
 async def test_cleanup_closed(loop: Any, mocker: Any) -> None:
     if not hasattr(loop, "__dict__"):
         pytest.skip("can not override loop attributes")
@@ -1352,7 +1767,7 @@ async def test_close_twice(loop: Any) -> None:
     proto = create_mocked_conn(loop)
 
     conn = aiohttp.BaseConnector()
-    conn._conns[1] = [(proto, object())]
+    conn._conns.add(1, proto, object())
     await conn.close()
 
     assert not conn._conns
@@ -1405,7 +1820,7 @@ async def test_connect_with_limit(loop: Any, key: Any) -> None:
     )
 
     conn = aiohttp.BaseConnector(limit=1)
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     conn._create_connection = mock.Mock()
     conn._create_connection.return_value = loop.create_future()
     conn._create_connection.return_value.set_result(proto)
@@ -1461,7 +1876,7 @@ async def test_connect_queued_operation_tracing(loop: Any, key: Any) -> None:
     )
 
     conn = aiohttp.BaseConnector(limit=1)
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     conn._create_connection = mock.Mock()
     conn._create_connection.return_value = loop.create_future()
     conn._create_connection.return_value.set_result(proto)
@@ -1471,11 +1886,12 @@ async def test_connect_queued_operation_tracing(loop: Any, key: Any) -> None:
     async def f():
         connection2 = await conn.connect(req, traces, ClientTimeout())
         on_connection_queued_start.assert_called_with(
-            session, trace_config_ctx, aiohttp.TraceConnectionQueuedStartParams()
-        )
-        on_connection_queued_end.assert_called_with(
-            session, trace_config_ctx, aiohttp.TraceConnectionQueuedEndParams()
+            session, trace_config_ctx, aiohttp.TraceConnectionQueuedStartParams(1)
         )
+        on_connection_queued_end.assert_called_with(session, trace_config_ctx, mock.ANY)
+        params = on_connection_queued_end.call_args[0][2]
+        assert isinstance(params, aiohttp.TraceConnectionQueuedEndParams)
+        assert params.wait_time > 0
         connection2.release()
 
     task = asyncio.ensure_future(f())
@@ -1505,7 +1921,7 @@ async def test_connect_reuseconn_tracing(loop: Any, key: Any) -> None:
     )
 
     conn = aiohttp.BaseConnector(limit=1)
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     conn2 = await conn.connect(req, traces, ClientTimeout())
     conn2.release()
 
@@ -1522,7 +1938,7 @@ async def test_connect_with_limit_and_limit_per_host(loop: Any, key: Any) -> Non
     req = ClientRequest("GET", URL("http://localhost:80"), loop=loop)
 
     conn = aiohttp.BaseConnector(limit=1000, limit_per_host=1)
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     conn._create_connection = mock.Mock()
     conn._create_connection.return_value = loop.create_future()
     conn._create_connection.return_value.set_result(proto)
@@ -1556,7 +1972,7 @@ async def test_connect_with_no_limit_and_limit_per_host(loop: Any, key: Any) ->
     req = ClientRequest("GET", URL("http://localhost1:80"), loop=loop)
 
     conn = aiohttp.BaseConnector(limit=0, limit_per_host=1)
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     conn._create_connection = mock.Mock()
     conn._create_connection.return_value = loop.create_future()
     conn._create_connection.return_value.set_result(proto)
@@ -1588,7 +2004,7 @@ async def test_connect_with_no_limits(loop: Any, key: Any) -> None:
     req = ClientRequest("GET", URL("http://localhost:80"), loop=loop)
 
     conn = aiohttp.BaseConnector(limit=0, limit_per_host=0)
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     conn._create_connection = mock.Mock()
     conn._create_connection.return_value = loop.create_future()
     conn._create_connection.return_value.set_result(proto)
@@ -1621,7 +2037,7 @@ async def test_connect_with_limit_cancelled(loop: Any) -> None:
 
     conn = aiohttp.BaseConnector(limit=1)
     key = ("host", 80, False)
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     conn._create_connection = mock.Mock()
     conn._create_connection.return_value = loop.create_future()
     conn._create_connection.return_value.set_result(proto)
@@ -1729,11 +2145,12 @@ async def test_connect_waiters_cleanup(loop: Any) -> None:
     t = loop.create_task(conn.connect(req, None, ClientTimeout()))
 
     await asyncio.sleep(0)
-    assert conn._waiters.keys()
+    assert req.connection_key in conn._waiters
 
     t.cancel()
     await asyncio.sleep(0)
-    assert not conn._waiters.keys()
+    assert req.connection_key not in conn._waiters
+    assert not conn._waiters
 
 
 async def test_connect_waiters_cleanup_key_error(loop: Any) -> None:
@@ -1748,7 +2165,7 @@ async def test_connect_waiters_cleanup_key_error(loop: Any) -> None:
     t = loop.create_task(conn.connect(req, None, ClientTimeout()))
 
     await asyncio.sleep(0)
-    assert conn._waiters.keys()
+    assert req.connection_key in conn._waiters
 
     # we delete the entry explicitly before the
     # canceled connection grabs the loop again, we
@@ -1756,7 +2173,7 @@ async def test_connect_waiters_cleanup_key_error(loop: Any) -> None:
     conn._waiters.clear()
     t.cancel()
     await asyncio.sleep(0)
-    assert not conn._waiters.keys() == []
+    assert not conn._waiters
 
 
 async def test_close_with_acquired_connection(loop: Any) -> None:
@@ -1767,7 +2184,7 @@ async def test_close_with_acquired_connection(loop: Any) -> None:
 
     conn = aiohttp.BaseConnector(limit=1)
     key = ("host", 80, False)
-    conn._conns[key] = [(proto, loop.time())]
+    conn._conns.add(key, proto, loop.time())
     conn._create_connection = mock.Mock()
     conn._create_connection.return_value = loop.create_future()
     conn._create_connection.return_value.set_result(proto)
@@ -2154,6 +2571,98 @@ async def test_tcp_connector_uses_provided_local_addr(aiohttp_server: Any) -> No
     await conn.close()
 
 
+async def test_tcp_connector_prewarm(aiohttp_server: Any) -> None:
+    async def handler(request):
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    srv = await aiohttp_server(app)
+
+    conn = aiohttp.TCPConnector()
+    url = srv.make_url("/")
+    await conn.prewarm([url, str(srv.make_url("/other"))], per_host=2)
+
+    assert len(conn._conns) == 1
+    idle = list(next(iter(conn._conns.values())))
+    assert len(idle) == 2
+
+    conn._create_connection = mock.Mock(side_effect=AssertionError)
+    async with aiohttp.ClientSession(connector=conn, connector_owner=False) as sess:
+        async with sess.get(url) as resp:
+            assert resp.status == 200
+
+    # the request has reused a prewarmed connection
+    pooled = [proto for proto, t in next(iter(conn._conns.values()))]
+    assert pooled == [proto for proto, t in idle]
+
+    # the pool is already warm
+    await conn.prewarm([url], per_host=2)
+    assert len(next(iter(conn._conns.values()))) == 2
+    await conn.close()
+
+
+async def test_tcp_connector_prewarm_invalid_per_host(loop: Any) -> None:
+    conn = aiohttp.TCPConnector()
+    with pytest.raises(ValueError):
+        await conn.prewarm(["http://localhost"], per_host=0)
+    await conn.close()
+
+
+async def test_tcp_connector_prewarm_error(loop: Any) -> None:
+    proto = create_mocked_conn(loop)
+    conn = aiohttp.TCPConnector()
+    conn._create_connection = mock.AsyncMock(side_effect=[proto, OSError()])
+
+    with pytest.raises(OSError):
+        await conn.prewarm(["http://localhost"], per_host=2)
+
+    assert list(next(iter(conn._conns.values())))[0][0] is proto
+    await conn.close()
+
+
+async def test_tcp_connector_prewarm_keep_idle(loop: Any) -> None:
+    protos = [create_mocked_conn(loop) for i in range(4)]
+    conn = aiohttp.TCPConnector()
+    conn._create_connection = mock.AsyncMock(side_effect=protos)
+
+    await conn.prewarm(["http://localhost"], per_host=2, keep_idle=True)
+    (key,) = conn._keep_idle
+
+    assert conn._conns.pop(key) == (protos[1], mock.ANY)
+    assert conn._conns.pop(key) == (protos[0], mock.ANY)
+    conn._cleanup()
+    await conn._prewarm_tasks[key]
+
+    assert [proto for proto, t in conn._conns[key]] == protos[2:]
+    assert not conn._prewarm_tasks
+    await conn.close()
+
+
+async def test_tcp_connector_prewarm_keep_idle_error(loop: Any) -> None:
+    protos = [create_mocked_conn(loop) for i in range(2)]
+    conn = aiohttp.TCPConnector()
+    conn._create_connection = mock.AsyncMock(
+        side_effect=[protos[0], OSError(), protos[1]]
+    )
+
+    await conn.prewarm(["http://localhost"], keep_idle=True)
+    (key,) = conn._keep_idle
+    conn._conns.pop(key)
+    conn._cleanup()
+    # the failure is not propagated
+    await conn._prewarm_tasks[key]
+
+    assert key not in conn._conns
+    # the cleanup stays armed with an empty pool to retry the refill
+    assert conn._cleanup_handle is not None
+    conn._cleanup_handle._run()
+    await conn._prewarm_tasks[key]
+
+    assert [proto for proto, t in conn._conns[key]] == protos[1:]
+    await conn.close()
+
+
 async def test_unix_connector(unix_server: Any, unix_sockname: Any) -> None:
     async def handler(request):
         return web.Response()
@@ -2259,6 +2768,61 @@ class TestDNSCacheTable:
         monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 1.00001)
         assert dns_cache_table.expired("localhost")
 
+    def test_stale_ttl(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        dns_cache_table = _DNSCacheTable(ttl=1, stale_ttl=2)
+        monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 1)
+        dns_cache_table.add("localhost", ["127.0.0.1"])
+        monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 3)
+        assert dns_cache_table.expired("localhost")
+        assert dns_cache_table.stale("localhost")
+        monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 4.5)
+        assert not dns_cache_table.stale("localhost")
+
+    def test_failure(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        dns_cache_table = _DNSCacheTable(negative_ttl=1)
+        error = socket.gaierror(-2, "Name or service not known")
+        monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 1)
+        dns_cache_table.add_failure("localhost", error)
+        monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 1.5)
+        failure = dns_cache_table.failure("localhost")
+        assert isinstance(failure, socket.gaierror)
+        assert failure is not error
+        assert failure.errno == -2
+        assert failure.args == error.args
+        monkeypatch.setattr("aiohttp.connector.monotonic", lambda: 3)
+        assert dns_cache_table.failure("localhost") is None
+
+    def test_failure_custom_init(self) -> None:
+        class HostError(OSError):
+            def __init__(self, host: str, errno: int, strerror: str) -> None:
+                super().__init__(errno, strerror)
+                self.host = host
+
+        dns_cache_table = _DNSCacheTable(negative_ttl=10)
+        try:
+            raise HostError("localhost", -2, "Name or service not known")
+        except HostError as exc:
+            error = exc
+        dns_cache_table.add_failure("localhost", error)
+        for _ in range(2):
+            failure = dns_cache_table.failure("localhost")
+            assert isinstance(failure, HostError)
+            assert failure is not error
+            assert failure.host == "localhost"
+            assert failure.errno == -2
+            assert failure.strerror == "Name or service not known"
+            assert failure.__traceback__ is None
+
+    def test_failure_removed_on_add(self) -> None:
+        dns_cache_table = _DNSCacheTable(negative_ttl=10)
+        dns_cache_table.add_failure("localhost", OSError())
+        dns_cache_table.add("localhost", ["127.0.0.1"])
+        assert dns_cache_table.failure("localhost") is None
+
+    def test_failure_not_cached(self, dns_cache_table: Any) -> None:
+        dns_cache_table.add_failure("localhost", OSError())
+        assert dns_cache_table.failure("localhost") is None
+
     def test_next_addrs(self, dns_cache_table: Any) -> None:
         dns_cache_table.add("foo", ["127.0.0.1", "127.0.0.2", "127.0.0.3"])
 
@@ -2324,7 +2888,7 @@ async def test_connector_does_not_remove_needed_waiters(loop: Any, key: Any) ->
 
     connector = aiohttp.BaseConnector()
     connector._available_connections = mock.Mock(return_value=0)
-    connector._conns[key] = [(proto, loop.time())]
+    connector._conns.add(key, proto, loop.time())
     connector._create_connection = create_mocked_conn(loop)
     connector._create_connection.return_value = loop.create_future()
     connector._create_connection.return_value.set_result(proto)
@@ -2335,7 +2899,7 @@ async def test_connector_does_not_remove_needed_waiters(loop: Any, key: Any) ->
         connection = await connector.connect(req, [], ClientTimeout())
         try:
             assert connection_key in connector._waiters
-            assert dummy_waiter in connector._waiters[connection_key]
+            assert len(connector._waiters) == 1
         finally:
             connection.close()
 
@@ -2344,9 +2908,8 @@ async def test_connector_does_not_remove_needed_waiters(loop: Any, key: Any) ->
         # Skip one event loop run cycle in such a case.
         if connection_key not in connector._waiters:
             await asyncio.sleep(0)
-        connector._waiters[connection_key].popleft().set_result(None)
-        del connector._waiters[connection_key]
-        connector._waiters[connection_key].append(dummy_waiter)
+        connector._waiters.release(lambda key: 1)
+        connector._waiters.add(connection_key, dummy_waiter)
 
     await asyncio.gather(
         await_connection_and_check_waiters(),
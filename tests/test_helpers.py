@@ -1071,3 +1071,16 @@ def test_read_basicauth_from_empty_netrc():
         LookupError, match="No entry for example.com found in the `.netrc` file."
     ):
         helpers.basicauth_from_netrc(netrc_obj, "example.com")
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    (
+        ("", {}),
+        ("gzip, deflate", {"gzip": 1.0, "deflate": 1.0}),
+        ("GZIP;q=0.5, zstd ; q=0", {"gzip": 0.5, "zstd": 0.0}),
+        ("br;q=bad, *;q=0.1", {"br": 0.0, "*": 0.1}),
+    ),
+)
+def test_parse_accept_encoding(value, expected) -> None:
+    assert helpers.parse_accept_encoding(value) == expected
@@ -3,6 +3,7 @@
 
 import asyncio
 import re
+import zlib
 from typing import Any, List
 from unittest import mock
 from urllib.parse import quote
@@ -19,6 +20,7 @@ from aiohttp.http_parser import (
     HttpPayloadParser,
     HttpRequestParserPy,
     HttpResponseParserPy,
+    RawRequestMessage,
 )
 
 try:
@@ -29,6 +31,11 @@ try:
 except ImportError:
     brotli = None
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 
 REQUEST_PARSERS: Any = [HttpRequestParserPy]
 RESPONSE_PARSERS: Any = [HttpResponseParserPy]
@@ -229,6 +236,60 @@ def test_bad_chunked_py(loop: Any, protocol: Any) -> None:
     assert isinstance(messages[0][1].exception(), http_exceptions.TransferEncodingError)
 
 
+def test_lazy_headers_py(loop: Any, protocol: Any) -> None:
+    parser = HttpRequestParserPy(protocol, loop, 2**16, lazy_headers=True)
+    text = (
+        b"POST /test HTTP/1.1\r\n"
+        b"Host: example.com\r\n"
+        b"Content-Length: 4\r\n"
+        b"X-Custom: value\r\n\r\n"
+        b"data"
+    )
+    messages, upgrade, tail = parser.feed_data(text)
+    msg, payload = messages[0]
+
+    assert "_headers" not in msg.__dict__
+    assert payload.is_eof()
+    assert msg.raw_headers == (
+        (b"Host", b"example.com"),
+        (b"Content-Length", b"4"),
+        (b"X-Custom", b"value"),
+    )
+    assert list(msg.headers.items()) == [
+        ("Host", "example.com"),
+        ("Content-Length", "4"),
+        ("X-Custom", "value"),
+    ]
+    assert msg.headers is msg.headers
+
+
+def test_lazy_headers_replace_py(loop: Any, protocol: Any) -> None:
+    parser = HttpRequestParserPy(protocol, loop, 2**16, lazy_headers=True)
+    text = b"GET /test HTTP/1.1\r\nHost: example.com\r\nX-Custom: value\r\n\r\n"
+    messages, upgrade, tail = parser.feed_data(text)
+    msg = messages[0][0]
+
+    new_msg = msg._replace(method="POST")
+    assert type(new_msg) is RawRequestMessage
+    assert new_msg.method == "POST"
+    assert new_msg.headers["X-Custom"] == "value"
+
+
+@pytest.mark.parametrize(
+    "hdr",
+    (
+        b"Content-Length: 1\r\ncontent-length: 1",
+        b"Content-Length: 1\r\nTransfer-Encoding: chunked",
+        b"Transfer-Encoding: gzip",
+    ),
+)
+def test_lazy_headers_bad_framing_py(loop: Any, protocol: Any, hdr: bytes) -> None:
+    parser = HttpRequestParserPy(protocol, loop, 2**16, lazy_headers=True)
+    text = b"POST / HTTP/1.1\r\n" + hdr + b"\r\n\r\n"
+    with pytest.raises(http_exceptions.BadHttpMessage):
+        parser.feed_data(text)
+
+
 @pytest.mark.skipif(
     "HttpRequestParserC" not in dir(aiohttp.http_parser),
     reason="C based HTTP parser not available",
@@ -372,6 +433,51 @@ def test_parse_headers_multi(parser: Any) -> None:
     assert msg.compression is None
 
 
+def test_parse_known_headers_spelling(parser: Any) -> None:
+    text = (
+        b"GET /test HTTP/1.1\r\n"
+        b"host: example.com\r\n"
+        b"Content-Type: text/plain\r\n"
+        b"X-Custom: value\r\n"
+        b"USER-AGENT: test\r\n\r\n"
+    )
+
+    messages, upgrade, tail = parser.feed_data(text)
+    msg = messages[0][0]
+
+    assert list(msg.headers.items()) == [
+        ("host", "example.com"),
+        ("Content-Type", "text/plain"),
+        ("X-Custom", "value"),
+        ("USER-AGENT", "test"),
+    ]
+    assert msg.headers["Host"] == "example.com"
+
+
+def test_parse_pipelined_messages(parser: Any) -> None:
+    text = (
+        b"GET /first HTTP/1.1\r\nHost: a\r\n\r\n"
+        b"GET /second HTTP/1.0\r\nHost: b\r\n\r\n"
+        b"GET /third HTTP/1.1\r\nHo"
+    )
+
+    messages, upgrade, tail = parser.feed_data(text)
+    assert [m.path for m, _ in messages] == ["/first", "/second"]
+    assert [m.version for m, _ in messages] == [(1, 1), (1, 0)]
+
+    messages, upgrade, tail = parser.feed_data(b"st: c\r\n\r\n")
+    assert [m.path for m, _ in messages] == ["/third"]
+    assert messages[0][0].headers["Host"] == "c"
+
+
+def test_parse_uncommon_method_and_version(parser: Any) -> None:
+    text = b"PROPFIND /test HTTP/2.0\r\n\r\n"
+    messages, upgrade, tail = parser.feed_data(text)
+    msg = messages[0][0]
+    assert msg.method == "PROPFIND"
+    assert msg.version == (2, 0)
+
+
 def test_conn_default_1_0(parser: Any) -> None:
     text = b"GET /test HTTP/1.0\r\n\r\n"
     messages, upgrade, tail = parser.feed_data(text)
@@ -501,6 +607,14 @@ def test_compression_brotli(parser: Any) -> None:
     assert msg.compression == "br"
 
 
+@pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")
+def test_compression_zstd(parser: Any) -> None:
+    text = b"GET /test HTTP/1.1\r\n" b"content-encoding: zstd\r\n\r\n"
+    messages, upgrade, tail = parser.feed_data(text)
+    msg = messages[0][0]
+    assert msg.compression == "zstd"
+
+
 def test_compression_unknown(parser: Any) -> None:
     text = b"GET /test HTTP/1.1\r\n" b"content-encoding: compress\r\n\r\n"
     messages, upgrade, tail = parser.feed_data(text)
@@ -1343,6 +1457,33 @@ class TestParsePayload:
         assert b"brotli data" == b"".join(d for d, _ in out._buffer)
         assert out.is_eof()
 
+    @pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")
+    async def test_http_payload_zstd(self, stream: Any) -> None:
+        compressed = zstandard.ZstdCompressor().compress(b"zstd data")
+        out = aiohttp.FlowControlDataQueue(
+            stream, 2**16, loop=asyncio.get_event_loop()
+        )
+        p = HttpPayloadParser(out, length=len(compressed), compression="zstd")
+        p.feed_data(compressed)
+        assert b"zstd data" == b"".join(d for d, _ in out._buffer)
+        assert out.is_eof()
+
+    @pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")
+    async def test_http_payload_zstd_dict(self, stream: Any) -> None:
+        dict_data = b"some shared dictionary content " * 8
+        compressed = zstandard.ZstdCompressor(
+            dict_data=zstandard.ZstdCompressionDict(dict_data)
+        ).compress(b"some shared dictionary content")
+        out = aiohttp.FlowControlDataQueue(
+            stream, 2**16, loop=asyncio.get_event_loop()
+        )
+        p = HttpPayloadParser(
+            out, length=len(compressed), compression="zstd", zstd_dict=dict_data
+        )
+        p.feed_data(compressed)
+        assert b"some shared dictionary content" == b"".join(d for d, _ in out._buffer)
+        assert out.is_eof()
+
 
 class TestDeflateBuffer:
     async def test_feed_data(self, stream: Any) -> None:
@@ -1433,3 +1574,123 @@ class TestDeflateBuffer:
         dbuf.feed_eof()
 
         assert buf.at_eof()
+
+    async def test_feed_data_bounded(self, stream: Any) -> None:
+        stream._reading_paused = False
+        loop = asyncio.get_event_loop()
+        buf = streams.StreamReader(stream, 2**10, loop=loop)
+        dbuf = DeflateBuffer(buf, "deflate", max_length=2**10)
+
+        data = b"x" * 2**20
+        compressed = zlib.compress(data)
+        dbuf.feed_data(compressed, len(compressed))
+        dbuf.feed_eof()
+
+        low, high = buf.get_read_buffer_limits()
+        assert high < buf._size <= high + 2**10
+        assert not buf.is_eof()
+        stream.pause_reading.assert_called_once_with()
+
+        assert await buf.read() == data
+        assert buf.is_eof()
+
+    @pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")
+    async def test_feed_data_zstd_bounded(self, stream: Any) -> None:
+        stream._reading_paused = False
+        loop = asyncio.get_event_loop()
+        buf = streams.StreamReader(stream, 2**10, loop=loop)
+        dbuf = DeflateBuffer(buf, "zstd", max_length=2**10)
+
+        data = b"x" * 2**20
+        compressed = zstandard.ZstdCompressor().compress(data)
+        dbuf.feed_data(compressed, len(compressed))
+        dbuf.feed_eof()
+
+        low, high = buf.get_read_buffer_limits()
+        assert high < buf._size <= high + 2**10
+        assert not buf.is_eof()
+        stream.pause_reading.assert_called_once_with()
+
+        assert await buf.read() == data
+        assert buf.is_eof()
+
+    @pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")
+    @pytest.mark.parametrize("split", (False, True))
+    async def test_feed_data_zstd_frames(self, stream: Any, split: bool) -> None:
+        loop = asyncio.get_event_loop()
+        buf = streams.StreamReader(stream, 2**16, loop=loop)
+        dbuf = DeflateBuffer(buf, "zstd")
+
+        compressor = zstandard.ZstdCompressor()
+        frames = [compressor.compress(b"a" * 10), compressor.compress(b"b" * 10)]
+        if split:
+            for frame in frames:
+                dbuf.feed_data(frame, len(frame))
+        else:
+            dbuf.feed_data(b"".join(frames), sum(map(len, frames)))
+        dbuf.feed_eof()
+
+        assert await buf.read() == b"a" * 10 + b"b" * 10
+
+    async def test_feed_data_bounded_err(self, stream: Any) -> None:
+        stream._reading_paused = False
+        loop = asyncio.get_event_loop()
+        buf = streams.StreamReader(stream, 2**10, loop=loop)
+        dbuf = DeflateBuffer(buf, "deflate", max_length=2**10)
+
+        compressed = zlib.compress(b"x" * 2**20)
+        dbuf.feed_data(compressed[:-100], len(compressed) - 100)
+        dbuf.feed_data(b"broken data", 11)
+        dbuf.feed_eof()
+
+        with pytest.raises(http_exceptions.ContentEncodingError):
+            await buf.read()
+
+    async def test_feed_data_executor(self, stream: Any) -> None:
+        stream._reading_paused = False
+        loop = asyncio.get_event_loop()
+        buf = streams.StreamReader(stream, 2**16, loop=loop)
+        dbuf = DeflateBuffer(buf, "deflate", executor_size=1024)
+
+        data = bytes(range(256)) * 2**12
+        compressed = zlib.compress(data)
+        dbuf.feed_data(compressed[:2048], 2048)
+        assert dbuf._job is not None
+        stream.pause_reading.assert_called_once_with()
+
+        dbuf.feed_data(compressed[2048:], len(compressed) - 2048)
+        dbuf.feed_eof()
+        assert not buf.is_eof()
+
+        assert await buf.read() == data
+        assert buf.is_eof()
+        stream.resume_reading.assert_called_with()
+
+    async def test_feed_data_executor_err(self, stream: Any) -> None:
+        stream._reading_paused = False
+        loop = asyncio.get_event_loop()
+        buf = streams.StreamReader(stream, 2**16, loop=loop)
+        dbuf = DeflateBuffer(buf, "deflate", executor_size=1024)
+
+        dbuf.feed_data(b"x" * 2048, 2048)
+        dbuf.feed_eof()
+
+        with pytest.raises(http_exceptions.ContentEncodingError):
+            await buf.read()
+
+    async def test_feed_data_executor_cancelled(self, stream: Any) -> None:
+        stream._reading_paused = False
+        loop = asyncio.get_event_loop()
+        buf = streams.StreamReader(stream, 2**16, loop=loop)
+        dbuf = DeflateBuffer(buf, "deflate", executor_size=1024)
+
+        compressed = zlib.compress(bytes(range(256)) * 2**12)
+        dbuf.feed_data(compressed[:2048], 2048)
+        job = dbuf._job
+        assert job is not None
+        job.cancel()
+        await asyncio.sleep(0)
+
+        stream.resume_reading.assert_called_once_with()
+        with pytest.raises(http_exceptions.ContentEncodingError):
+            await buf.read()
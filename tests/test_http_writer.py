@@ -1,6 +1,8 @@
 # type: ignore
 # Tests for aiohttp/http_writer.py
 import array
+import asyncio
+import zlib
 from typing import Any
 from unittest import mock
 
@@ -23,7 +25,12 @@ def transport(buf: Any):
     def write(chunk):
         buf.extend(chunk)
 
+    def writelines(chunks):
+        for chunk in chunks:
+            buf.extend(chunk)
+
     transport.write.side_effect = write
+    transport.writelines.side_effect = writelines
     transport.is_closing.return_value = False
     return transport
 
@@ -41,15 +48,16 @@ def test_payloadwriter_properties(transport: Any, protocol: Any, loop: Any) -> N
     assert writer.transport == transport
 
 
-async def test_write_payload_eof(transport: Any, protocol: Any, loop: Any) -> None:
-    write = transport.write = mock.Mock()
+async def test_write_payload_eof(
+    buf: Any, transport: Any, protocol: Any, loop: Any
+) -> None:
     msg = http.StreamWriter(protocol, loop)
 
     await msg.write(b"data1")
     await msg.write(b"data2")
     await msg.write_eof()
 
-    content = b"".join([c[1][0] for c in list(write.mock_calls)])
+    content = bytes(buf)
     assert b"data1data2" == content.split(b"\r\n\r\n", 1)[-1]
 
 
@@ -76,38 +84,35 @@ async def test_write_payload_chunked_multiple(
     assert b"5\r\ndata1\r\n5\r\ndata2\r\n0\r\n\r\n" == buf
 
 
-async def test_write_payload_length(protocol: Any, transport: Any, loop: Any) -> None:
-    write = transport.write = mock.Mock()
-
+async def test_write_payload_length(
+    buf: Any, protocol: Any, transport: Any, loop: Any
+) -> None:
     msg = http.StreamWriter(protocol, loop)
     msg.length = 2
     await msg.write(b"d")
     await msg.write(b"ata")
     await msg.write_eof()
 
-    content = b"".join([c[1][0] for c in list(write.mock_calls)])
+    content = bytes(buf)
     assert b"da" == content.split(b"\r\n\r\n", 1)[-1]
 
 
 async def test_write_payload_chunked_filter(
-    protocol: Any, transport: Any, loop: Any
+    buf: Any, protocol: Any, transport: Any, loop: Any
 ) -> None:
-    write = transport.write = mock.Mock()
-
     msg = http.StreamWriter(protocol, loop)
     msg.enable_chunking()
     await msg.write(b"da")
     await msg.write(b"ta")
     await msg.write_eof()
 
-    content = b"".join([c[1][0] for c in list(write.mock_calls)])
+    content = bytes(buf)
     assert content.endswith(b"2\r\nda\r\n2\r\nta\r\n0\r\n\r\n")
 
 
 async def test_write_payload_chunked_filter_mutiple_chunks(
-    protocol: Any, transport: Any, loop: Any
+    buf: Any, protocol: Any, transport: Any, loop: Any
 ) -> None:
-    write = transport.write = mock.Mock()
     msg = http.StreamWriter(protocol, loop)
     msg.enable_chunking()
     await msg.write(b"da")
@@ -116,26 +121,24 @@ async def test_write_payload_chunked_filter_mutiple_chunks(
     await msg.write(b"at")
     await msg.write(b"a2")
     await msg.write_eof()
-    content = b"".join([c[1][0] for c in list(write.mock_calls)])
+    content = bytes(buf)
     assert content.endswith(
         b"2\r\nda\r\n2\r\nta\r\n2\r\n1d\r\n2\r\nat\r\n" b"2\r\na2\r\n0\r\n\r\n"
     )
 
 
 async def test_write_payload_deflate_compression(
-    protocol: Any, transport: Any, loop: Any
+    buf: Any, protocol: Any, transport: Any, loop: Any
 ) -> None:
     COMPRESSED = b"x\x9cKI,I\x04\x00\x04\x00\x01\x9b"
-    write = transport.write = mock.Mock()
     msg = http.StreamWriter(protocol, loop)
     msg.enable_compression("deflate")
     await msg.write(b"data")
     await msg.write_eof()
 
-    chunks = [c[1][0] for c in list(write.mock_calls)]
-    assert all(chunks)
-    content = b"".join(chunks)
-    assert COMPRESSED == content.split(b"\r\n\r\n", 1)[-1]
+    payload = bytes(buf).split(b"\r\n\r\n", 1)[-1]
+    assert COMPRESSED == payload
+    assert zlib.decompress(payload) == b"data"
 
 
 async def test_write_payload_deflate_and_chunked(
@@ -301,3 +304,109 @@ async def test_write_headers_prevents_injection(
     wrong_headers = CIMultiDict({"Content-Length": "256\r\nSet-Cookie: abc=123"})
     with pytest.raises(ValueError):
         await msg.write_headers(status_line, wrong_headers)
+
+
+async def test_write_headers_coalesced_with_body(
+    buf: Any, protocol: Any, transport: Any, loop: Any
+) -> None:
+    msg = http.StreamWriter(protocol, loop)
+    await msg.write_headers("HTTP/1.1 200 OK", CIMultiDict({"X-A": "1"}))
+    assert not buf
+
+    await msg.write(b"data")
+
+    assert not transport.write.called
+    transport.writelines.assert_called_once_with(
+        (b"HTTP/1.1 200 OK\r\nX-A: 1\r\n\r\n", b"data")
+    )
+
+
+async def test_write_headers_sent_on_next_iteration(
+    buf: Any, protocol: Any, transport: Any, loop: Any
+) -> None:
+    msg = http.StreamWriter(protocol, loop)
+    await msg.write_headers("HTTP/1.1 200 OK", CIMultiDict({"X-A": "1"}))
+    assert not buf
+
+    await asyncio.sleep(0)
+    assert b"HTTP/1.1 200 OK\r\nX-A: 1\r\n\r\n" == buf
+
+    await msg.write(b"data")
+    assert b"HTTP/1.1 200 OK\r\nX-A: 1\r\n\r\ndata" == buf
+
+
+async def test_write_headers_sent_on_drain(
+    buf: Any, protocol: Any, transport: Any, loop: Any
+) -> None:
+    msg = http.StreamWriter(protocol, loop)
+    await msg.write_headers("HTTP/1.1 200 OK", CIMultiDict({"X-A": "1"}))
+    await msg.drain()
+    assert b"HTTP/1.1 200 OK\r\nX-A: 1\r\n\r\n" == buf
+
+
+async def test_write_headers_sent_on_transport_access(
+    buf: Any, protocol: Any, transport: Any, loop: Any
+) -> None:
+    msg = http.StreamWriter(protocol, loop)
+    await msg.write_headers("HTTP/1.1 200 OK", CIMultiDict({"X-A": "1"}))
+    msg.transport.write(b"data")
+    assert b"HTTP/1.1 200 OK\r\nX-A: 1\r\n\r\ndata" == buf
+
+
+async def test_write_headers_failure_reported(
+    buf: Any, protocol: Any, transport: Any, loop: Any
+) -> None:
+    msg = http.StreamWriter(protocol, loop)
+    await msg.write_headers("HTTP/1.1 200 OK", CIMultiDict())
+    transport.is_closing.return_value = True
+    await asyncio.sleep(0)
+    transport.is_closing.return_value = False
+
+    with pytest.raises(ConnectionResetError):
+        await msg.write(b"data")
+    with pytest.raises(ConnectionResetError):
+        await msg.write_eof()
+    assert not buf
+
+
+async def test_write_headers_to_closing_transport(
+    protocol: Any, transport: Any, loop: Any
+) -> None:
+    msg = http.StreamWriter(protocol, loop)
+    transport.is_closing.return_value = True
+
+    with pytest.raises(ConnectionResetError):
+        await msg.write_headers("HTTP/1.1 200 OK", CIMultiDict())
+
+
+async def test_write_chunked_uses_writelines(
+    protocol: Any, transport: Any, loop: Any
+) -> None:
+    msg = http.StreamWriter(protocol, loop)
+    msg.enable_chunking()
+    chunk = b"x" * 100
+
+    await msg.write(chunk)
+
+    transport.writelines.assert_called_once_with((b"64\r\n", chunk, b"\r\n"))
+    assert msg.output_size == 106
+
+
+async def test_write_headers_with_template(
+    buf: Any, protocol: Any, transport: Any, loop: Any
+) -> None:
+    msg = http.StreamWriter(protocol, loop)
+    await msg._write_headers(
+        "HTTP/1.1 200 OK", CIMultiDict({"X-A": "1"}), b"X-B: 2\r\n"
+    )
+    await msg.drain()
+    assert b"HTTP/1.1 200 OK\r\nX-A: 1\r\nX-B: 2\r\n\r\n" == buf
+
+
+async def test_write_headers_only_template(
+    buf: Any, protocol: Any, transport: Any, loop: Any
+) -> None:
+    msg = http.StreamWriter(protocol, loop)
+    await msg._write_headers("HTTP/1.1 200 OK", CIMultiDict(), b"X-B: 2\r\n")
+    await msg.drain()
+    assert b"HTTP/1.1 200 OK\r\nX-B: 2\r\n\r\n" == buf
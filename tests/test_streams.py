@@ -575,6 +575,112 @@ class TestStreamReader:
         with pytest.raises(ValueError):
             await stream.readexactly(2)
 
+    async def test_read_into(self) -> None:
+        loop = asyncio.get_event_loop()
+        stream = self._make_one()
+        buf = bytearray(10)
+
+        read_task = loop.create_task(stream.read_into(buf))
+        loop.call_soon(stream.feed_data, b"line1\n")
+
+        assert 6 == await read_task
+        assert b"line1\n" == buf[:6]
+
+    async def test_read_into_several_chunks(self) -> None:
+        stream = self._make_one()
+        stream.feed_data(b"line1\n")
+        stream.feed_data(b"line2\n")
+        stream.feed_data(b"line3\n")
+        buf = bytearray(8)
+
+        assert 8 == await stream.read_into(buf)
+        assert b"line1\nli" == buf
+        assert 8 == await stream.read_into(memoryview(buf))
+        assert b"ne2\nline" == buf
+        assert 2 == await stream.read_into(buf)
+        assert b"3\n" == buf[:2]
+        assert 0 == stream._size
+
+    async def test_read_into_eof(self) -> None:
+        stream = self._make_one()
+        stream.feed_data(b"data")
+        stream.feed_eof()
+        buf = bytearray(10)
+
+        assert 4 == await stream.read_into(buf)
+        assert 0 == await stream.read_into(buf)
+        assert 0 == await stream.read_into(bytearray())
+
+    async def test_read_into_resumes_reading(self) -> None:
+        stream = self._make_one(limit=1)
+        stream.feed_data(b"data")
+        assert stream._protocol.pause_reading.called
+        stream._protocol._reading_paused = True
+
+        assert 4 == await stream.read_into(bytearray(4))
+        assert stream._protocol.resume_reading.called
+
+    async def test_read_into_exception(self) -> None:
+        stream = self._make_one()
+        stream.set_exception(ValueError())
+
+        with pytest.raises(ValueError):
+            await stream.read_into(bytearray(4))
+
+    async def test_readexactly_view_one_chunk(self) -> None:
+        stream = self._make_one()
+        data = b"line1\nline2\n"
+        stream.feed_data(data)
+
+        view = await stream.readexactly_view(6)
+        assert view.obj is data
+        assert b"line1\n" == view
+        view = await stream.readexactly_view(6)
+        assert view.obj is data
+        assert b"line2\n" == view
+        assert not stream._buffer
+
+    async def test_readexactly_view_several_chunks(self) -> None:
+        loop = asyncio.get_event_loop()
+        stream = self._make_one()
+        n = 2 * len(self.DATA)
+        read_task = loop.create_task(stream.readexactly_view(n))
+
+        def cb():
+            stream.feed_data(self.DATA)
+            stream.feed_data(self.DATA)
+            stream.feed_data(self.DATA)
+
+        loop.call_soon(cb)
+
+        assert self.DATA + self.DATA == await read_task
+        stream.feed_eof()
+        assert self.DATA == await stream.read()
+
+    async def test_readexactly_view_zero_or_less(self) -> None:
+        stream = self._make_one()
+        assert b"" == await stream.readexactly_view(0)
+        assert b"" == await stream.readexactly_view(-1)
+
+    async def test_readexactly_view_eof(self) -> None:
+        stream = self._make_one()
+        stream.feed_data(self.DATA)
+        stream.feed_eof()
+        n = 2 * len(self.DATA)
+
+        with pytest.raises(asyncio.IncompleteReadError) as cm:
+            await stream.readexactly_view(n)
+        assert cm.value.partial == self.DATA
+        assert cm.value.expected == n
+
+    async def test_readuntil_several_chunks(self) -> None:
+        stream = self._make_one()
+        for chunk in (b"li", b"ne", b"1", b"\nline2"):
+            stream.feed_data(chunk)
+
+        assert b"line1\n" == await stream.readuntil()
+        assert b"line2" == stream.read_nowait()
+
     async def test_unread_data(self) -> None:
         stream = self._make_one()
         stream.feed_data(b"line1")
@@ -1116,6 +1222,14 @@ async def test_empty_stream_reader() -> None:
     assert s.read_nowait() == b""
 
 
+async def test_empty_stream_reader_read_into() -> None:
+    s = streams.EmptyStreamReader()
+    assert 0 == await s.read_into(bytearray(4))
+    assert b"" == await s.readexactly_view(0)
+    with pytest.raises(asyncio.IncompleteReadError):
+        await s.readexactly_view(4)
+
+
 async def test_empty_stream_reader_iter_chunks() -> None:
     s = streams.EmptyStreamReader()
 
@@ -92,8 +92,8 @@ class TestTrace:
                 (Mock(), Mock(), Mock(), Mock()),
                 TraceRequestRedirectParams,
             ),
-            ("connection_queued_start", (), TraceConnectionQueuedStartParams),
-            ("connection_queued_end", (), TraceConnectionQueuedEndParams),
+            ("connection_queued_start", (Mock(),), TraceConnectionQueuedStartParams),
+            ("connection_queued_end", (Mock(),), TraceConnectionQueuedEndParams),
             ("connection_create_start", (), TraceConnectionCreateStartParams),
             ("connection_create_end", (), TraceConnectionCreateEndParams),
             ("connection_reuseconn", (), TraceConnectionReuseconnParams),
@@ -4,6 +4,7 @@ import re
 from collections.abc import Container, Iterable, Mapping, MutableMapping, Sized
 from functools import partial
 from typing import Any
+from unittest import mock
 from urllib.parse import unquote
 
 import pytest
@@ -462,6 +463,100 @@ def test_add_static_append_version_not_follow_symlink(
     assert "/st/append_version_symlink/data.unknown_mime_type" == str(url)
 
 
+def test_add_static_append_version_cached(router: Any, tmp_path: Any) -> None:
+    filepath = tmp_path / "app.js"
+    filepath.write_bytes(b"var a = 1;")
+    resource = router.add_static("/st", str(tmp_path), append_version=True)
+
+    with mock.patch.object(
+        resource, "_get_file_hash", wraps=resource._get_file_hash
+    ) as get_file_hash:
+        url = resource.url_for(filename="/app.js")
+        assert url == resource.url_for(filename="/app.js")
+        assert get_file_hash.call_count == 1
+
+        filepath.write_bytes(b"var a = 2; var b = 3;")
+        changed = resource.url_for(filename="/app.js")
+        assert get_file_hash.call_count == 2
+    assert changed != url
+    assert changed.path == "/st/app.js"
+
+
+def test_add_static_append_version_cached_no_resolve(
+    router: Any, tmp_path: Any
+) -> None:
+    (tmp_path / "app.js").write_bytes(b"var a = 1;")
+    resource = router.add_static("/st", str(tmp_path), append_version=True)
+    url = resource.url_for(filename="/app.js")
+
+    with mock.patch.object(
+        pathlib.Path, "resolve", side_effect=AssertionError
+    ) as resolve:
+        assert url == resource.url_for(filename="/app.js")
+        assert url == resource.url_for(filename="./app.js")
+    assert not resolve.called
+
+
+def test_add_static_append_version_cached_file_removed(
+    router: Any, tmp_path: Any
+) -> None:
+    filepath = tmp_path / "app.js"
+    filepath.write_bytes(b"var a = 1;")
+    resource = router.add_static("/st", str(tmp_path), append_version=True)
+    assert "v" in resource.url_for(filename="/app.js").query
+
+    filepath.unlink()
+
+    assert "/st/app.js" == str(resource.url_for(filename="/app.js"))
+    assert not resource._hash_cache
+
+
+def test_add_static_precompute_versions(router: Any, tmp_path: Any) -> None:
+    (tmp_path / "app.js").write_bytes(b"var a = 1;")
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "app.css").write_bytes(b"body {}")
+    resource = router.add_static("/st", str(tmp_path), append_version=True)
+
+    resource.precompute_versions()
+
+    with mock.patch.object(
+        resource, "_get_file_hash", side_effect=AssertionError
+    ) as get_file_hash:
+        assert "v" in resource.url_for(filename="/app.js").query
+        assert "v" in resource.url_for(filename="/css/app.css").query
+    assert not get_file_hash.called
+
+
+def test_add_static_precompute_versions_symlink_loop(
+    router: Any, tmp_path: Any
+) -> None:
+    (tmp_path / "app.js").write_bytes(b"var a = 1;")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "app.css").write_bytes(b"body {}")
+    (tmp_path / "sub" / "loop").symlink_to(tmp_path)
+    resource = router.add_static(
+        "/st", str(tmp_path), append_version=True, follow_symlinks=True
+    )
+
+    resource.precompute_versions()
+
+    assert set(resource._hash_cache) == {"app.js", "sub/app.css"}
+
+
+def test_add_static_precompute_versions_not_follow_symlink(
+    router: Any, tmp_path: Any
+) -> None:
+    static_path = tmp_path / "static"
+    static_path.mkdir()
+    (tmp_path / "secret").write_bytes(b"secret")
+    (static_path / "link").symlink_to(tmp_path / "secret")
+    resource = router.add_static("/st", str(static_path), append_version=True)
+
+    resource.precompute_versions()
+
+    assert not resource._hash_cache
+
+
 def test_add_static_quoting(router: Any) -> None:
     resource = router.add_static(
         "/пре %2Fфикс", pathlib.Path(aiohttp.__file__).parent, name="static"
@@ -1292,3 +1387,289 @@ async def test_prefixed_subapp_root_route(app: Any) -> None:
     assert match_info.route.handler is handler
     match_info = await app.router.resolve(make_mocked_request("GET", "/s"))
     assert "<MatchInfoError 404: Not Found>" == repr(match_info)
+
+
+async def test_frozen_router_keeps_registration_order(router: Any) -> None:
+    handler1 = make_handler()
+    handler2 = make_handler()
+    handler3 = make_handler()
+    router.add_get("/{name}/b", handler1)
+    router.add_get("/a/b", handler2)
+    router.add_post("/a/{name}", handler3)
+    router.freeze()
+
+    match_info = await router.resolve(make_mocked_request("GET", "/a/b"))
+    assert match_info.handler is handler1
+    assert {"name": "a"} == match_info
+    match_info = await router.resolve(make_mocked_request("POST", "/a/b"))
+    assert match_info.handler is handler3
+    match_info = await router.resolve(make_mocked_request("GET", "/c/b"))
+    assert match_info.handler is handler1
+
+
+async def test_frozen_router_method_not_allowed(router: Any) -> None:
+    router.add_get("/a/b", make_handler())
+    router.add_put("/a/{name}", make_handler())
+    router.add_static("/a", pathlib.Path(aiohttp.__file__).parent)
+    router.add_post("/c", make_handler())
+    router.freeze()
+
+    match_info = await router.resolve(make_mocked_request("DELETE", "/a/b"))
+    assert isinstance(match_info.http_exception, HTTPMethodNotAllowed)
+    assert {"GET", "HEAD", "PUT"} == match_info.http_exception.allowed_methods
+
+    match_info = await router.resolve(make_mocked_request("GET", "/b"))
+    assert isinstance(match_info.http_exception, HTTPNotFound)
+
+
+async def test_frozen_router_prefix_resources(router: Any) -> None:
+    handler = make_handler()
+    router.add_route("*", "/api/{tail:.*}", handler)
+    resource = router.add_static("/static", pathlib.Path(aiohttp.__file__).parent)
+    router.freeze()
+
+    match_info = await router.resolve(make_mocked_request("GET", "/api/x/y/z"))
+    assert match_info.handler is handler
+    assert {"tail": "x/y/z"} == match_info
+    match_info = await router.resolve(make_mocked_request("GET", "/static/a/b.txt"))
+    assert match_info.route.resource is resource
+    match_info = await router.resolve(make_mocked_request("GET", "/apix"))
+    assert isinstance(match_info.http_exception, HTTPNotFound)
+
+
+async def test_frozen_router_custom_resource(router: Any) -> None:
+    class CustomResource(PlainResource):
+        def _match(self, path: str) -> Any:
+            return {} if path.startswith("/custom") else None
+
+    handler = make_handler()
+    resource = CustomResource("/")
+    resource.add_route("GET", handler)
+    router.register_resource(resource)
+    router.freeze()
+
+    match_info = await router.resolve(make_mocked_request("GET", "/custom/path"))
+    assert match_info.handler is handler
+
+
+async def test_resolve_subapp_mounted_after_freeze(app: Any) -> None:
+    handler = make_handler()
+    subapp = web.Application()
+    subsubapp = web.Application()
+    subsubapp.router.add_get("/c", handler)
+    subapp.add_subapp("/b", subsubapp)
+    app.add_subapp("/a", subapp)
+    assert subsubapp.router.frozen
+
+    match_info = await app.router.resolve(make_mocked_request("GET", "/a/b/c"))
+    assert match_info.handler is handler
+    match_info = await app.router.resolve(make_mocked_request("GET", "/b/c"))
+    assert isinstance(match_info.http_exception, HTTPNotFound)
+
+
+async def test_frozen_router_plain_path_shadowed(router: Any) -> None:
+    handler1 = make_handler()
+    handler2 = make_handler()
+    static = router.add_static("/static", pathlib.Path(aiohttp.__file__).parent)
+    router.add_get("/static/file.txt", handler1)
+    router.add_get("/{name}", handler2)
+    router.add_post("/plain", make_handler())
+    router.freeze()
+
+    match_info = await router.resolve(make_mocked_request("GET", "/static/file.txt"))
+    assert match_info.route.resource is static
+    match_info = await router.resolve(make_mocked_request("GET", "/plain"))
+    assert match_info.handler is handler2
+    assert {"name": "plain"} == match_info
+    match_info = await router.resolve(make_mocked_request("PUT", "/plain"))
+    assert {"GET", "HEAD", "POST"} == match_info.http_exception.allowed_methods
+
+
+async def test_resolve_cache(router: Any) -> None:
+    handler = make_handler()
+    router.add_get("/a/{name}", handler)
+    router.set_resolve_cache(2)
+    router.freeze()
+
+    match_info1 = await router.resolve(make_mocked_request("GET", "/a/b"))
+    match_info2 = await router.resolve(make_mocked_request("GET", "/a/b"))
+    assert match_info1 is not match_info2
+    assert match_info2.handler is handler
+    assert {"name": "b"} == match_info2
+    assert (1, 1, 2, 1) == router.resolve_cache_info()
+
+    await router.resolve(make_mocked_request("GET", "/a/c"))
+    await router.resolve(make_mocked_request("GET", "/a/d"))
+    await router.resolve(make_mocked_request("GET", "/a/b"))
+    assert (1, 4, 2, 2) == router.resolve_cache_info()
+
+
+async def test_resolve_cache_skips_errors(router: Any) -> None:
+    router.add_get("/a", make_handler())
+    router.set_resolve_cache(10)
+    router.freeze()
+
+    for _ in range(2):
+        match_info = await router.resolve(make_mocked_request("POST", "/a"))
+        assert {"GET", "HEAD"} == match_info.http_exception.allowed_methods
+        match_info = await router.resolve(make_mocked_request("GET", "/b"))
+        assert isinstance(match_info.http_exception, HTTPNotFound)
+    assert (0, 4, 10, 0) == router.resolve_cache_info()
+
+
+async def test_resolve_cache_not_frozen(router: Any) -> None:
+    router.add_get("/a", make_handler())
+    router.set_resolve_cache(10)
+
+    await router.resolve(make_mocked_request("GET", "/a"))
+    assert (0, 0, 10, 0) == router.resolve_cache_info()
+
+
+def test_resolve_cache_invalid_size(router: Any) -> None:
+    with pytest.raises(ValueError):
+        router.set_resolve_cache(-1)
+
+
+async def test_resolve_cache_subapp(app: Any) -> None:
+    handler1 = make_handler()
+    handler2 = make_handler()
+    subapp1 = web.Application()
+    subapp1.router.add_get("/", handler1)
+    app.add_domain("example.com", subapp1)
+    subapp2 = web.Application()
+    subapp2.router.add_get("/", handler2)
+    app.add_subapp("/sub", subapp2)
+    app.router.set_resolve_cache(10)
+    app.freeze()
+
+    for _ in range(2):
+        request = make_mocked_request("GET", "/", {"host": "example.com"})
+        match_info = await app.router.resolve(request)
+        assert match_info.handler is handler1
+        assert match_info.apps == (subapp1,)
+        request = make_mocked_request("GET", "/", {"host": "example.org"})
+        match_info = await app.router.resolve(request)
+        assert isinstance(match_info.http_exception, HTTPNotFound)
+        request = make_mocked_request("GET", "/sub/")
+        match_info = await app.router.resolve(request)
+        assert match_info.handler is handler2
+        assert match_info.current_app is subapp2
+    assert (2, 4, 10, 2) == app.router.resolve_cache_info()
+
+
+async def test_resolve_cache_custom_resource(router: Any) -> None:
+    class CustomResource(PlainResource):
+        pass
+
+    resource = CustomResource("/a")
+    resource.add_route("GET", make_handler())
+    router.register_resource(resource)
+    router.set_resolve_cache(10)
+    router.freeze()
+
+    await router.resolve(make_mocked_request("GET", "/a"))
+    await router.resolve(make_mocked_request("GET", "/a"))
+    assert (0, 0, 10, 0) == router.resolve_cache_info()
+
+
+async def test_combined_patterns(router: Any) -> None:
+    handler1 = make_handler()
+    handler2 = make_handler()
+    handler3 = make_handler()
+    router.add_post("/{a}/x", make_handler())
+    router.add_get("/{b:\\d+}/x", handler1)
+    router.add_get("/{c}/{d:(y|z)}", handler2)
+    router.add_get("/{e}/x", handler3)
+    router.set_combine_patterns(True)
+    router.freeze()
+
+    match_info = await router.resolve(make_mocked_request("GET", "/1/x"))
+    assert match_info.handler is handler1
+    assert {"b": "1"} == match_info
+    match_info = await router.resolve(make_mocked_request("GET", "/a/x"))
+    assert match_info.handler is handler3
+    assert {"e": "a"} == match_info
+    match_info = await router.resolve(make_mocked_request("GET", "/a/z"))
+    assert match_info.handler is handler2
+    assert {"c": "a", "d": "z"} == match_info
+    match_info = await router.resolve(make_mocked_request("PUT", "/a/x"))
+    assert {"GET", "HEAD", "POST"} == match_info.http_exception.allowed_methods
+    match_info = await router.resolve(make_mocked_request("GET", "/a/b/c"))
+    assert isinstance(match_info.http_exception, HTTPNotFound)
+
+
+async def test_combined_patterns_skip_not_matching(router: Any) -> None:
+    handler = make_handler()
+    for i in range(10):
+        router.add_get(f"/{{name}}/{i}", make_handler())
+    router.add_get("/{name}/last", handler)
+    router.set_combine_patterns(True)
+    router.freeze()
+
+    with mock.patch.object(
+        DynamicResource, "_match", autospec=True, side_effect=DynamicResource._match
+    ) as match:
+        match_info = await router.resolve(make_mocked_request("GET", "/a/last"))
+        assert match_info.handler is handler
+        assert 1 == match.call_count
+        match_info = await router.resolve(make_mocked_request("GET", "/a/b"))
+        assert isinstance(match_info.http_exception, HTTPNotFound)
+        assert 1 == match.call_count
+
+
+async def test_combined_patterns_with_backreference(router: Any) -> None:
+    handler1 = make_handler()
+    handler2 = make_handler()
+    router.add_get("/{a:(x)\\2}", handler1)
+    router.add_get("/{b:(y)(z)}", make_handler())
+    router.add_get("/{c}", handler2)
+    router.set_combine_patterns(True)
+    router.freeze()
+
+    match_info = await router.resolve(make_mocked_request("GET", "/xx"))
+    assert match_info.handler is handler1
+    match_info = await router.resolve(make_mocked_request("GET", "/x"))
+    assert match_info.handler is handler2
+
+
+async def test_frozen_router_domains(app: Any) -> None:
+    handler = make_handler()
+    subapps = []
+    for domain in ("example.com", "example.org", "*.example.com"):
+        subapp = web.Application()
+        subapp.router.add_get("/", make_handler())
+        app.add_domain(domain, subapp)
+        subapps.append(subapp)
+    app.router.add_get("/", handler)
+    app.freeze()
+
+    for host, expected in (
+        ("example.com", subapps[0]),
+        ("Example.ORG", subapps[1]),
+        ("a.example.com", subapps[2]),
+    ):
+        request = make_mocked_request("GET", "/", {"host": host})
+        match_info = await app.router.resolve(request)
+        assert match_info.apps == (expected,)
+    request = make_mocked_request("GET", "/", {"host": "example.net"})
+    match_info = await app.router.resolve(request)
+    assert match_info.handler is handler
+    match_info = await app.router.resolve(make_mocked_request("GET", "/"))
+    assert match_info.handler is handler
+
+
+async def test_frozen_router_domain_registration_order(app: Any) -> None:
+    handler = make_handler()
+    app.router.add_get("/", handler)
+    subapp = web.Application()
+    subapp.router.add_get("/", make_handler())
+    subapp.router.add_get("/sub", make_handler())
+    app.add_domain("example.com", subapp)
+    app.freeze()
+
+    request = make_mocked_request("GET", "/", {"host": "example.com"})
+    match_info = await app.router.resolve(request)
+    assert match_info.handler is handler
+    request = make_mocked_request("GET", "/sub", {"host": "example.com"})
+    match_info = await app.router.resolve(request)
+    assert match_info.apps == (subapp,)
@@ -1045,6 +1045,46 @@ async def test_response_with_precompressed_body(
     await resp.release()
 
 
+async def test_response_zstd_dict(aiohttp_client: Any) -> None:
+    pytest.importorskip("zstandard")
+    dict_data = b"a shared dictionary for zstd " * 16
+
+    async def handler(request):
+        resp = web.Response(text="a shared dictionary for zstd")
+        resp.enable_compression(web.ContentCoding.zstd, zstd_dict=dict_data)
+        return resp
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app, zstd_dict=dict_data)
+
+    resp = await client.get("/")
+    assert 200 == resp.status
+    assert resp.headers.get("Content-Encoding") == "zstd"
+    assert "a shared dictionary for zstd" == await resp.text()
+
+    await resp.release()
+
+
+async def test_request_zstd_dict(aiohttp_client: Any) -> None:
+    pytest.importorskip("zstandard")
+    dict_data = b"a shared dictionary for zstd " * 16
+
+    async def handler(request):
+        assert request.headers["Content-Encoding"] == "zstd"
+        return web.Response(body=await request.read())
+
+    app = web.Application(handler_args={"zstd_dict": dict_data})
+    app.router.add_post("/", handler)
+    client = await aiohttp_client(app, zstd_dict=dict_data)
+
+    resp = await client.post("/", data=b"a shared dictionary", compress="zstd")
+    assert 200 == resp.status
+    assert b"a shared dictionary" == await resp.read()
+
+    await resp.release()
+
+
 async def test_response_with_precompressed_body_brotli(aiohttp_client: Any) -> None:
     async def handler(request):
         headers = {"Content-Encoding": "br"}
@@ -1063,6 +1103,27 @@ async def test_response_with_precompressed_body_brotli(aiohttp_client: Any) -> N
     await resp.release()
 
 
+async def test_request_compressed_body_executor(aiohttp_client: Any) -> None:
+    body = bytes(range(256)) * 2**12
+
+    async def handler(request):
+        assert await request.read() == body
+        return web.Response()
+
+    app = web.Application(
+        client_max_size=2**21, handler_args={"zlib_executor_size": 1024}
+    )
+    app.router.add_post("/", handler)
+    client = await aiohttp_client(app)
+
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    data = compressor.compress(body) + compressor.flush()
+    resp = await client.post("/", data=data, headers={"content-encoding": "gzip"})
+    assert 200 == resp.status
+
+    await resp.release()
+
+
 async def test_bad_request_payload(aiohttp_client: Any) -> None:
     async def handler(request):
         assert request.method == "POST"
@@ -2152,3 +2213,54 @@ async def test_httpfound_cookies_302(aiohttp_client: Any) -> None:
     resp = await client.get("/", allow_redirects=False)
     assert "my-cookie" in resp.cookies
     await resp.release()
+
+
+async def test_header_template_middleware_and_prepare(aiohttp_client: Any) -> None:
+    template = web.HeaderTemplate(
+        {"X-Frame-Options": "DENY", "X-Content-Type-Options": "nosniff"}
+    )
+    seen = []
+
+    async def handler(request):
+        return web.Response(text="OK", template=template)
+
+    async def middleware(request, handler: Handler):
+        resp = await handler(request)
+        seen.append(resp.headers.get("X-Frame-Options"))
+        resp.headers["X-Frame-Options"] = "SAMEORIGIN"
+        return resp
+
+    async def on_prepare(request, response):
+        seen.append(response.headers.get("X-Content-Type-Options"))
+        del response.headers["X-Content-Type-Options"]
+
+    app = web.Application(middlewares=[middleware])
+    app.on_response_prepare.append(on_prepare)
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/")
+    assert resp.status == 200
+    assert seen == ["DENY", "nosniff"]
+    assert resp.headers.getall("X-Frame-Options") == ["SAMEORIGIN"]
+    assert "X-Content-Type-Options" not in resp.headers
+    assert await resp.text() == "OK"
+    await resp.release()
+
+
+async def test_request_transport_after_prepare(aiohttp_client: Any) -> None:
+    async def handler(request):
+        resp = web.StreamResponse()
+        resp.content_length = 4
+        await resp.prepare(request)
+        request.transport.write(b"data")
+        return resp
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/")
+    assert resp.status == 200
+    assert await resp.read() == b"data"
+    await resp.release()
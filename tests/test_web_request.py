@@ -228,6 +228,38 @@ def test_range_to_slice_tail_stop() -> None:
     assert req.content[req.http_range] == payload[-500:]
 
 
+def test_http_ranges() -> None:
+    req = make_mocked_request(
+        "GET", "/", headers=CIMultiDict([("RANGE", "bytes=0-499, 1000-, -500")])
+    )
+    assert req.http_ranges == (
+        slice(0, 500, 1),
+        slice(1000, None, 1),
+        slice(-500, None, 1),
+    )
+
+
+def test_http_ranges_single() -> None:
+    req = make_mocked_request(
+        "GET", "/", headers=CIMultiDict([("RANGE", "bytes=500-999")])
+    )
+    assert req.http_ranges == (req.http_range,)
+
+
+def test_http_ranges_no_header() -> None:
+    req = make_mocked_request("GET", "/")
+    assert req.http_ranges == ()
+
+
+@pytest.mark.parametrize(
+    "rng", ["bytes=0-1,", "bytes=0-1,2", "items=0-1", "bytes=5-2,0-1", "bytes=0-1,-"]
+)
+def test_http_ranges_invalid(rng: str) -> None:
+    req = make_mocked_request("GET", "/", headers=CIMultiDict([("RANGE", rng)]))
+    with pytest.raises(ValueError):
+        req.http_ranges
+
+
 def test_non_keepalive_on_http10() -> None:
     req = make_mocked_request("GET", "/", version=HttpVersion(1, 0))
     assert not req.keep_alive
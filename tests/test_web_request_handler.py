@@ -1,5 +1,7 @@
 from unittest import mock
 
+import pytest
+
 from aiohttp import web
 from aiohttp.test_utils import make_mocked_coro
 
@@ -59,3 +61,9 @@ async def test_shutdown_timeout() -> None:
     manager.connection_lost(handler, None)
     assert manager.connections == []
     handler.shutdown.assert_called_with(0.1)
+
+
+async def test_max_pipelined_requests_invalid() -> None:
+    manager = web.Server(serve, max_pipelined_requests=0)
+    with pytest.raises(ValueError):
+        manager()
@@ -16,10 +16,16 @@ from re_assert import Matches
 
 from aiohttp import HttpVersion, HttpVersion10, HttpVersion11, hdrs
 from aiohttp.helpers import ETag
-from aiohttp.http_writer import _serialize_headers
+from aiohttp.http_writer import StreamWriter, _serialize_headers
 from aiohttp.payload import BytesPayload
 from aiohttp.test_utils import make_mocked_coro, make_mocked_request
-from aiohttp.web import ContentCoding, Response, StreamResponse, json_response
+from aiohttp.web import (
+    ContentCoding,
+    HeaderTemplate,
+    Response,
+    StreamResponse,
+    json_response,
+)
 
 
 def make_request(
@@ -78,6 +84,23 @@ def writer(buf: Any):
     return writer
 
 
+@pytest.fixture
+def stream_writer(buf: Any) -> Any:
+    writer = mock.Mock(spec=StreamWriter)
+
+    async def write_headers(status_line, headers, template=b""):
+        buf.extend(_serialize_headers(status_line, headers)[:-2] + template + b"\r\n")
+
+    async def write_eof(chunk=b""):
+        buf.extend(chunk)
+
+    writer.write_headers.side_effect = write_headers
+    writer._write_headers.side_effect = write_headers
+    writer.write_eof.side_effect = write_eof
+
+    return writer
+
+
 def test_stream_response_ctor() -> None:
     resp = StreamResponse()
     assert 200 == resp.status
@@ -419,7 +442,7 @@ async def test_compression_default_coding() -> None:
 
     msg = await resp.prepare(req)
 
-    msg.enable_compression.assert_called_with("deflate")
+    msg.enable_compression.assert_called_with("deflate", level=None, zstd_dict=None)
     assert "deflate" == resp.headers.get(hdrs.CONTENT_ENCODING)
     assert msg.filter is not None
 
@@ -434,7 +457,7 @@ async def test_force_compression_deflate() -> None:
     assert resp.compression
 
     msg = await resp.prepare(req)
-    msg.enable_compression.assert_called_with("deflate")
+    msg.enable_compression.assert_called_with("deflate", level=None, zstd_dict=None)
     assert "deflate" == resp.headers.get(hdrs.CONTENT_ENCODING)
 
 
@@ -446,7 +469,7 @@ async def test_force_compression_no_accept_deflate() -> None:
     assert resp.compression
 
     msg = await resp.prepare(req)
-    msg.enable_compression.assert_called_with("deflate")
+    msg.enable_compression.assert_called_with("deflate", level=None, zstd_dict=None)
     assert "deflate" == resp.headers.get(hdrs.CONTENT_ENCODING)
 
 
@@ -460,7 +483,7 @@ async def test_force_compression_gzip() -> None:
     assert resp.compression
 
     msg = await resp.prepare(req)
-    msg.enable_compression.assert_called_with("gzip")
+    msg.enable_compression.assert_called_with("gzip", level=None, zstd_dict=None)
     assert "gzip" == resp.headers.get(hdrs.CONTENT_ENCODING)
 
 
@@ -472,10 +495,101 @@ async def test_force_compression_no_accept_gzip() -> None:
     assert resp.compression
 
     msg = await resp.prepare(req)
-    msg.enable_compression.assert_called_with("gzip")
+    msg.enable_compression.assert_called_with("gzip", level=None, zstd_dict=None)
+    assert "gzip" == resp.headers.get(hdrs.CONTENT_ENCODING)
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "coding"),
+    (
+        ("gzip, deflate, zstd", "deflate"),
+        ("gzip;q=0.5, zstd", "zstd"),
+        ("zstd;q=0, gzip", "gzip"),
+        ("ZSTD; q=0.9, gzip;q=0.8", "zstd"),
+    ),
+)
+async def test_compression_qvalues(accept_encoding: str, coding: str) -> None:
+    req = make_request(
+        "GET", "/", headers=CIMultiDict({hdrs.ACCEPT_ENCODING: accept_encoding})
+    )
+    resp = StreamResponse()
+    resp.enable_compression()
+
+    with mock.patch("aiohttp.web_response.HAS_ZSTD", True):
+        msg = await resp.prepare(req)
+    msg.enable_compression.assert_called_with(coding, level=None, zstd_dict=None)
+    assert coding == resp.headers.get(hdrs.CONTENT_ENCODING)
+
+
+async def test_compression_identity_preferred() -> None:
+    req = make_request(
+        "GET", "/", headers=CIMultiDict({hdrs.ACCEPT_ENCODING: "identity, gzip;q=0.5"})
+    )
+    resp = StreamResponse()
+    resp.enable_compression()
+
+    msg = await resp.prepare(req)
+    assert not msg.enable_compression.called
+    assert hdrs.CONTENT_ENCODING not in resp.headers
+
+
+async def test_compression_skips_zstd_unavailable() -> None:
+    req = make_request(
+        "GET", "/", headers=CIMultiDict({hdrs.ACCEPT_ENCODING: "gzip, zstd"})
+    )
+    resp = StreamResponse()
+    resp.enable_compression()
+
+    with mock.patch("aiohttp.web_response.HAS_ZSTD", False):
+        msg = await resp.prepare(req)
+    msg.enable_compression.assert_called_with("gzip", level=None, zstd_dict=None)
     assert "gzip" == resp.headers.get(hdrs.CONTENT_ENCODING)
 
 
+async def test_force_compression_zstd_level_dict() -> None:
+    req = make_request("GET", "/")
+    resp = StreamResponse()
+
+    with mock.patch("aiohttp.web_response.HAS_ZSTD", True):
+        resp.enable_compression(ContentCoding.zstd, level=9, zstd_dict=b"dict")
+    msg = await resp.prepare(req)
+    msg.enable_compression.assert_called_with("zstd", level=9, zstd_dict=b"dict")
+    assert "zstd" == resp.headers.get(hdrs.CONTENT_ENCODING)
+
+
+def test_force_compression_zstd_unavailable() -> None:
+    resp = StreamResponse()
+
+    with mock.patch("aiohttp.web_response.HAS_ZSTD", False):
+        with pytest.raises(RuntimeError):
+            resp.enable_compression(ContentCoding.zstd)
+    assert not resp.compression
+
+
+async def test_compression_level_whole_body() -> None:
+    req = make_request("GET", "/")
+    body = b"answer" * 1024
+    resp = Response(body=body)
+    resp.enable_compression(ContentCoding.gzip, level=1)
+
+    await resp.prepare(req)
+    assert gzip.decompress(resp._compressed_body) == body
+
+
+async def test_compression_zstd_whole_body() -> None:
+    zstandard = pytest.importorskip("zstandard")
+    req = make_request("GET", "/")
+    body = b"answer" * 1024
+    resp = Response(body=body)
+    resp.enable_compression(ContentCoding.zstd)
+
+    await resp.prepare(req)
+    assert resp.headers[hdrs.CONTENT_ENCODING] == "zstd"
+    assert resp.content_length == len(resp._compressed_body)
+    decompressor = zstandard.ZstdDecompressor()
+    assert decompressor.decompressobj().decompress(resp._compressed_body) == body
+
+
 async def test_change_content_threaded_compression_enabled() -> None:
     req = make_request("GET", "/")
     body_thread_size = 1024
@@ -989,6 +1103,145 @@ async def test_send_set_cookie_header(buf: Any, writer: Any) -> None:
     )
 
 
+async def test_send_headers_with_template(buf: Any, stream_writer: Any) -> None:
+    template = HeaderTemplate({"Server": "test", "X-Frame-Options": "DENY"})
+    resp = Response(body=b"data", template=template)
+    req = make_request("GET", "/", writer=stream_writer)
+
+    await resp.prepare(req)
+    await resp.write_eof()
+
+    stream_writer.write_headers.assert_not_called()
+    stream_writer._write_headers.assert_called_once_with(
+        "HTTP/1.1 200 OK",
+        resp._headers,
+        b"Server: test\r\nX-Frame-Options: DENY\r\n",
+    )
+    txt = buf.decode("utf8")
+    assert (
+        Matches(
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Length: 4\r\n"
+            "Content-Type: application/octet-stream\r\n"
+            "Date: .+\r\n"
+            "Server: test\r\n"
+            "X-Frame-Options: DENY\r\n\r\n"
+            "data"
+        )
+        == txt
+    )
+
+
+async def test_send_headers_with_template_overridden(
+    buf: Any, stream_writer: Any
+) -> None:
+    template = HeaderTemplate({"X-Frame-Options": "DENY", "X-A": "1"})
+    resp = Response(body=b"data", headers={"x-a": "2"}, template=template)
+    req = make_request("GET", "/", writer=stream_writer)
+
+    await resp.prepare(req)
+    await resp.write_eof()
+
+    stream_writer._write_headers.assert_called_once_with(
+        "HTTP/1.1 200 OK", resp._headers, b"X-Frame-Options: DENY\r\n"
+    )
+    txt = buf.decode("utf8")
+    assert "X-A: 1" not in txt
+    assert "x-a: 2\r\n" in txt
+    assert "X-Frame-Options: DENY\r\n" in txt
+
+
+def test_header_template_in_headers() -> None:
+    template = HeaderTemplate({"X-Frame-Options": "DENY", "X-A": "1"})
+    resp = Response(headers={"X-A": "2"}, template=template)
+
+    assert resp.headers["X-Frame-Options"] == "DENY"
+    assert resp.headers.getall("X-A") == ["2"]
+
+
+async def test_send_headers_with_template_modified(
+    buf: Any, stream_writer: Any
+) -> None:
+    template = HeaderTemplate({"X-Frame-Options": "DENY", "X-A": "1"})
+    resp = Response(body=b"data", template=template)
+    req = make_request("GET", "/", writer=stream_writer)
+
+    resp.headers["X-Frame-Options"] = "SAMEORIGIN"
+    del resp.headers["X-A"]
+    await resp.prepare(req)
+    await resp.write_eof()
+
+    stream_writer._write_headers.assert_not_called()
+    stream_writer.write_headers.assert_called_once_with("HTTP/1.1 200 OK", resp.headers)
+    txt = buf.decode("utf8")
+    assert "X-Frame-Options: SAMEORIGIN\r\n" in txt
+    assert "DENY" not in txt
+    assert "X-A" not in txt
+
+
+async def test_send_headers_with_template_other_writer(buf: Any, writer: Any) -> None:
+    template = HeaderTemplate({"X-Frame-Options": "DENY"})
+    resp = Response(body=b"data", template=template)
+    req = make_request("GET", "/", writer=writer)
+
+    await resp.prepare(req)
+    await resp.write_eof()
+
+    writer.write_headers.assert_called_once_with("HTTP/1.1 200 OK", resp.headers)
+    assert "X-Frame-Options: DENY\r\n" in buf.decode("utf8")
+
+
+async def test_text_with_template_content_type(buf: Any, stream_writer: Any) -> None:
+    template = HeaderTemplate({"Content-Type": "text/html; charset=koi8-r"})
+    resp = Response(text="текст", template=template)
+    req = make_request("GET", "/", writer=stream_writer)
+
+    await resp.prepare(req)
+    await resp.write_eof()
+
+    txt = buf.decode("koi8-r")
+    assert txt.count("Content-Type:") == 1
+    assert "Content-Type: text/html; charset=koi8-r\r\n" in txt
+    assert txt.endswith("текст")
+    assert resp.content_type == "text/html"
+    assert resp.charset == "koi8-r"
+
+
+def test_text_with_template_content_type_overridden() -> None:
+    template = HeaderTemplate({"Content-Type": "text/html"})
+    resp = Response(text="text", content_type="text/plain", template=template)
+
+    assert resp.content_type == "text/plain"
+    assert resp.headers.getall("Content-Type") == ["text/plain; charset=utf-8"]
+
+
+def test_header_template_raw_without() -> None:
+    template = HeaderTemplate({"content-type": "application/json", "X-A": "1"})
+    raw = template._raw_without(frozenset(["content-type"]))
+    assert raw == b"X-A: 1\r\n"
+    assert template._raw_without(frozenset(["content-type"])) is raw
+
+
+def test_header_template_rejects_dynamic_headers() -> None:
+    with pytest.raises(ValueError):
+        HeaderTemplate({"Content-Length": "1"})
+    with pytest.raises(ValueError):
+        HeaderTemplate({"Transfer-Encoding": "chunked"})
+    with pytest.raises(ValueError):
+        HeaderTemplate({"Date": "Thu, 01 Jan 1970 00:00:00 GMT"})
+
+
+def test_header_template_rejects_injection() -> None:
+    with pytest.raises(ValueError):
+        HeaderTemplate({"X-A": "1\r\nSet-Cookie: a=b"})
+
+
+def test_json_response_with_template() -> None:
+    template = HeaderTemplate({"X-A": "1"})
+    resp = json_response({"a": 1}, template=template)
+    assert resp.template is template
+
+
 async def test_consecutive_write_eof() -> None:
     writer = mock.Mock()
     writer.write_eof = make_mocked_coro()
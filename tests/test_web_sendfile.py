@@ -1,10 +1,13 @@
+import stat
 from pathlib import Path
 from typing import Any
 from unittest import mock
 
+import pytest
+
 from aiohttp import hdrs
 from aiohttp.test_utils import make_mocked_coro, make_mocked_request
-from aiohttp.web_fileresponse import FileResponse
+from aiohttp.web_fileresponse import FileResponse, _accepted_sidecars
 
 
 def test_using_gzip_if_header_present_and_file_available(loop: Any) -> None:
@@ -13,7 +16,7 @@ def test_using_gzip_if_header_present_and_file_available(loop: Any) -> None:
     )
 
     gz_filepath = mock.create_autospec(Path, spec_set=True)
-    gz_filepath.is_file.return_value = True
+    gz_filepath.stat.return_value.st_mode = stat.S_IFREG
     gz_filepath.stat.return_value.st_size = 1024
     gz_filepath.stat.return_value.st_mtime_ns = 1603733507222449291
 
@@ -81,7 +84,7 @@ def test_gzip_if_header_present_and_file_not_available(loop: Any) -> None:
     )
 
     gz_filepath = mock.create_autospec(Path, spec_set=True)
-    gz_filepath.is_file.return_value = False
+    gz_filepath.stat.side_effect = FileNotFoundError
 
     filepath = mock.create_autospec(Path, spec_set=True)
     filepath.name = "logo.png"
@@ -114,3 +117,21 @@ def test_status_controlled_by_user(loop: Any) -> None:
     loop.run_until_complete(file_sender.prepare(request))
 
     assert file_sender._status == 203
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        ("", []),
+        ("gzip", ["gzip"]),
+        ("gzip, deflate, br, zstd", ["br", "zstd", "gzip"]),
+        ("gzip;q=1.0, br;q=0.5", ["gzip", "br"]),
+        ("br;q=0, GZIP", ["gzip"]),
+        ("gzip;q=0.5, identity", []),
+        ("*;q=0.1, zstd", ["zstd", "br", "gzip"]),
+        ("gzip;q=bad, br", ["br"]),
+    ],
+)
+def test_accepted_sidecars(accept_encoding: str, expected: Any) -> None:
+    sidecars = _accepted_sidecars(accept_encoding)
+    assert [coding for coding, _ in sidecars] == expected
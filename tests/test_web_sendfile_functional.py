@@ -1,14 +1,15 @@
 # type: ignore
 import asyncio
+import os
 import pathlib
 import socket
 import zlib
-from typing import Any, Iterable
+from typing import Any, Iterable, List, Tuple
 
 import pytest
 
 import aiohttp
-from aiohttp import web
+from aiohttp import hdrs, web
 
 try:
     import ssl
@@ -60,6 +61,17 @@ def app_with_static_route(sender: Any) -> web.Application:
     return app
 
 
+def _byteranges(resp: Any, body: bytes) -> List[Tuple[str, bytes]]:
+    boundary = resp.headers["Content-Type"].split("boundary=")[1].encode()
+    parts = []
+    for part in body.split(b"--" + boundary)[1:-1]:
+        headers, data = part.split(b"\r\n\r\n", 1)
+        content_range = headers.split(b"Content-Range: ")[1].decode()
+        # each part is followed by CRLF before the next boundary
+        parts.append((content_range, data[:-2]))
+    return parts
+
+
 async def test_static_file_ok(
     aiohttp_client: Any, app_with_static_route: web.Application
 ) -> None:
@@ -624,6 +636,158 @@ async def test_static_file_range(aiohttp_client: Any, sender: Any) -> None:
     await client.close()
 
 
+async def test_static_file_multiple_ranges(aiohttp_client: Any, sender: Any) -> None:
+    filepath = pathlib.Path(__file__).parent / "sample.txt"
+
+    filesize = filepath.stat().st_size
+
+    async def handler(request):
+        return sender(filepath, chunk_size=16)
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    with filepath.open("rb") as f:
+        content = f.read()
+
+    resp = await client.get("/", headers={"Range": "bytes=0-9, 100-199, -5"})
+    assert resp.status == 206
+    assert resp.content_type == "multipart/byteranges"
+    assert hdrs.CONTENT_RANGE not in resp.headers
+    body = await resp.read()
+    assert int(resp.headers["Content-Length"]) == len(body)
+
+    assert _byteranges(resp, body) == [
+        (f"bytes 0-9/{filesize}", content[:10]),
+        (f"bytes 100-199/{filesize}", content[100:200]),
+        (f"bytes {filesize - 5}-{filesize - 1}/{filesize}", content[-5:]),
+    ]
+
+    await client.close()
+
+
+async def test_static_file_multiple_ranges_head(aiohttp_client: Any) -> None:
+    filepath = pathlib.Path(__file__).parent / "sample.txt"
+
+    async def handler(request):
+        return web.FileResponse(filepath)
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/", headers={"Range": "bytes=0-9,100-199"})
+    head = await client.head("/", headers={"Range": "bytes=0-9,100-199"})
+    assert head.status == 206
+    assert head.headers["Content-Length"] == resp.headers["Content-Length"]
+    resp.release()
+
+    await client.close()
+
+
+async def test_static_file_multiple_ranges_partially_satisfiable(
+    aiohttp_client: Any, sender: Any
+) -> None:
+    filepath = pathlib.Path(__file__).parent / "sample.txt"
+
+    filesize = filepath.stat().st_size
+
+    async def handler(request):
+        return sender(filepath)
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    rng = f"bytes={filesize}-{filesize + 10},0-9"
+    resp = await client.get("/", headers={"Range": rng})
+    assert resp.status == 206
+    assert resp.headers["Content-Range"] == f"bytes 0-9/{filesize}"
+    assert len(await resp.read()) == 10
+
+    await client.close()
+
+
+async def test_static_file_multiple_ranges_overlapping(
+    aiohttp_client: Any, sender: Any
+) -> None:
+    filepath = pathlib.Path(__file__).parent / "sample.txt"
+    filesize = filepath.stat().st_size
+
+    async def handler(request):
+        return sender(filepath)
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/", headers={"Range": "bytes=0-,0-,0-"})
+    assert resp.status == 206
+    assert resp.headers["Content-Range"] == f"bytes 0-{filesize - 1}/{filesize}"
+    assert await resp.read() == filepath.read_bytes()
+
+    resp = await client.get("/", headers={"Range": "bytes=100-109,0-9,5-19,20-29"})
+    assert resp.status == 206
+    content = filepath.read_bytes()
+    assert _byteranges(resp, await resp.read()) == [
+        (f"bytes 100-109/{filesize}", content[100:110]),
+        (f"bytes 0-29/{filesize}", content[:30]),
+    ]
+
+    await client.close()
+
+
+async def test_static_file_multiple_ranges_too_many(
+    aiohttp_client: Any, sender: Any
+) -> None:
+    filepath = pathlib.Path(__file__).parent / "sample.txt"
+
+    async def handler(request):
+        return sender(filepath)
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    rng = "bytes=" + ",".join(f"{i * 2}-{i * 2}" for i in range(16))
+    resp = await client.get("/", headers={"Range": rng})
+    assert resp.status == 206
+    assert len(_byteranges(resp, await resp.read())) == 16
+
+    rng = "bytes=" + ",".join(["0-9"] * 17)
+    resp = await client.get("/", headers={"Range": rng})
+    assert resp.status == 200
+    assert hdrs.CONTENT_RANGE not in resp.headers
+    assert await resp.read() == filepath.read_bytes()
+
+    await client.close()
+
+
+async def test_static_file_multiple_ranges_cached(
+    aiohttp_client: Any, tmp_path: Any
+) -> None:
+    (tmp_path / "data.bin").write_bytes(bytes(range(256)))
+    file_cache = web.FileCache()
+
+    app = web.Application()
+    app.router.add_static("/static", tmp_path, file_cache=file_cache)
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/static/data.bin")
+    assert resp.status == 200
+    assert len(file_cache) == 1
+
+    resp = await client.get("/static/data.bin", headers={"Range": "bytes=1-2,-2"})
+    assert resp.status == 206
+    assert _byteranges(resp, await resp.read()) == [
+        ("bytes 1-2/256", b"\x01\x02"),
+        ("bytes 254-255/256", b"\xfe\xff"),
+    ]
+
+    await client.close()
+
+
 async def test_static_file_range_end_bigger_than_size(aiohttp_client: Any, sender: Any):
     filepath = pathlib.Path(__file__).parent / "aiohttp.png"
 
@@ -1017,3 +1181,161 @@ async def test_static_file_huge_error(aiohttp_client: Any, tmp_path: Any) -> Non
 
     await resp.release()
     await client.close()
+
+
+async def test_static_file_cache(aiohttp_client: Any, tmp_path: Any) -> None:
+    filepath = tmp_path / "hot.js"
+    filepath.write_bytes(b"var a = 1;")
+    st = filepath.stat()
+    file_cache = web.FileCache(revalidate=3600)
+
+    app = web.Application()
+    app.router.add_static("/static", tmp_path, file_cache=file_cache)
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/static/hot.js")
+    assert resp.status == 200
+    assert b"var a = 1;" == await resp.read()
+    assert len(file_cache) == 1
+    assert file_cache.size == 10
+
+    # Same size and mtime, the cached copy is still considered fresh.
+    filepath.write_bytes(b"var b = 2;")
+    os.utime(filepath, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    resp = await client.get("/static/hot.js")
+    assert resp.status == 200
+    assert b"var a = 1;" == await resp.read()
+    assert resp.headers["Content-Type"] in (
+        "application/javascript",
+        "text/javascript",
+    )
+    assert resp.headers["ETag"] == f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+    resp = await client.get("/static/hot.js", headers={"Range": "bytes=4-4"})
+    assert resp.status == 206
+    assert b"a" == await resp.read()
+
+    await client.close()
+
+
+async def test_static_file_cache_revalidate(aiohttp_client: Any, tmp_path: Any) -> None:
+    filepath = tmp_path / "hot.txt"
+    filepath.write_bytes(b"old")
+    file_cache = web.FileCache(revalidate=0)
+
+    app = web.Application()
+    app.router.add_static("/static", tmp_path, file_cache=file_cache)
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/static/hot.txt")
+    assert b"old" == await resp.read()
+
+    filepath.write_bytes(b"newer")
+
+    resp = await client.get("/static/hot.txt")
+    assert b"newer" == await resp.read()
+    assert len(file_cache) == 1
+    assert file_cache.size == 5
+
+    await client.close()
+
+
+async def test_static_file_cache_limits(aiohttp_client: Any, tmp_path: Any) -> None:
+    for name in ("a", "b", "c"):
+        (tmp_path / name).write_bytes(name.encode() * 4)
+    (tmp_path / "big").write_bytes(b"x" * 16)
+    file_cache = web.FileCache(max_size=8, max_file_size=8)
+
+    app = web.Application()
+    app.router.add_static("/static", tmp_path, file_cache=file_cache)
+    client = await aiohttp_client(app)
+
+    for name in ("a", "b", "c", "big"):
+        resp = await client.get("/static/" + name)
+        assert resp.status == 200
+        await resp.read()
+
+    assert len(file_cache) == 2
+    assert file_cache.size == 8
+
+    resp = await client.get("/static/big")
+    assert b"x" * 16 == await resp.read()
+
+    file_cache.clear()
+    assert len(file_cache) == 0
+    assert file_cache.size == 0
+
+    await client.close()
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected_encoding",
+    [
+        ("gzip, deflate, br, zstd", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("zstd, gzip", "zstd"),
+        ("br;q=0, gzip;q=0.5, identity", None),
+        ("*", "br"),
+        ("identity", None),
+    ],
+)
+async def test_static_file_sidecar_negotiation(
+    aiohttp_client: Any, tmp_path: Any, accept_encoding: str, expected_encoding: Any
+) -> None:
+    # Sidecars are not real compressed data, the client does not decode them.
+    bodies = {None: b"raw", "gzip": b"gz", "br": b"br", "zstd": b"zst"}
+    (tmp_path / "app.js").write_bytes(bodies[None])
+    (tmp_path / "app.js.gz").write_bytes(bodies["gzip"])
+    (tmp_path / "app.js.br").write_bytes(bodies["br"])
+    (tmp_path / "app.js.zst").write_bytes(bodies["zstd"])
+
+    app = web.Application()
+    app.router.add_static("/static", tmp_path)
+    client = await aiohttp_client(app, auto_decompress=False)
+
+    resp = await client.get(
+        "/static/app.js", headers={"Accept-Encoding": accept_encoding}
+    )
+    assert resp.status == 200
+    assert await resp.read() == bodies[expected_encoding]
+    assert resp.headers.get("Content-Encoding") == expected_encoding
+    assert resp.headers["Content-Type"] in (
+        "application/javascript",
+        "text/javascript",
+    )
+    if expected_encoding is None:
+        assert hdrs.VARY not in resp.headers
+    else:
+        assert resp.headers[hdrs.VARY] == "Accept-Encoding"
+
+    await client.close()
+
+
+async def test_static_file_sidecar_cached(aiohttp_client: Any, tmp_path: Any) -> None:
+    (tmp_path / "app.js").write_bytes(b"raw")
+    file_cache = web.FileCache(revalidate=3600)
+
+    app = web.Application()
+    app.router.add_static("/static", tmp_path, file_cache=file_cache)
+    client = await aiohttp_client(app, auto_decompress=False)
+
+    resp = await client.get("/static/app.js", headers={"Accept-Encoding": "br"})
+    assert await resp.read() == b"raw"
+
+    # The missing sidecar is remembered until the next revalidation.
+    (tmp_path / "app.js.br").write_bytes(b"br")
+    resp = await client.get("/static/app.js", headers={"Accept-Encoding": "br"})
+    assert await resp.read() == b"raw"
+    assert resp.headers.get("Content-Encoding") is None
+
+    file_cache.clear()
+    resp = await client.get("/static/app.js", headers={"Accept-Encoding": "br"})
+    assert await resp.read() == b"br"
+    assert resp.headers["Content-Encoding"] == "br"
+
+    resp = await client.get("/static/app.js", headers={"Accept-Encoding": "br"})
+    assert await resp.read() == b"br"
+    assert len(file_cache) == 1
+
+    await client.close()
@@ -285,3 +285,169 @@ async def test_no_handler_cancellation(aiohttp_unused_port) -> None:
         assert done_event.is_set()
     finally:
         await asyncio.gather(runner.shutdown(), site.stop())
+
+
+async def _pipeline(server: Any, *paths: str, method: str = "GET") -> bytes:
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    requests = [
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n\r\n" for path in paths
+    ]
+    requests[-1] = requests[-1].replace("\r\n\r\n", "\r\nConnection: close\r\n\r\n")
+    writer.write("".join(requests).encode())
+    data = await asyncio.wait_for(reader.read(), timeout=5)
+    writer.close()
+    return data
+
+
+async def test_pipelined_requests_concurrent(aiohttp_raw_server: Any) -> None:
+    event = asyncio.Event()
+
+    async def handler(request):
+        if request.path == "/first":
+            await event.wait()
+        else:
+            event.set()
+        return web.Response(text=request.path)
+
+    server = await aiohttp_raw_server(handler, max_pipelined_requests=2)
+    data = await _pipeline(server, "/first", "/second")
+
+    assert data.count(b"HTTP/1.1 200 OK") == 2
+    assert data.index(b"/first") < data.index(b"/second")
+
+
+async def test_pipelined_requests_limit(aiohttp_raw_server: Any) -> None:
+    active = 0
+    max_active = 0
+
+    async def handler(request):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return web.StreamResponse()
+
+    server = await aiohttp_raw_server(handler, max_pipelined_requests=3)
+    data = await _pipeline(server, *[f"/{i}" for i in range(6)])
+
+    assert data.count(b"HTTP/1.1 200 OK") == 6
+    assert max_active == 3
+
+
+async def test_pipelined_requests_disabled(aiohttp_raw_server: Any) -> None:
+    active = 0
+    max_active = 0
+
+    async def handler(request):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return web.Response()
+
+    server = await aiohttp_raw_server(handler)
+    data = await _pipeline(server, "/1", "/2", "/3")
+
+    assert data.count(b"HTTP/1.1 200 OK") == 3
+    assert max_active == 1
+
+
+async def test_pipelined_requests_unsafe_method(aiohttp_raw_server: Any) -> None:
+    active = 0
+    max_active = 0
+
+    async def handler(request):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return web.Response()
+
+    server = await aiohttp_raw_server(handler, max_pipelined_requests=4)
+    data = await _pipeline(server, "/1", "/2", "/3", method="DELETE")
+
+    assert data.count(b"HTTP/1.1 200 OK") == 3
+    assert max_active == 1
+
+
+async def test_pipelined_requests_streamed_in_order(aiohttp_raw_server: Any) -> None:
+    async def handler(request):
+        resp = web.StreamResponse()
+        await resp.prepare(request)
+        for i in range(3):
+            await resp.write(f"{request.path}:{i};".encode())
+            await asyncio.sleep(0)
+        return resp
+
+    server = await aiohttp_raw_server(handler, max_pipelined_requests=3)
+    data = await _pipeline(server, "/a", "/b", "/c")
+
+    bodies = data.decode()
+    assert bodies.index("/a:2;") < bodies.index("/b:0;")
+    assert bodies.index("/b:2;") < bodies.index("/c:0;")
+
+
+async def test_pipelined_requests_cancelled_on_close(aiohttp_raw_server: Any) -> None:
+    cancelled = asyncio.Event()
+
+    async def handler(request):
+        if request.path == "/close":
+            resp = web.Response(text="closed")
+            resp.force_close()
+            return resp
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return web.Response()  # pragma: no cover
+
+    server = await aiohttp_raw_server(handler, max_pipelined_requests=2)
+    data = await _pipeline(server, "/close", "/never")
+
+    assert data.count(b"HTTP/1.1 200 OK") == 1
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+async def test_lazy_headers(aiohttp_raw_server: Any, aiohttp_client: Any) -> None:
+    async def handler(request):
+        if request.path == "/headers":
+            return web.Response(text=request.headers["X-Custom"])
+        body = await request.read()
+        return web.Response(body=body)
+
+    server = await aiohttp_raw_server(handler, lazy_headers=True)
+    cli = await aiohttp_client(server)
+
+    resp = await cli.get("/headers", headers={"X-Custom": "value"})
+    assert resp.status == 200
+    assert await resp.text() == "value"
+
+    resp = await cli.post("/body", data=b"data")
+    assert resp.status == 200
+    assert await resp.read() == b"data"
+
+
+async def test_lazy_headers_application(aiohttp_client: Any) -> None:
+    requests = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request)
+        body = await request.read()
+        return web.Response(body=body)
+
+    app = web.Application(handler_args={"lazy_headers": True, "access_log": None})
+    app.router.add_get("/", handler)
+    app.router.add_post("/", handler)
+    cli = await aiohttp_client(app)
+
+    resp = await cli.get("/")
+    assert resp.status == 200
+    assert "_headers" not in requests[0]._message.__dict__
+
+    resp = await cli.post("/", data=b"data", expect100=True)
+    assert resp.status == 200
+    assert await resp.read() == b"data"
@@ -1,5 +1,7 @@
 import asyncio
+import errno
 import functools
+import os
 import pathlib
 from typing import Optional
 from unittest import mock
@@ -276,6 +278,151 @@ async def test_access_special_resource(
         assert r.status == 403
 
 
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires os.mkfifo")
+async def test_access_fifo(
+    tmp_path: pathlib.Path, aiohttp_client: AiohttpClient
+) -> None:
+    os.mkfifo(tmp_path / "fifo")
+
+    app = web.Application()
+    app.router.add_static("/", str(tmp_path))
+    client = await aiohttp_client(app)
+
+    r = await client.get("/fifo")
+    assert r.status == 404
+
+
+async def test_static_path_cache(
+    tmp_path: pathlib.Path, aiohttp_client: AiohttpClient
+) -> None:
+    (tmp_path / "test.txt").write_bytes(b"cached")
+
+    app = web.Application()
+    resource = app.router.add_static("/", str(tmp_path), path_cache_ttl=3600)
+    assert isinstance(resource, web.StaticResource)
+    client = await aiohttp_client(app)
+
+    r = await client.get("/test.txt")
+    assert r.status == 200
+    assert await r.read() == b"cached"
+
+    with mock.patch.object(
+        resource, "_resolve_path", side_effect=AssertionError
+    ) as resolve_path:
+        r = await client.get("/test.txt")
+        assert r.status == 200
+        assert await r.read() == b"cached"
+    assert not resolve_path.called
+
+
+async def test_static_path_cache_expired(
+    tmp_path: pathlib.Path, aiohttp_client: AiohttpClient
+) -> None:
+    (tmp_path / "test.txt").write_bytes(b"cached")
+
+    app = web.Application()
+    resource = app.router.add_static("/", str(tmp_path), path_cache_ttl=0)
+    assert isinstance(resource, web.StaticResource)
+    client = await aiohttp_client(app)
+
+    r = await client.get("/test.txt")
+    assert r.status == 200
+
+    (tmp_path / "test.txt").unlink()
+
+    with mock.patch.object(
+        resource, "_resolve_path", wraps=resource._resolve_path
+    ) as resolve_path:
+        r = await client.get("/test.txt")
+        assert r.status == 404
+    assert resolve_path.called
+
+
+async def test_static_path_cache_file_removed(
+    tmp_path: pathlib.Path, aiohttp_client: AiohttpClient
+) -> None:
+    (tmp_path / "test.txt").write_bytes(b"cached")
+
+    app = web.Application()
+    resource = app.router.add_static("/", str(tmp_path), path_cache_ttl=3600)
+    assert isinstance(resource, web.StaticResource)
+    client = await aiohttp_client(app)
+
+    r = await client.get("/test.txt")
+    assert r.status == 200
+    await r.read()
+    assert len(resource._path_cache) == 1
+
+    (tmp_path / "test.txt").unlink()
+
+    r = await client.get("/test.txt")
+    assert r.status == 404
+    assert not resource._path_cache
+
+    (tmp_path / "test.txt").write_bytes(b"again")
+    r = await client.get("/test.txt")
+    assert r.status == 200
+    assert await r.read() == b"again"
+
+
+async def test_static_path_cache_dot_segments(
+    tmp_path: pathlib.Path, aiohttp_client: AiohttpClient
+) -> None:
+    (tmp_path / "test.txt").write_bytes(b"cached")
+
+    app = web.Application()
+    resource = app.router.add_static("/s", str(tmp_path), path_cache_ttl=3600)
+    assert isinstance(resource, web.StaticResource)
+    client = await aiohttp_client(app)
+
+    # Send raw request lines, the client would normalize the dot segments.
+    for i in range(20):
+        reader, writer = await asyncio.open_connection(client.host, client.port)
+        path = "/s/" + "./" * i + "test.txt"
+        writer.write(f"GET {path} HTTP/1.1\r\n".encode())
+        writer.write(b"Host: localhost\r\nConnection: close\r\n\r\n")
+        assert (await reader.readline()).startswith(b"HTTP/1.1 200")
+        await reader.read()
+        writer.close()
+
+    assert len(resource._path_cache) == 1
+
+
+async def test_static_path_cache_size(
+    tmp_path: pathlib.Path, aiohttp_client: AiohttpClient
+) -> None:
+    for i in range(5):
+        (tmp_path / f"{i}.txt").write_bytes(b"cached")
+
+    app = web.Application()
+    resource = app.router.add_static("/", str(tmp_path), path_cache_ttl=3600)
+    assert isinstance(resource, web.StaticResource)
+    client = await aiohttp_client(app)
+
+    with mock.patch.object(resource, "PATH_CACHE_SIZE", 2):
+        for i in range(5):
+            r = await client.get(f"/{i}.txt")
+            assert r.status == 200
+            await r.read()
+
+    assert list(resource._path_cache) == [pathlib.Path("3.txt"), pathlib.Path("4.txt")]
+
+
+async def test_static_path_stat_error(
+    tmp_path: pathlib.Path, aiohttp_client: AiohttpClient
+) -> None:
+    (tmp_path / "test.txt").write_bytes(b"data")
+
+    app = web.Application()
+    app.router.add_static("/", str(tmp_path))
+    client = await aiohttp_client(app)
+
+    error = OSError(errno.ELOOP, "Too many levels of symbolic links")
+    with mock.patch("pathlib.Path.stat", side_effect=error):
+        r = await client.get("/test.txt")
+    assert r.status == 404
+
+
 async def test_partially_applied_handler(aiohttp_client: AiohttpClient) -> None:
     app = web.Application()
 